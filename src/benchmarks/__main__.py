@@ -0,0 +1,89 @@
+# benchmarks/__main__.py
+import argparse
+import sys
+
+from src.benchmarks import suite  # noqa: F401  (registers the benchmarks)
+from src.benchmarks.graphs import GRAPH_SHAPES
+from src.benchmarks.harness import (
+    BENCHMARKS,
+    find_regressions,
+    read_report,
+    run_benchmarks,
+    write_report,
+)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m src.benchmarks",
+        description="Benchmark node, registry, state machine and orchestrator paths.",
+    )
+    parser.add_argument(
+        "benchmarks",
+        nargs="*",
+        help=f"Benchmarks to run (default: all of {', '.join(BENCHMARKS)})",
+    )
+    parser.add_argument("--sizes", type=int, nargs="+", help="Override default sizes")
+    parser.add_argument("--repeat", type=int, default=5, help="Timed runs per size")
+    parser.add_argument(
+        "--shape", choices=GRAPH_SHAPES, default="layered", help="Graph shape"
+    )
+    parser.add_argument(
+        "--width", type=int, default=8, help="Layer width or branching factor"
+    )
+    parser.add_argument("--seed", type=int, default=0, help="Random graph seed")
+    parser.add_argument(
+        "--latency", type=float, default=0.0, help="Stub model latency in seconds"
+    )
+    parser.add_argument("--output", help="Write the results to this JSON file")
+    parser.add_argument("--baseline", help="JSON results to compare against")
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.2,
+        help="Allowed slowdown against the baseline (0.2 = 20%%)",
+    )
+    return parser.parse_args(argv)
+
+
+def print_result(result):
+    ops = result["ops_per_second"]
+    print(
+        f"{result['benchmark']:<32} {result['size']:>9} "
+        f"median {result['median'] * 1000:10.3f} ms  "
+        f"{ops if ops is not None else float('nan'):14,.0f} ops/s"
+    )
+
+
+def main(argv=None):
+    """
+    Run the benchmarks, optionally saving the results and failing (exit status 1)
+    on regressions against a baseline.
+    """
+    args = parse_args(argv)
+    report = run_benchmarks(
+        args.benchmarks,
+        args.sizes,
+        args.repeat,
+        progress=print_result,
+        shape=args.shape,
+        width=args.width,
+        seed=args.seed,
+        latency=args.latency,
+    )
+    if args.output:
+        write_report(report, args.output)
+    if not args.baseline:
+        return 0
+
+    regressions = find_regressions(read_report(args.baseline), report, args.tolerance)
+    for key, before, after in regressions:
+        print(
+            f"REGRESSION {key}: median {before * 1000:.3f} ms "
+            f"-> {after * 1000:.3f} ms"
+        )
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,42 @@
+# benchmarks/graphs.py
+import random
+
+GRAPH_SHAPES = ("chain", "fan_out", "tree", "layered", "random")
+
+
+def make_graph(shape="layered", size=1000, width=8, seed=0):
+    """
+    Build a synthetic dependency DAG.
+    :param shape: One of GRAPH_SHAPES:
+        chain    each node depends on the previous one
+        fan_out  every node depends on a single root
+        tree     each node depends on its parent, with width children per parent
+        layered  layers of width nodes, each depending on up to two nodes of the
+                 layer before
+        random   each node depends on one to three random earlier nodes
+    :param width: Layer width or branching factor.
+    :param seed: Seed for the random choices, so graphs are reproducible.
+    :return: Mapping of node ID -> list of dependency IDs, in topological order.
+    """
+    if shape not in GRAPH_SHAPES:
+        raise ValueError(f"Unknown graph shape: {shape}")
+    rng = random.Random(seed)
+    ids = [f"node-{i}" for i in range(size)]
+    graph = {}
+    for i, node_id in enumerate(ids):
+        if i == 0:
+            parents = []
+        elif shape == "chain":
+            parents = [i - 1]
+        elif shape == "fan_out":
+            parents = [0]
+        elif shape == "tree":
+            parents = [(i - 1) // width]
+        elif shape == "layered":
+            layer_start = (i // width) * width
+            previous = range(max(0, layer_start - width), layer_start)
+            parents = rng.sample(previous, min(2, len(previous)))
+        else:
+            parents = rng.sample(range(i), min(i, rng.randint(1, 3)))
+        graph[node_id] = [ids[parent] for parent in sorted(parents)]
+    return graph
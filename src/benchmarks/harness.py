@@ -0,0 +1,137 @@
+# benchmarks/harness.py
+import json
+import platform
+import statistics
+import subprocess
+import time
+
+from src.shared.utils import get_current_timestamp
+
+BENCHMARKS = {}  # name -> Benchmark, in registration order
+
+
+class Benchmark:
+    """
+    A timed operation at several sizes. setup(size, **options) prepares untimed
+    state and returns the callable to time, which performs operations(size)
+    operations; it is called afresh before every repeat.
+    """
+
+    def __init__(self, name, setup, sizes, operations=None, description=None):
+        self.name = name
+        self.setup = setup
+        self.sizes = tuple(sizes)
+        self.operations = operations or (lambda size: size)
+        self.description = description or (setup.__doc__ or "").strip()
+
+    def run(self, size, repeat, **options):
+        """
+        Time repeat runs at one size.
+        :return: Result dict with timing statistics in seconds.
+        """
+        timings = []
+        for _ in range(repeat):
+            timed = self.setup(size, **options)
+            started = time.perf_counter()
+            timed()
+            timings.append(time.perf_counter() - started)
+        operations = self.operations(size)
+        median = statistics.median(timings)
+        return {
+            "benchmark": self.name,
+            "size": size,
+            "operations": operations,
+            "repeat": repeat,
+            "min": min(timings),
+            "median": median,
+            "mean": statistics.fmean(timings),
+            "stdev": statistics.stdev(timings) if repeat > 1 else 0.0,
+            "ops_per_second": operations / median if median else None,
+        }
+
+
+def benchmark(name, sizes, operations=None):
+    """
+    Register a setup function as a benchmark.
+    :param operations: Callable mapping a size to the operations one run performs;
+        defaults to the size itself.
+    """
+
+    def register(setup):
+        BENCHMARKS[name] = Benchmark(name, setup, sizes, operations)
+        return setup
+
+    return register
+
+
+def get_result_key(result):
+    return f"{result['benchmark']}[{result['size']}]"
+
+
+def run_benchmarks(names=None, sizes=None, repeat=5, progress=None, **options):
+    """
+    Run registered benchmarks.
+    :param names: Benchmarks to run; all if None.
+    :param sizes: Sizes overriding each benchmark's defaults.
+    :param progress: Optional callable receiving each result as it is measured.
+    :param options: Passed to every setup function, e.g. the graph shape.
+    :return: Report dict with "metadata" and "results" keyed by "name[size]".
+    """
+    unknown = set(names or ()) - set(BENCHMARKS)
+    if unknown:
+        raise ValueError(f"Unknown benchmarks: {sorted(unknown)}")
+    results = {}
+    for name, case in BENCHMARKS.items():
+        if names and name not in names:
+            continue
+        for size in sizes or case.sizes:
+            result = case.run(size, repeat, **options)
+            results[get_result_key(result)] = result
+            if progress is not None:
+                progress(result)
+    return {"metadata": get_metadata(repeat, options), "results": results}
+
+
+def get_metadata(repeat, options):
+    """Describe the run so results from different releases can be told apart."""
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, text=True, timeout=5
+        ).stdout.strip()
+    except (OSError, subprocess.SubprocessError):
+        commit = ""
+    return {
+        "timestamp": get_current_timestamp(),
+        "commit": commit or None,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "repeat": repeat,
+        "options": options,
+    }
+
+
+def write_report(report, path):
+    with open(path, "w", encoding="utf-8") as handle:
+        json.dump(report, handle, indent=2, sort_keys=True)
+
+
+def read_report(path):
+    with open(path, encoding="utf-8") as handle:
+        return json.load(handle)
+
+
+def find_regressions(baseline, current, tolerance=0.2):
+    """
+    Compare median timings of the results present in both reports.
+    :param tolerance: Allowed slowdown as a fraction of the baseline median.
+    :return: List of (key, baseline median, current median) for results that got
+        slower by more than the tolerance.
+    """
+    regressions = []
+    for key, result in current["results"].items():
+        previous = baseline["results"].get(key)
+        if previous is None:
+            continue
+        if result["median"] > previous["median"] * (1 + tolerance):
+            regressions.append((key, previous["median"], result["median"]))
+    return regressions
@@ -0,0 +1,149 @@
+# benchmarks/suite.py
+import asyncio
+import functools
+import itertools
+
+from src.benchmarks.graphs import make_graph
+from src.benchmarks.harness import benchmark
+from src.shared.AI_Node import AI_Node
+from src.shared.GPTNode import GPTNode
+from src.shared.NodeMessage import TaskMessage
+from src.shared.NodeRegistry import NodeRegistry
+from src.shared.Orchestrator import Orchestrator
+from src.shared.ResponseCache import ResponseCache
+from src.shared.incremental import IncrementalExecutor
+
+REGISTRY_SIZES = (10**3, 10**4, 10**5)  # Pass --sizes 1000000 for the largest runs
+
+
+class StubModelClient:
+    """Model client answering every prompt locally after an optional delay."""
+
+    provider = "stub"
+    base_url = None
+
+    def __init__(self, latency=0.0):
+        self.latency = latency
+
+    async def complete(self, prompt, model=None, **params):
+        await asyncio.sleep(self.latency)
+        return f"Stub completion of {len(prompt)} characters"
+
+
+def make_node(node_id, dependencies=None):
+    return AI_Node(
+        in_name=node_id,
+        in_node_id=node_id,
+        in_description="Benchmark node",
+        in_priority=1,
+        in_status="idle",
+        in_purpose="Benchmarking",
+        in_node_registry=None,
+        in_supported_tasks=["task"],
+        in_dependencies=dependencies,
+    )
+
+
+def make_stub_gpt_node(node_id, dependencies=None, latency=0.0):
+    node = GPTNode(
+        in_name=node_id,
+        in_node_id=node_id,
+        in_description="Benchmark node",
+        in_priority=1,
+        in_status="idle",
+        in_purpose="Benchmarking",
+        in_node_registry=None,
+        in_dependencies=dependencies,
+        in_model_client=StubModelClient(latency),
+        in_response_cache=False,
+    )
+    node.task = f"Task for {node_id}"
+    return node
+
+
+@functools.lru_cache(maxsize=2)
+def build_graph_nodes(size, shape, width, seed):
+    """Nodes for a synthetic graph, reused across repeats since building is slow."""
+    graph = make_graph(shape, size, width, seed)
+    return tuple(make_node(node_id, deps) for node_id, deps in graph.items())
+
+
+@functools.lru_cache(maxsize=1)
+def build_registry(size, shape, width, seed):
+    registry = NodeRegistry()
+    for node in build_graph_nodes(size, shape, width, seed):
+        registry.register_node(node)
+    return registry
+
+
+# --------------------------- Benchmarks --------------------------- #
+
+
+@benchmark("node_construction", sizes=(10**3, 10**4))
+def bench_node_construction(size, **options):
+    """Construct AI_Nodes."""
+    ids = [f"node-{i}" for i in range(size)]
+    return lambda: [make_node(node_id) for node_id in ids]
+
+
+@benchmark("state_machine_transition", sizes=(10**4, 10**5))
+def bench_state_machine_transition(size, **options):
+    """StateMachine.transition_to() through ready -> processing -> waiting."""
+    machine = make_node("node").state_machine
+    machine.set_state("ready")
+    cycle = itertools.cycle(["processing", "waiting", "ready"])
+    states = list(itertools.islice(cycle, size))
+    transition_to = machine.transition_to
+    return lambda: [transition_to(state) for state in states]
+
+
+@benchmark("registry_register", sizes=REGISTRY_SIZES)
+def bench_registry_register(size, shape="layered", width=8, seed=0, **options):
+    """NodeRegistry.register_node() for a synthetic graph, indexing dependencies."""
+    nodes = build_graph_nodes(size, shape, width, seed)
+
+    def run():
+        registry = NodeRegistry()
+        for node in nodes:
+            registry.register_node(node)
+
+    return run
+
+
+@benchmark("registry_lookup", sizes=REGISTRY_SIZES)
+def bench_registry_lookup(size, shape="layered", width=8, seed=0, **options):
+    """NodeRegistry.get_node_by_id() for every registered node."""
+    registry = build_registry(size, shape, width, seed)
+    ids = list(registry.nodes)
+    get_node_by_id = registry.get_node_by_id
+    return lambda: [get_node_by_id(node_id) for node_id in ids]
+
+
+@benchmark("orchestrator_collect_responses", sizes=(10**2, 10**3))
+def bench_orchestrator_collect_responses(size, latency=0.0, **options):
+    """Orchestrator.collect_responses() fan-out over stub-model GPTNodes."""
+    orchestrator = Orchestrator()
+    for i in range(size):
+        orchestrator.register_node(make_stub_gpt_node(f"node-{i}", latency=latency))
+    return orchestrator.collect_responses
+
+
+@benchmark("message_to_dict", sizes=(10**4, 10**5))
+def bench_message_to_dict(size, **options):
+    """NodeMessage.to_dict() on fresh TaskMessages."""
+    messages = [
+        TaskMessage("orchestrator", f"node-{i}", f"task-{i}", "Benchmark", 1, None)
+        for i in range(size)
+    ]
+    return lambda: [message.to_dict() for message in messages]
+
+
+@benchmark("dag_run", sizes=(10**2, 10**3))
+def bench_dag_run(size, shape="layered", width=8, seed=0, latency=0.0, **options):
+    """End-to-end run of a synthetic graph of stub-model GPTNodes."""
+    graph = make_graph(shape, size, width, seed)
+    nodes = [
+        make_stub_gpt_node(node_id, deps, latency) for node_id, deps in graph.items()
+    ]
+    executor = IncrementalExecutor(ResponseCache(max_entries=size))
+    return lambda: executor.run(nodes)
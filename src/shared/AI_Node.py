@@ -1,11 +1,59 @@
-from src.shared.NodeRegistry import NodeRegistry
-
+from src.shared.ActivityLog import ActivityLog
+from src.shared.CircuitBreaker import CLOSED, HALF_OPEN, OPEN
+from src.shared.NodeRegistry import (
+    NodeRegistry,
+    get_dependency_id,
+    is_node_resolved,
+    is_streaming_dependency,
+)
+
+from src.shared.NodeMessage import TaskMessage
+from src.shared.OutputStream import OutputStream
 from src.shared.StateMachine import StateMachine
+from src.shared.WorkerPool import get_default_worker_pool
 from src.shared.logger_manager import LoggerMixin
-from src.shared.utils import get_current_timestamp, get_unique_id
+from src.shared.utils import get_current_timestamp, get_unique_id, run_sync
+
+
+DEFAULT_IDENTITY_PROMPT = "You are part of a node network, specialized in {purpose}."
+
+
+def make_activity_log(activity_logs=None):
+    """
+    Return an ActivityLog, seeding it from a list of activity dicts if one is given.
+    """
+    if isinstance(activity_logs, ActivityLog):
+        return activity_logs
+    log = ActivityLog()
+    for entry in activity_logs or []:
+        log.append(entry["activity"], entry.get("details"))
+    return log
 
 
 class AI_Node(LoggerMixin):
+    __slots__ = (
+        "name",
+        "task",
+        "dependencies",
+        "state_machine",
+        "node_id",
+        "node_registry",
+        "description",
+        "status",
+        "purpose",
+        "supported_tasks",
+        "activity_logs",
+        "identity_prompt",
+        "priority",
+        "output_stream",
+        "circuit_breaker",
+        "state_observers",
+        "__weakref__",
+    )
+
+    # Subclasses with CPU-bound work set this to a module-level function taking a
+    # TaskMessage; it then runs in the shared worker process pool instead of the GIL.
+    worker_function = None
 
     def __init__(
         self,
@@ -22,9 +70,12 @@ class AI_Node(LoggerMixin):
         in_activity_logs=None,
         in_identity_prompt=None,
         in_state_machine=None,
+        in_circuit_breaker=None,
     ):
         """
         Initialize the AI_Node with state management, logging, and task details.
+        With in_circuit_breaker (see CircuitBreaker) the node fails fast while the
+        breaker is open and is held in the 'error' state until it closes.
         """
         super().__init__()  # Initialize loggers
 
@@ -32,21 +83,25 @@ class AI_Node(LoggerMixin):
         self.name = in_name
         self.task = in_task
         self.dependencies = in_dependencies or []
-        self.state_machine = StateMachine()
+        self.state_machine = in_state_machine or StateMachine(self)
+        self.state_machine.node = self
 
         self.node_id = in_node_id or get_unique_id()
         self.node_registry = in_node_registry
 
         self.description = in_description
         self.status = in_status
+        self.state_observers = ()  # See subscribe_state_change()
         self.purpose = in_purpose
 
         # Additional attributes
-        self.supported_tasks = in_supported_tasks or []
-        self.activity_logs = in_activity_logs or []
-        self.identity_prompt = in_identity_prompt or (
-            "You are part of a node network, specialized in {purpose}."
-        )
+        self.supported_tasks = frozenset(in_supported_tasks or ())
+        self.activity_logs = make_activity_log(in_activity_logs)
+        self.identity_prompt = in_identity_prompt or DEFAULT_IDENTITY_PROMPT
+        self.output_stream = None  # OutputStream of the latest astream_task() run
+        self.circuit_breaker = in_circuit_breaker
+        if self.circuit_breaker is not None:
+            self.circuit_breaker.subscribe(self.on_circuit_change)
         self.set_priority(in_priority)
         if self.node_registry:
             self.node_registry.register_node(self)
@@ -54,9 +109,10 @@ class AI_Node(LoggerMixin):
         self.log_node_event(
             self.name,
             self.node_id,
-            f"Node initialized with purpose: {self.purpose}, "
-            f"supported tasks: {self.supported_tasks}, "
-            f"dependencies: {self.dependencies}",
+            "Node initialized with purpose: %s, supported tasks: %s, dependencies: %s",
+            self.purpose,
+            self.supported_tasks,
+            self.dependencies,
         )
 
     def update_state(self):
@@ -67,6 +123,7 @@ class AI_Node(LoggerMixin):
             dependencies=self.dependencies,
             task=self.task,
         )
+        self.notify_state_change()
 
     def set_task(self, task):
         """
@@ -78,8 +135,11 @@ class AI_Node(LoggerMixin):
             raise ValueError(error_message)
 
         self.task = task
-        self.log_node_event(self.name, self.node_id, f"Task set: {task}")
+        if self.output_stream is not None and self.output_stream.done:
+            self.output_stream = None  # Dependents wait for the new task's output
+        self.log_node_event(self.name, self.node_id, "Task set: %s", task)
         self.state_machine.update_state()  # Trigger state check after task assignment
+        self.notify_state_change()
 
     def is_task_supported(self, task):
         """
@@ -96,15 +156,145 @@ class AI_Node(LoggerMixin):
             raise ValueError("Priority must be greater than or equal to 1.")
         self.priority = in_priority
         self.log_node_event(
-            self.name, self.node_id, f"Priority updated to {self.priority}"
+            self.name, self.node_id, "Priority updated to %s", self.priority
         )
 
     def process_task(self):
         """
         Process the assigned task if the node is in a valid state and dependencies are valid.
+        Thin synchronous wrapper over aprocess_task().
         """
+        return run_sync(self.aprocess_task())
+
+    async def aprocess_task(self):
+        """
+        Asynchronously process the assigned task if the node is in a valid state and dependencies are valid.
+        """
+
+        circuit_open = self.get_circuit_open_response()
+        if circuit_open is not None:
+            return circuit_open
+        self.state_machine.validate_task_processing()
+        waiting = self.get_waiting_response()
+        if waiting is not None:
+            return waiting
+
+        # If the state permits processing, validate and handle the task
+        try:
+            self.log_debugger(
+                f"Node {self.name} is starting to process task: {self.task}"
+            )
+
+            # Validate dependencies if in a processing-eligible state
+            waiting = self.get_unresolved_response()
+            if waiting is not None:
+                return waiting
+
+            # Generate and log prompt
+            prompt = self.generate_task_prompt()
+            self.log_node_event(self.name, self.node_id, "Generated prompt: %s", prompt)
+
+            output = await self.aexecute_guarded(prompt)
+            return self.record_output(output)
+
+        except Exception as e:
+            return self.record_failure(e)
 
+    async def astream_task(self):
+        """
+        Process the assigned task like aprocess_task(), yielding output chunks as they
+        are produced. Chunks are also published on self.output_stream, so dependent
+        nodes and other consumers can start on partial output; the final response is
+        attached to the stream when it closes.
+        """
+        circuit_open = self.get_circuit_open_response()
+        if circuit_open is not None:
+            self.open_output_stream().close(circuit_open)
+            return
         self.state_machine.validate_task_processing()
+        stream = self.open_output_stream()
+        response = self.get_waiting_response()
+        try:
+            if response is None:
+                self.log_debugger(
+                    f"Node {self.name} is starting to stream task: {self.task}"
+                )
+                response = self.get_unresolved_response()
+            if response is None:
+                prompt = self.generate_task_prompt()
+                self.log_node_event(
+                    self.name, self.node_id, "Generated prompt: %s", prompt
+                )
+                chunks = self.astream_guarded(prompt)
+                try:
+                    async for chunk in chunks:
+                        stream.append(chunk)
+                        yield chunk
+                finally:
+                    await chunks.aclose()
+                response = self.record_output(stream.text())
+        except Exception as e:
+            response = self.record_failure(e)
+        finally:
+            stream.close(
+                response or {"status": "error", "message": "Stream was cancelled."}
+            )
+
+    async def aexecute_guarded(self, prompt):
+        """
+        Run aexecute_prompt() through the node's circuit breaker, if it has one, which
+        records the outcome and may hedge a slow call.
+        """
+        if self.circuit_breaker is None:
+            return await self.aexecute_prompt(prompt)
+        return await self.circuit_breaker.acall(lambda: self.aexecute_prompt(prompt))
+
+    def astream_guarded(self, prompt):
+        """
+        Return astream_prompt() run through the node's circuit breaker, if it has one,
+        which records the outcome of the whole stream.
+        """
+        if self.circuit_breaker is None:
+            return self.astream_prompt(prompt)
+        return self.circuit_breaker.astream(lambda: self.astream_prompt(prompt))
+
+    def get_circuit_open_response(self):
+        """
+        Return the fail-fast response while the node's circuit breaker is open, or None.
+        """
+        if self.circuit_breaker is None or self.circuit_breaker.get_state() != OPEN:
+            return None
+        return {
+            "status": "error",
+            "node_id": self.node_id,
+            "message": f"Circuit breaker '{self.circuit_breaker.name}' is open.",
+        }
+
+    def on_circuit_change(self, breaker, from_state, to_state):
+        """
+        Mirror the circuit breaker in the state machine: 'error' while it is open,
+        back to 'ready' once it lets trial calls through or closes.
+        """
+        self.log_node_event(
+            self.name,
+            self.node_id,
+            "Circuit breaker %s: %s -> %s",
+            breaker.name,
+            from_state,
+            to_state,
+        )
+        if to_state == OPEN:
+            self.state_machine.set_state(
+                "error", f"Circuit breaker '{breaker.name}' opened."
+            )
+        elif to_state in (HALF_OPEN, CLOSED):
+            self.state_machine.resolve_error()
+        self.notify_state_change()
+
+    def get_waiting_response(self):
+        """
+        Return the response for a node whose state does not allow processing, or None.
+        """
         # Check the current state via the state machine
         if self.state_machine.current_state in ["waiting", "inactive"]:
             # Log the reason for waiting or inactivity
@@ -116,48 +306,92 @@ class AI_Node(LoggerMixin):
                 "status": "waiting",
                 "message": f"Node is in state '{self.state_machine.current_state}' and cannot process tasks.",
             }
+        return None
 
-        # If the state permits processing, validate and handle the task
-        try:
-            self.log_debugger(
-                f"Node {self.name} is starting to process task: {self.task}"
-            )
+    def get_unresolved_response(self):
+        """
+        Return the response for a node with unresolved dependencies, or None.
+        """
+        unresolved_dependencies = self.get_unresolved_dependencies()
+        if not unresolved_dependencies:
+            return None
+        self.state_machine.update_state()  # Update state based on dependencies
+        self.notify_state_change()
+        return {
+            "status": "waiting",
+            "message": "Dependencies are unresolved. Task cannot proceed.",
+            "unresolved_dependencies": unresolved_dependencies,
+        }
+
+    def record_output(self, output):
+        """
+        Build and log the success response for a task's output.
+        """
+        result = {
+            "status": "success",
+            "node_id": self.node_id,
+            "task": self.task,
+            "output": output,
+            "timestamp": get_current_timestamp(),
+        }
+        self.log_activity(f"Processed task: {self.task}", result)
+        return result
+
+    def record_failure(self, error):
+        """
+        Move the node to the error state and build the error response. Nodes with a
+        circuit breaker leave that to the breaker, which opens once failures add up.
+        """
+        self.log_error(f"Task processing failed: {error}")
+        if self.circuit_breaker is None:
+            self.state_machine.set_state("error", "Task processing failed.")
+            self.notify_state_change()
+        return {"status": "error", "message": str(error)}
 
-            # Validate dependencies if in a processing-eligible state
-            unresolved_dependencies = [
-                dep for dep in self.dependencies if not self.check_dependency(dep)
-            ]
-            if unresolved_dependencies:
-                self.state_machine.update_state()  # Update state based on dependencies
-                return {
-                    "status": "waiting",
-                    "message": "Dependencies are unresolved. Task cannot proceed.",
-                    "unresolved_dependencies": unresolved_dependencies,
-                }
+    async def astream_prompt(self, prompt):
+        """
+        Yield the output for a generated prompt in chunks. Subclasses that can stream
+        override this; by default the whole output is one chunk.
+        """
+        yield await self.aexecute_prompt(prompt)
 
-            # Generate and log prompt
-            prompt = self.generate_task_prompt()
-            self.log_node_event(self.name, self.node_id, f"Generated prompt: {prompt}")
-
-            # Simulate task execution
-            output = f"Generated output for task: {self.task}"
-
-            # Log the result
-            result = {
-                "status": "success",
-                "node_id": self.node_id,
-                "task": self.task,
-                "output": output,
-                "timestamp": get_current_timestamp(),
-            }
-            self.log_activity(f"Processed task: {self.task}", result)
-            return result
+    def open_output_stream(self):
+        """
+        Return the stream for the node's next or current run: the open output_stream,
+        or a new one if the last run has finished.
+        """
+        if self.output_stream is None or self.output_stream.done:
+            self.output_stream = OutputStream()
+        return self.output_stream
 
-        except Exception as e:
-            # Handle unexpected errors
-            self.log_error(f"Task processing failed: {e}")
-            self.state_machine.set_state("error")
-            return {"status": "error", "message": str(e)}
+    def get_dependency_stream(self, dependency):
+        """
+        Return the OutputStream of a dependency, so a node can consume upstream output
+        while it is still produced (see is_streaming_dependency). If the dependency
+        has not started streaming yet, the stream its next run will write is returned.
+        A finished stream is only returned while it holds the output of the
+        dependency's current task; set_task() retires it.
+        """
+        if not self.node_registry:
+            return None
+        node = self.node_registry.get_node_by_id(get_dependency_id(dependency))
+        if node is None:
+            return None
+        return node.output_stream or node.open_output_stream()
+
+    async def aexecute_prompt(self, prompt):
+        """
+        Produce the output for a generated prompt. Subclasses override this to call a model.
+        """
+        worker_function = type(self).worker_function
+        if worker_function is not None:
+            message = TaskMessage(
+                self.node_id, "worker", self.task, prompt, self.priority, None
+            )
+            return await get_default_worker_pool().arun(worker_function, message)
+
+        # Simulate task execution
+        return f"Generated output for task: {self.task}"
 
     def resolve_dependency(self, dependency):
         """
@@ -168,7 +402,10 @@ class AI_Node(LoggerMixin):
             self.log_node_event(
                 self.name, self.node_id, f"Dependency resolved: {dependency}"
             )
+            if self.node_registry:
+                self.node_registry.update_dependencies(self)
             self.state_machine.update_state()
+            self.notify_state_change()
 
     def generate_task_prompt(self):
         """
@@ -183,13 +420,10 @@ class AI_Node(LoggerMixin):
 
     def log_activity(self, activity, details=None):
         """
-        Log an activity with a timestamp.
+        Log an activity with a monotonic timestamp in the node's bounded activity log.
         """
-        timestamp = get_current_timestamp()
-        self.activity_logs.append(
-            {"activity": activity, "timestamp": timestamp, "details": details or {}}
-        )
-        self.log_node_event(self.name, self.node_id, f"Activity logged: {activity}")
+        self.activity_logs.append(activity, details)
+        self.log_node_event(self.name, self.node_id, "Activity logged: %s", activity)
 
     def clear_error(self, reason, dependency_id=None):
         """
@@ -206,20 +440,61 @@ class AI_Node(LoggerMixin):
 
         # Clear the error and re-evaluate the state
         self.state_machine.transition_to("waiting")
+        self.notify_state_change()
+
+    def subscribe_state_change(self, observer):
+        """
+        :param observer: Callable taking the node, called after each state or status
+            change reported through notify_state_change().
+        """
+        self.state_observers = self.state_observers + (observer,)
+
+    def unsubscribe_state_change(self, observer):
+        self.state_observers = tuple(o for o in self.state_observers if o != observer)
+
+    def notify_state_change(self):
+        """
+        Let the registry wake any nodes waiting on this one after a state or status
+        change, and tell the node's observers (e.g. its team).
+        """
+        if self.node_registry:
+            self.node_registry.notify_state_change(self.node_id)
+        for observer in self.state_observers:
+            observer(self)
+
+    def get_unresolved_dependencies(self):
+        """
+        Return the IDs of dependencies that are still unresolved.
+        Uses the registry's dependency index, so only unresolved entries are re-checked.
+        """
+        if not self.node_registry:
+            return [
+                get_dependency_id(dep)
+                for dep in self.dependencies
+                if not is_streaming_dependency(dep) and not self.check_dependency(dep)
+            ]
+        return [
+            dep_id
+            for dep_id in self.node_registry.get_unresolved_dependencies(self.node_id)
+            if not self.check_dependency(dep_id)
+        ]
 
     def check_dependencies(self):
         """
         Check if all dependencies are resolved.
         """
-        unresolved = [
-            dep for dep in self.dependencies if not self.check_dependency(dep)
-        ]
-        return len(unresolved) == 0  # Return True if all dependencies are resolved
+        if self.node_registry and self.node_registry.get_unresolved_count(self.node_id) == 0:
+            return True
+        return len(self.get_unresolved_dependencies()) == 0
 
     def check_dependency(self, dependency_id):
         """
         Checks a single dependency to see if it is resolved.
         """
+        dependency_id = get_dependency_id(dependency_id)
+        if not self.node_registry:
+            return False
+
         # Retrieve the node by its ID
         node = self.node_registry.get_node_by_id(dependency_id)
 
@@ -231,11 +506,9 @@ class AI_Node(LoggerMixin):
             return False  # Dependency unresolved because the node does not exist
 
         # Check if the node is in the desired state and status
-        is_resolved = (
-            node.get_status() == "idle" and node.state_machine.get_state() == "ready"
-        )
-
-        if is_resolved:
+        if is_node_resolved(node):
+            # Bring the index up to date in case the change was not reported
+            self.node_registry.notify_state_change(dependency_id)
             return True  # Dependency is resolved if the node meets the criteria
 
         # Log an info message for unresolved dependencies
@@ -266,3 +539,4 @@ class AI_Node(LoggerMixin):
             self.status = "idle"
         elif self.state_machine.current_state.name == "error":
             self.status = "error encountered"
+        self.notify_state_change()
@@ -0,0 +1,192 @@
+import json
+import threading
+import time
+from array import array
+
+from src.shared.config import ACTIVITY_LOG_CAPACITY
+
+# Add to a monotonic timestamp to get seconds since the Unix epoch
+MONOTONIC_EPOCH_OFFSET = time.time() - time.monotonic()
+
+_allocation_lock = threading.Lock()
+
+
+def to_wall_time(timestamp):
+    """
+    Convert a monotonic activity timestamp into seconds since the Unix epoch.
+    """
+    return timestamp + MONOTONIC_EPOCH_OFFSET
+
+
+class ActivityLog:
+    """
+    Fixed-capacity ring buffer of activity entries stored column by column.
+    Once full, the oldest entry is evicted and, if a spill path is set, appended to a JSONL file.
+    Storage is allocated on first use so idle nodes stay small.
+    """
+
+    __slots__ = (
+        "capacity",
+        "spill_path",
+        "spill_batch_size",
+        "evicted",
+        "_timestamps",
+        "_activities",
+        "_details",
+        "_start",
+        "_spill_buffer",
+        "_lock",
+    )
+
+    def __init__(
+        self, capacity=ACTIVITY_LOG_CAPACITY, spill_path=None, spill_batch_size=256
+    ):
+        if capacity < 1:
+            raise ValueError("Activity log capacity must be >= 1.")
+        self.capacity = capacity
+        self.spill_path = spill_path
+        self.spill_batch_size = spill_batch_size
+        self.evicted = 0  # Total entries pushed out of the buffer
+        self._timestamps = None
+        self._activities = None
+        self._details = None
+        self._start = 0  # Index of the oldest entry once the buffer is full
+        self._spill_buffer = None
+        self._lock = None
+
+    def append(self, activity, details=None, timestamp=None):
+        """
+        Record an activity with a monotonic timestamp.
+        """
+        if timestamp is None:
+            timestamp = time.monotonic()
+        if self._lock is None:
+            with _allocation_lock:
+                if self._lock is None:
+                    self._allocate()
+
+        with self._lock:
+            if len(self._activities) < self.capacity:
+                self._timestamps.append(timestamp)
+                self._activities.append(activity)
+                self._details.append(details)
+                return
+
+            index = self._start
+            if self.spill_path:
+                self._spill_buffer.append(
+                    (
+                        self._timestamps[index],
+                        self._activities[index],
+                        self._details[index],
+                    )
+                )
+                if len(self._spill_buffer) >= self.spill_batch_size:
+                    self._flush_spill()
+            self._timestamps[index] = timestamp
+            self._activities[index] = activity
+            self._details[index] = details
+            self._start = (index + 1) % self.capacity
+            self.evicted += 1
+
+    def export_columns(self):
+        """
+        Return the buffered entries, oldest first, as columns.
+        Timestamps are an array('d'), suitable for numpy.frombuffer.
+        """
+        if self._lock is None:
+            return {"timestamp": array("d"), "activity": [], "details": []}
+        with self._lock:
+            start = self._start
+            return {
+                "timestamp": self._timestamps[start:] + self._timestamps[:start],
+                "activity": self._activities[start:] + self._activities[:start],
+                "details": self._details[start:] + self._details[:start],
+            }
+
+    def write_jsonl(self, path, batch_size=1000):
+        """
+        Append the buffered entries to a JSONL file, writing batch_size lines at a time.
+        """
+        columns = self.export_columns()
+        rows = list(zip(columns["timestamp"], columns["activity"], columns["details"]))
+        with open(path, "a", encoding="utf-8") as handle:
+            for offset in range(0, len(rows), batch_size):
+                handle.write(encode_jsonl(rows[offset:offset + batch_size]))
+
+    def flush(self):
+        """
+        Write any evicted entries still waiting to be spilled.
+        """
+        if self._lock is None:
+            return
+        with self._lock:
+            self._flush_spill()
+
+    def clear(self):
+        """
+        Drop all buffered entries.
+        """
+        if self._lock is None:
+            return
+        with self._lock:
+            self._flush_spill()
+            self._timestamps = array("d")
+            self._activities = []
+            self._details = []
+            self._start = 0
+
+    def __len__(self):
+        return len(self._activities) if self._activities is not None else 0
+
+    def __iter__(self):
+        """Yield entries oldest first as {"activity", "timestamp", "details"} dicts."""
+        columns = self.export_columns()
+        for timestamp, activity, details in zip(
+            columns["timestamp"], columns["activity"], columns["details"]
+        ):
+            yield {
+                "activity": activity,
+                "timestamp": timestamp,
+                "details": details or {},
+            }
+
+    def __getitem__(self, index):
+        if not -len(self) <= index < len(self):
+            raise IndexError("Activity log index out of range.")
+        position = (self._start + index % len(self)) % len(self)
+        return {
+            "activity": self._activities[position],
+            "timestamp": self._timestamps[position],
+            "details": self._details[position] or {},
+        }
+
+    def _allocate(self):
+        """Create the column storage on first use."""
+        self._timestamps = array("d")
+        self._activities = []
+        self._details = []
+        self._spill_buffer = []
+        self._lock = threading.Lock()  # Set last: marks the storage as ready
+
+    def _flush_spill(self):
+        """Append evicted entries to the spill file. Caller holds the lock."""
+        if not self._spill_buffer:
+            return
+        with open(self.spill_path, "a", encoding="utf-8") as handle:
+            handle.write(encode_jsonl(self._spill_buffer))
+        self._spill_buffer = []
+
+
+def encode_jsonl(rows):
+    """
+    Encode (timestamp, activity, details) rows as JSON lines.
+    """
+    return "".join(
+        json.dumps(
+            {"timestamp": timestamp, "activity": activity, "details": details},
+            default=str,
+        )
+        + "\n"
+        for timestamp, activity, details in rows
+    )
@@ -0,0 +1,184 @@
+import json
+import os
+import threading
+
+from src.shared import config
+from src.shared.WorkflowState import as_workflow_state
+
+SNAPSHOT_FILE = "snapshot.json"
+JOURNAL_FILE = "journal.log"
+
+
+class CheckpointJournal:
+    """
+    Write-ahead log of workflow node changes, so a restarted workflow can skip
+    nodes that already completed. Every status change and node update made
+    through the attached WorkflowState is appended as one JSON line, written to
+    the OS immediately and fsynced in batches (every fsync_batch records or
+    fsync_interval seconds). After compact_every records the state is written to
+    an atomic snapshot and the log is truncated, so recovery reads one snapshot
+    plus a bounded tail regardless of how long the workflow has run.
+    """
+
+    def __init__(
+        self,
+        directory,
+        fsync_interval=config.CHECKPOINT_FSYNC_INTERVAL,
+        fsync_batch=config.CHECKPOINT_FSYNC_BATCH,
+        compact_every=config.CHECKPOINT_COMPACT_EVERY,
+    ):
+        self.directory = directory
+        self.snapshot_path = os.path.join(directory, SNAPSHOT_FILE)
+        self.journal_path = os.path.join(directory, JOURNAL_FILE)
+        self.fsync_interval = fsync_interval
+        self.fsync_batch = fsync_batch
+        self.compact_every = compact_every
+        self.store = None
+        self.seq = 0  # Sequence number of the last record written
+        self.snapshot_seq = 0  # Records up to this one are in the snapshot
+        self.unsynced = 0
+        self.compactions = 0
+        self._file = None
+        self._lock = threading.Lock()
+        self._closed = threading.Event()
+        self._syncer = None
+
+    def open(self, state=None):
+        """
+        Recover the checkpointed state and start journalling changes to it.
+        :param state: Optional WorkflowState or state dict to restore into; recovered
+            node fields override its own.
+        :return: The WorkflowState to run the workflow against.
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        store = as_workflow_state(state if state is not None else {})
+        nodes = self.recover()
+        store.restore(nodes)
+
+        self._file = open(self.journal_path, "a", encoding="utf-8")
+        self.store = store
+        store.journal = self
+        # Start from a fresh snapshot and an empty log, dropping any torn tail
+        store.checkpoint()
+        self._closed.clear()
+        self._syncer = threading.Thread(
+            target=self._sync_periodically, name="checkpoint-fsync", daemon=True
+        )
+        self._syncer.start()
+        return store
+
+    def recover(self):
+        """
+        Read the snapshot and replay newer journal records.
+        :return: Mapping of node name -> fields.
+        """
+        nodes = {}
+        if os.path.exists(self.snapshot_path):
+            with open(self.snapshot_path, encoding="utf-8") as handle:
+                snapshot = json.load(handle)
+            self.snapshot_seq = snapshot["seq"]
+            nodes = snapshot["nodes"]
+        self.seq = self.snapshot_seq
+
+        if os.path.exists(self.journal_path):
+            with open(self.journal_path, encoding="utf-8") as handle:
+                for line in handle:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        break  # Torn write at the tail from a crash
+                    if record["seq"] <= self.snapshot_seq:
+                        continue
+                    node = nodes.setdefault(record["node"], {})
+                    node.update(record.get("fields", {}))
+                    if "status" in record:
+                        node["status"] = record["status"]
+                    self.seq = record["seq"]
+        return nodes
+
+    def append(self, name, fields, status=None, has_status=True):
+        """
+        Log one node change. Called by the attached WorkflowState under its lock, so
+        records are in the order the changes were applied.
+        :return: True when the journal is due to be compacted.
+        """
+        with self._lock:
+            self.seq += 1
+            record = {"seq": self.seq, "node": name}
+            if has_status:
+                record["status"] = status
+            if fields:
+                record["fields"] = fields
+            self._file.write(json.dumps(record, default=str) + "\n")
+            self._file.flush()
+            self.unsynced += 1
+            if self.unsynced >= self.fsync_batch:
+                self._fsync()
+            return self.seq - self.snapshot_seq >= self.compact_every
+
+    def sync(self):
+        """fsync every record written so far."""
+        with self._lock:
+            if self.unsynced:
+                self._fsync()
+
+    def compact(self, nodes):
+        """
+        Write nodes to the snapshot and truncate the journal. Called through
+        WorkflowState.checkpoint(), which blocks state changes meanwhile.
+        Safe against crashes at any point: the snapshot is replaced atomically and
+        records it already covers are skipped on recovery.
+        """
+        with self._lock:
+            snapshot = {"seq": self.seq, "nodes": nodes}
+            temp_path = f"{self.snapshot_path}.tmp"
+            with open(temp_path, "w", encoding="utf-8") as handle:
+                json.dump(snapshot, handle, default=str)
+                handle.flush()
+                os.fsync(handle.fileno())
+            os.replace(temp_path, self.snapshot_path)
+            self._fsync_directory()  # The rename must be durable before truncating
+            self.snapshot_seq = self.seq
+            self._file.truncate(0)
+            self._file.seek(0)
+            self._fsync()
+            self.compactions += 1
+
+    def close(self):
+        """Flush everything to disk and detach from the state."""
+        self._closed.set()
+        if self._syncer is not None:
+            self._syncer.join()
+        with self._lock:
+            if self._file is None:
+                return
+            self._fsync()
+            self._file.close()
+            self._file = None
+        if self.store is not None and self.store.journal is self:
+            self.store.journal = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def _fsync(self):
+        """Caller holds the lock."""
+        os.fsync(self._file.fileno())
+        self.unsynced = 0
+
+    def _fsync_directory(self):
+        """fsync the directory so renames in it survive a crash."""
+        if os.name == "nt":
+            return  # Directories cannot be opened; NTFS journals the rename itself
+        fd = os.open(self.directory, os.O_RDONLY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+    def _sync_periodically(self):
+        while not self._closed.wait(self.fsync_interval):
+            self.sync()
@@ -0,0 +1,304 @@
+import asyncio
+import threading
+import time
+from collections import deque
+
+from src.shared import config
+from src.shared.utils import CircuitOpenError
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+def get_percentile(values, fraction):
+    """Nearest-rank percentile of values (fraction in [0, 1]), or None if empty."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(fraction * len(ordered) + 0.5) - 1))
+    return ordered[index]
+
+
+class CircuitBreaker:
+    """
+    Closed/open/half-open circuit breaker over the last window_size calls.
+    The breaker opens when the failure rate reaches failure_rate_threshold, or the
+    latency_percentile of call latencies exceeds latency_threshold, once min_calls
+    have been seen. While open, calls fail fast with CircuitOpenError; after
+    open_seconds, half_open_max_calls trial calls are let through and the breaker
+    closes if they all succeed. With hedge set, acall() starts a duplicate call
+    when the first has not finished by the latency_percentile deadline.
+    """
+
+    def __init__(
+        self,
+        name,
+        failure_rate_threshold=config.CIRCUIT_FAILURE_RATE_THRESHOLD,
+        latency_threshold=None,
+        latency_percentile=config.CIRCUIT_LATENCY_PERCENTILE,
+        window_size=config.CIRCUIT_WINDOW_SIZE,
+        min_calls=config.CIRCUIT_MIN_CALLS,
+        open_seconds=config.CIRCUIT_OPEN_SECONDS,
+        half_open_max_calls=config.CIRCUIT_HALF_OPEN_MAX_CALLS,
+        hedge=False,
+        is_failure=None,
+        clock=time.monotonic,
+    ):
+        """
+        :param is_failure: Predicate deciding whether an exception counts against the
+            breaker; by default every exception does.
+        """
+        self.name = name
+        self.failure_rate_threshold = failure_rate_threshold
+        self.latency_threshold = latency_threshold
+        self.latency_percentile = latency_percentile
+        self.min_calls = min_calls
+        self.open_seconds = open_seconds
+        self.half_open_max_calls = half_open_max_calls
+        self.hedge = hedge
+        self.is_failure = is_failure
+        self.clock = clock
+        self.state = CLOSED
+        self.outcomes = deque(maxlen=window_size)  # (succeeded, latency) pairs
+        self.opened_at = None
+        self.trial_calls = 0  # Calls let through since becoming half-open
+        self.trial_successes = 0
+        self.rejected = 0
+        self.hedged = 0
+        self.observers = ()
+        self._lock = threading.Lock()
+
+    def subscribe(self, observer):
+        """
+        :param observer: Callable taking (breaker, from_state, to_state).
+        """
+        with self._lock:
+            self.observers = self.observers + (observer,)
+
+    def unsubscribe(self, observer):
+        with self._lock:
+            self.observers = tuple(o for o in self.observers if o != observer)
+
+    def get_state(self):
+        """Return the state, moving from open to half-open once open_seconds have passed."""
+        with self._lock:
+            change = self._advance()
+            state = self.state
+        self._notify(change)
+        return state
+
+    def allow_request(self):
+        """Return True if a call may proceed now; counts it as a trial if half-open."""
+        with self._lock:
+            change = self._advance()
+            if self.state == OPEN:
+                self.rejected += 1
+                allowed = False
+            elif self.state == HALF_OPEN:
+                if self.trial_calls >= self.half_open_max_calls:
+                    self.rejected += 1
+                    allowed = False
+                else:
+                    self.trial_calls += 1
+                    allowed = True
+            else:
+                allowed = True
+        self._notify(change)
+        return allowed
+
+    def record_success(self, latency):
+        with self._lock:
+            self.outcomes.append((True, latency))
+            if self.state == HALF_OPEN:
+                self.trial_successes += 1
+                if self.trial_successes >= self.half_open_max_calls:
+                    change = self._transition(CLOSED)
+                else:
+                    change = None
+            else:
+                change = self._evaluate()
+        self._notify(change)
+
+    def record_failure(self, latency=None):
+        with self._lock:
+            self.outcomes.append((False, latency))
+            if self.state == HALF_OPEN:
+                change = self._transition(OPEN)
+            else:
+                change = self._evaluate()
+        self._notify(change)
+
+    def get_latency(self, fraction=None):
+        """Latency percentile of the calls in the window (default latency_percentile)."""
+        with self._lock:
+            return self._get_latency(fraction)
+
+    def get_stats(self):
+        with self._lock:
+            calls = len(self.outcomes)
+            failures = sum(1 for succeeded, _ in self.outcomes if not succeeded)
+            return {
+                "state": self.state,
+                "calls": calls,
+                "failure_rate": failures / calls if calls else 0.0,
+                "latency": self._get_latency(None),
+                "rejected": self.rejected,
+                "hedged": self.hedged,
+            }
+
+    async def acall(self, make_call):
+        """
+        Run make_call() through the breaker, hedging it if enabled.
+        :param make_call: Zero-argument callable returning an awaitable.
+        :raises CircuitOpenError: If the breaker rejects the call.
+        """
+        if not self.allow_request():
+            raise CircuitOpenError(f"Circuit breaker '{self.name}' is open.")
+        started = self.clock()
+        deadline = self.get_hedge_deadline()
+        try:
+            if deadline is None:
+                result = await make_call()
+            else:
+                result = await self._hedged(make_call, deadline)
+        except asyncio.CancelledError:
+            self.release_trial()
+            raise
+        except Exception as e:
+            self._record_error(e, self.clock() - started)
+            raise
+        self.record_success(self.clock() - started)
+        return result
+
+    async def astream(self, make_stream):
+        """
+        Yield the chunks of make_stream() through the breaker. Streams are never
+        hedged, since chunks already passed on cannot be taken back.
+        :param make_stream: Zero-argument callable returning an async iterator.
+        :raises CircuitOpenError: If the breaker rejects the call.
+        """
+        if not self.allow_request():
+            raise CircuitOpenError(f"Circuit breaker '{self.name}' is open.")
+        started = self.clock()
+        stream = make_stream()
+        try:
+            async for chunk in stream:
+                yield chunk
+        except (asyncio.CancelledError, GeneratorExit):
+            self.release_trial()
+            raise
+        except Exception as e:
+            self._record_error(e, self.clock() - started)
+            raise
+        finally:
+            if hasattr(stream, "aclose"):
+                await stream.aclose()
+        self.record_success(self.clock() - started)
+
+    def release_trial(self):
+        """
+        Give back the half-open trial slot of a call abandoned before it finished, so
+        the breaker does not wait forever for an outcome that will not come.
+        """
+        with self._lock:
+            if self.state == HALF_OPEN and self.trial_calls > self.trial_successes:
+                self.trial_calls -= 1
+
+    def _record_error(self, error, latency):
+        if self.is_failure is None or self.is_failure(error):
+            self.record_failure(latency)
+        else:
+            self.record_success(latency)
+
+    async def _hedged(self, make_call, deadline):
+        """Return the first result of make_call(), duplicated if slower than deadline."""
+        tasks = [asyncio.ensure_future(make_call())]
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=deadline)
+            if not done:
+                with self._lock:
+                    self.hedged += 1
+                tasks.append(asyncio.ensure_future(make_call()))
+            pending, error = set(tasks), None
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    if task.exception() is None:
+                        return task.result()
+                    error = task.exception()
+            raise error
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    def get_hedge_deadline(self):
+        """Seconds after which acall() hedges, or None if hedging is off or unproven."""
+        if not self.hedge:
+            return None
+        with self._lock:
+            timed = sum(1 for _, latency in self.outcomes if latency is not None)
+            return self._get_latency(None) if timed >= self.min_calls else None
+
+    def _get_latency(self, fraction):
+        """Caller holds the lock."""
+        latencies = [latency for _, latency in self.outcomes if latency is not None]
+        return get_percentile(
+            latencies, self.latency_percentile if fraction is None else fraction
+        )
+
+    def _advance(self):
+        """Caller holds the lock. Returns the change for _notify(), if any."""
+        if self.state == OPEN and self.clock() - self.opened_at >= self.open_seconds:
+            return self._transition(HALF_OPEN)
+        return None
+
+    def _evaluate(self):
+        """Open a closed breaker whose window breaches a threshold. Caller holds the lock."""
+        calls = len(self.outcomes)
+        if self.state != CLOSED or calls < self.min_calls:
+            return None
+        failures = sum(1 for succeeded, _ in self.outcomes if not succeeded)
+        if failures / calls >= self.failure_rate_threshold:
+            return self._transition(OPEN)
+        if self.latency_threshold is not None:
+            latency = self._get_latency(None)
+            if latency is not None and latency > self.latency_threshold:
+                return self._transition(OPEN)
+        return None
+
+    def _transition(self, state):
+        """Caller holds the lock. Returns the change for _notify()."""
+        previous, self.state = self.state, state
+        if state == OPEN:
+            self.opened_at = self.clock()
+        elif state == HALF_OPEN:
+            self.trial_calls = 0
+            self.trial_successes = 0
+        elif state == CLOSED:
+            self.outcomes.clear()
+        return previous, state
+
+    def _notify(self, change):
+        """Call observers outside the lock."""
+        if change is None:
+            return
+        for observer in self.observers:
+            observer(self, *change)
+
+
+_breakers = {}
+_breakers_lock = threading.Lock()
+
+
+def get_circuit_breaker(name, **options):
+    """
+    Return the shared breaker for name (e.g. a provider), creating it with options.
+    """
+    with _breakers_lock:
+        breaker = _breakers.get(name)
+        if breaker is None:
+            breaker = _breakers[name] = CircuitBreaker(name, **options)
+        return breaker
@@ -1,16 +1,101 @@
+import re
+
+from src.shared import config
 from src.shared.AI_Node import AI_Node
+from src.shared.ModelClient import get_default_model_client
+from src.shared.ResponseCache import get_default_response_cache, make_cache_key
 from src.shared.utils import get_current_timestamp
 
 
 class GPTNode(AI_Node):
+    __slots__ = ("model_client", "model", "response_cache", "batcher")
+
+    def __init__(
+        self,
+        *args,
+        in_model_client=None,
+        in_model=config.DEFAULT_MODEL,
+        in_response_cache=None,
+        in_batcher=None,
+        **kwargs,
+    ):
+        """
+        Initialize the GPTNode. Without a model client (or a configured
+        MODEL_API_BASE_URL) responses are simulated. Responses go through
+        in_response_cache, or the shared ResponseCache when RESPONSE_CACHE_ENABLED is
+        set; pass False to bypass caching. With in_batcher (see
+        MicroBatcher.make_model_batcher) prompts are sent in batches with other nodes'.
+        """
+        self.model_client = in_model_client or get_default_model_client()
+        self.model = in_model
+        if in_response_cache is None:
+            in_response_cache = get_default_response_cache()
+        self.response_cache = in_response_cache or None
+        self.batcher = in_batcher
+        super().__init__(*args, **kwargs)
+
     def generate_task_prompt(self):
         """Generate a detailed GPT-specific task prompt."""
         if not self.task:
             raise ValueError("No task assigned to generate a task prompt.")
         return f"System: {self.identity_prompt.format(purpose=self.purpose)}\nTask: {self.task}"
 
-    def process_task(self):
+    async def aexecute_prompt(self, prompt):
+        """Send the prompt to the model provider."""
+        if self.model_client is None:
+            # Simulate API call when no provider is configured
+            return f"GPT response for: {self.task}"
+        if self.response_cache is None:
+            return await self.request_completion(prompt)
+
+        return await self.response_cache.aget_or_compute(
+            self.get_cache_key(prompt), lambda: self.request_completion(prompt)
+        )
+
+    async def astream_prompt(self, prompt):
+        """
+        Yield the model's output as the provider streams it. Cached responses are
+        yielded whole and complete streams are added to the cache.
+        """
+        if self.model_client is None:
+            # Simulate a streamed API call word by word
+            for chunk in re.findall(r"\S+\s*", f"GPT response for: {self.task}"):
+                yield chunk
+            return
+        key = None
+        if self.response_cache is not None:
+            key = self.get_cache_key(prompt)
+            cached = await self.response_cache.aget(key)
+            if cached is not None:
+                yield cached
+                return
+
+        chunks = []
+        async for chunk in self.model_client.stream_complete(prompt, model=self.model):
+            chunks.append(chunk)
+            yield chunk
+        if key is not None:
+            await self.response_cache.aset(key, "".join(chunks))
+
+    def get_cache_key(self, prompt):
+        return make_cache_key(
+            self.model,
+            prompt,
+            provider=self.model_client.provider,
+            base_url=self.model_client.base_url,
+        )
+
+    async def request_completion(self, prompt):
+        """Call the model, through the batcher if the node has one."""
+        if self.batcher is not None:
+            return await self.batcher.submit((self.model, prompt))
+        return await self.model_client.complete(prompt, model=self.model)
+
+    async def aprocess_task(self):
         """Process the task using the GPT API."""
+        circuit_open = self.get_circuit_open_response()
+        if circuit_open is not None:
+            return circuit_open
         if not self.task:
             self.log_error(
                 f"No task assigned to Node {self.name} (ID: {self.node_id})."
@@ -19,10 +104,9 @@ class GPTNode(AI_Node):
 
         try:
             prompt = self.generate_task_prompt()
-            self.log_node_event(self.name, self.node_id, f"Generated prompt: {prompt}")
+            self.log_node_event(self.name, self.node_id, "Generated prompt: %s", prompt)
 
-            # Simulate API call (replace with actual API integration)
-            output = f"GPT response for: {self.task}"
+            output = await self.aexecute_guarded(prompt)
 
             result = {
                 "status": "success",
@@ -1,17 +1,110 @@
+import asyncio
+
+from src.shared.MessageBus import MailboxFullError, MessageBus
+from src.shared.NodeMessage import DependencyResponseMessage
+from src.shared.Orchestrator import Orchestrator
+from src.shared.dispatch import LeastOutstandingWorkPolicy, get_dispatch_policy
+from src.shared.utils import run_sync
+
+
 class GlobalOrchestrator(Orchestrator):
-    def __init__(self, name="Global Orchestrator"):
+    def __init__(
+        self, name="Global Orchestrator", message_bus=None, dispatch_policy=None
+    ):
+        """
+        :param dispatch_policy: Optional DispatchPolicy (or built-in policy name). When
+            set, goal tasks go to the least-loaded team able to run them instead of the
+            team named by break_down_goal().
+        """
         super().__init__(name)
-        self.teams = {}  # Dictionary to track team orchestrators
+        self.teams = {}  # Team orchestrators, local or RemoteTeam proxies
+        self.team_progress = {}  # team_name -> progress merged from team reports
+        self.message_bus = message_bus or MessageBus()
+        self.dispatch_policy = get_dispatch_policy(dispatch_policy)
+
+    def register_team(self, team_orchestrator):
+        """Register a team orchestrator and give it a mailbox on the message bus."""
+        self.teams[team_orchestrator.team_name] = team_orchestrator
+        self.message_bus.register(team_orchestrator.team_name)
+        self.log_activity(f"Registered team: {team_orchestrator.team_name}")
 
     def assign_high_level_goal(self, goal_description):
         """Break down the global goal and distribute tasks to team orchestrators."""
         self.log_activity(f"Assigning goal: {goal_description}")
         tasks = self.break_down_goal(goal_description)
         for team_name, task in tasks.items():
-            if team_name in self.teams:
+            if self.dispatch_policy is not None:
+                self.dispatch_task(task)
+            elif team_name in self.teams:
                 self.teams[team_name].assign_task(task)
             else:
-                self.log_activity(f"Team {team_name} not found!")
+                self.log_activity(f"Team {team_name} not found; dispatching by load.")
+                self.dispatch_task(task)
+        self.steal_work()
+
+    def dispatch_task(self, task, policy=None):
+        """
+        Send a task to whichever team able to run it is chosen by the dispatch policy.
+        :param policy: Overrides the orchestrator's policy; least outstanding work if
+            neither is set.
+        :return: The node the task was assigned to, or None.
+        """
+        policy = (
+            get_dispatch_policy(policy)
+            or self.dispatch_policy
+            or LeastOutstandingWorkPolicy()
+        )
+        candidates = [
+            team.get_load(task)
+            for team in self.teams.values()
+            if team.supports_task(task)
+        ]
+        if not candidates:
+            self.log_activity(f"No team can handle task: {task}.")
+            return None
+        team_name = policy.select(candidates).target_id
+        self.log_activity(f"Dispatching task '{task}' to team {team_name}.")
+        return self.teams[team_name].assign_task(task)
+
+    def steal_work(self):
+        """
+        Move queued tasks from backed-up teams to teams with idle nodes that can run
+        them. Teams with queued work of their own do not steal, victims are drained
+        deepest queue first, and each victim decides what it gives up (see
+        LocalOrchestrator.steal_tasks()).
+        :return: Number of tasks moved.
+        """
+        depths = {name: team.get_queue_depth() for name, team in self.teams.items()}
+        victims = sorted(
+            (name for name, depth in depths.items() if depth),
+            key=depths.get,
+            reverse=True,
+        )
+        moved = 0
+        for thief_name, thief in self.teams.items():
+            if not victims:
+                break
+            if depths[thief_name]:
+                continue
+            capacity = thief.get_idle_capacity()
+            for victim_name in victims:
+                if capacity["nodes"] <= 0 or not capacity["tasks"]:
+                    break
+                stolen = self.teams[victim_name].steal_tasks(
+                    capacity["tasks"], capacity["nodes"]
+                )
+                for task, priority in stolen:
+                    thief.assign_task(task, priority)
+                if stolen:
+                    self.log_activity(
+                        f"Team {thief_name} stole {len(stolen)} task(s) "
+                        f"from team {victim_name}."
+                    )
+                    capacity["nodes"] -= len(stolen)
+                    moved += len(stolen)
+            depths = {name: team.get_queue_depth() for name, team in self.teams.items()}
+            victims = [name for name in victims if depths[name]]
+        return moved
 
     def break_down_goal(self, goal_description):
         """Break a goal into smaller tasks (dummy implementation for now)."""
@@ -22,14 +115,91 @@ class GlobalOrchestrator(Orchestrator):
         }
 
     def collect_team_updates(self):
-        """Aggregate progress from all team orchestrators."""
-        for team_name, orchestrator in self.teams.items():
-            updates = orchestrator.report_progress()
-            self.update_context(team_name, updates)
-
-    def mediate_team_interaction(self, source_team, target_team, data):
-        """Facilitate communication between teams via the orchestrator."""
-        if target_team in self.teams:
-            self.teams[target_team].receive_data(data, from_team=source_team)
-        else:
+        """
+        Aggregate progress from all team orchestrators.
+        Thin synchronous wrapper over acollect_team_updates().
+        """
+        return run_sync(self.acollect_team_updates())
+
+    async def acollect_team_updates(self):
+        """
+        Ask every team for its progress delta concurrently and merge the deltas into
+        team_progress. A team seen for the first time, or that failed to report, is
+        asked for a full report.
+        :return: Mapping of team name -> {"seq", "counts", "nodes"}, where nodes maps
+            node IDs to their last reported status.
+        """
+        teams = list(self.teams.items())
+        reports = await asyncio.gather(
+            *(
+                asyncio.to_thread(
+                    orchestrator.report_progress, team_name not in self.team_progress
+                )
+                for team_name, orchestrator in teams
+            ),
+            return_exceptions=True,
+        )
+        for (team_name, orchestrator), report in zip(teams, reports):
+            if isinstance(report, Exception):
+                self.team_progress.pop(team_name, None)
+                self.log_activity(
+                    f"Progress report from team {team_name} failed: {report}"
+                )
+                continue
+            progress = self.team_progress.get(team_name)
+            if not report["full"] and report["seq"] != progress["seq"] + 1:
+                # Someone else took the reports in between; resynchronize
+                report = await asyncio.to_thread(orchestrator.report_progress, True)
+            self.merge_progress(team_name, report)
+        return self.team_progress
+
+    def merge_progress(self, team_name, report):
+        """Apply a team's progress report to team_progress."""
+        progress = self.team_progress.get(team_name)
+        if progress is None or report["full"]:
+            progress = self.team_progress[team_name] = {"nodes": {}}
+        progress["seq"] = report["seq"]
+        progress["counts"] = report["counts"]
+        progress["nodes"].update(report["changed"])
+        self.update_context(team_name, progress)
+
+    def mediate_team_interaction(self, source_team, target_team, data, timeout=0):
+        """
+        Facilitate communication between teams via the message bus.
+        Unless a consumer (MessageBus.start_consumer() or aconsume()) drains the
+        target's mailbox, queued messages are delivered to the team right away.
+        Returns True once queued, or False if the target's mailbox stays full (backpressure).
+        """
+        if target_team not in self.teams:
             self.log_activity(f"Target team {target_team} not found.")
+            return False
+
+        mailbox = self.message_bus.register(target_team)
+        message = DependencyResponseMessage(source_team, target_team, None, data)
+        try:
+            self.message_bus.publish(message, timeout)
+        except MailboxFullError:
+            self.log_activity(
+                f"Mailbox for team {target_team} is full; message deferred."
+            )
+            return False
+        if not mailbox.consumers:
+            self.deliver_team_messages(team_names=[target_team])
+        return True
+
+    def deliver_team_messages(self, max_messages=None, team_names=None):
+        """
+        Deliver queued inter-team messages in priority order, one batch per team.
+        :param team_names: Teams to deliver to; all teams if None.
+        Returns the number of messages delivered.
+        """
+        delivered = 0
+        for team_name in team_names or list(self.teams):
+            orchestrator = self.teams[team_name]
+            mailbox = self.message_bus.register(team_name)
+            for message in mailbox.get_batch(max_messages or len(mailbox)):
+                orchestrator.receive_data(
+                    message.provided_data, from_team=message.sender
+                )
+                delivered += 1
+        return delivered
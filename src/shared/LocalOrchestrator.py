@@ -1,31 +1,417 @@
+import heapq
+import itertools
+import threading
+from collections import Counter
+
+from src.shared import config
+from src.shared.Orchestrator import Orchestrator
+from src.shared.dispatch import Candidate, LoadTracker, get_dispatch_policy
+
+
+class IdleNodeIndex:
+    """
+    Per-task pools of idle nodes. Pools are heaps ordered by node priority (lower first)
+    and then least-recently-used, or by LRU alone. Entries for nodes that were claimed
+    or went busy are discarded lazily when they reach the top of a heap, and all pools
+    are rebuilt once stale entries outnumber live ones.
+    """
+
+    def __init__(self, order="priority"):
+        if order not in ("priority", "lru"):
+            raise ValueError(f"Unknown pool order: {order}")
+        self.order = order
+        self.pools = {}  # task -> heap of (sort key, token, node)
+        self.idle = {}  # node_id -> the entry of its current pool entries
+        self.entries = 0  # Entries in all pools, live or stale
+        self.live_entries = 0  # Entries of pooled nodes
+        self._tokens = itertools.count()
+        self._lock = threading.Lock()
+
+    def add(self, node):
+        """Make a node available for every task it supports."""
+        key = node.priority if self.order == "priority" else 0
+        with self._lock:
+            current = self.idle.get(node.node_id)
+            if current is not None:
+                if self.order == "priority" and current[0] == key:
+                    return  # Already pooled; keep its place
+                self._discard(node)
+            entry = (key, next(self._tokens), node)
+            self.idle[node.node_id] = entry
+            for task in node.supported_tasks:
+                heapq.heappush(self.pools.setdefault(task, []), entry)
+            self.entries += len(node.supported_tasks)
+            self.live_entries += len(node.supported_tasks)
+            if self.entries > 2 * self.live_entries + len(self.pools):
+                self._compact()
+
+    def remove(self, node):
+        """Withdraw a node from every pool."""
+        with self._lock:
+            if node.node_id in self.idle:
+                self._discard(node)
+
+    def count_idle(self):
+        """Number of pooled nodes that are still idle."""
+        with self._lock:
+            return sum(
+                1 for _, _, node in self.idle.values() if node.get_status() == "idle"
+            )
+
+    def claim(self, task, choose=None):
+        """
+        Atomically take an idle node for a task, or return None.
+        :param choose: Optional callable picking one node from the list of idle nodes
+            supporting the task; defaults to the top of the pool.
+        """
+        with self._lock:
+            if choose is None:
+                node = self._peek(task)
+                if node is not None:
+                    heapq.heappop(self.pools[task])
+                    self.entries -= 1
+                    self._discard(node)
+                return node
+
+            live = self._get_live_entries(task)
+            node = choose([entry[2] for entry in live]) if live else None
+            if node is not None:
+                self._discard(node)
+                live = [entry for entry in live if entry[2] is not node]
+            heapq.heapify(live)
+            self.entries -= len(self.pools.get(task, ())) - len(live)
+            self.pools[task] = live
+            return node
+
+    def peek(self, task):
+        """Return the node claim() would take, without claiming it."""
+        with self._lock:
+            return self._peek(task)
+
+    def _peek(self, task):
+        """Drop stale entries from the top of a pool. Caller holds the lock."""
+        pool = self.pools.get(task)
+        while pool:
+            entry = pool[0]
+            node = entry[2]
+            is_current = self.idle.get(node.node_id) is entry
+            if is_current and node.get_status() == "idle":
+                return node
+            heapq.heappop(pool)
+            self.entries -= 1
+            if is_current:
+                self._discard(node)  # Went busy without a refresh
+        return None
+
+    def _get_live_entries(self, task):
+        """Return a pool's entries for nodes that are still idle. Caller holds the lock."""
+        live = []
+        for entry in self.pools.get(task, ()):
+            node = entry[2]
+            if self.idle.get(node.node_id) is not entry:
+                continue
+            if node.get_status() != "idle":
+                self._discard(node)
+                continue
+            live.append(entry)
+        return live
+
+    def _discard(self, node):
+        """Make a pooled node's entries stale. Caller holds the lock."""
+        del self.idle[node.node_id]
+        self.live_entries -= len(node.supported_tasks)
+
+    def _compact(self):
+        """Rebuild every pool without its stale entries. Caller holds the lock."""
+        for task, pool in self.pools.items():
+            live = [entry for entry in pool if self.idle.get(entry[2].node_id) is entry]
+            heapq.heapify(live)
+            self.pools[task] = live
+        self.entries = sum(len(pool) for pool in self.pools.values())
+
+
+class RunQueue:
+    """
+    Tasks waiting for a free node, with one heap per task type served by priority
+    (lower first) and then arrival order. Pinned tasks only run in the owning team;
+    the rest may be stolen by teams with idle nodes.
+    """
+
+    def __init__(self):
+        self.pinned = {}  # task -> heap of (priority, seq, task)
+        self.shared = {}  # task -> heap of (priority, seq, task), open to stealing
+        self.size = 0
+        self._seq = itertools.count()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return self.size
+
+    def push(self, task, priority=1, pinned=False):
+        with self._lock:
+            heaps = self.pinned if pinned else self.shared
+            entry = (priority, next(self._seq), task)
+            heapq.heappush(heaps.setdefault(task, []), entry)
+            self.size += 1
+
+    def pop(self, tasks):
+        """
+        Take the most urgent task of one of the given types.
+        :return: (task, priority, pinned), or None if none is queued.
+        """
+        with self._lock:
+            return self._pop(tasks, (self.pinned, self.shared))
+
+    def steal(self, tasks, max_tasks):
+        """
+        Take up to max_tasks of the most urgent unpinned tasks of the given types.
+        :return: List of (task, priority).
+        """
+        stolen = []
+        with self._lock:
+            while len(stolen) < max_tasks:
+                entry = self._pop(tasks, (self.shared,))
+                if entry is None:
+                    break
+                stolen.append(entry[:2])
+        return stolen
+
+    def _pop(self, tasks, sources):
+        """Caller holds the lock."""
+        best = None
+        for heaps in sources:
+            for task in tasks:
+                heap = heaps.get(task)
+                if heap and (best is None or heap[0] < best[1][0]):
+                    best = (heaps, heap)
+        if best is None:
+            return None
+        heaps, heap = best
+        priority, _, task = heapq.heappop(heap)
+        self.size -= 1
+        return task, priority, heaps is self.pinned
+
+
 class LocalOrchestrator(Orchestrator):
-    def __init__(self, team_name):
+    def __init__(
+        self,
+        team_name,
+        pool_order="priority",
+        dispatch_policy=None,
+        steal_threshold=config.WORK_STEAL_MIN_QUEUE_DEPTH,
+    ):
+        """
+        :param pool_order: "priority" or "lru" ordering of idle nodes.
+        :param dispatch_policy: Optional DispatchPolicy (or built-in policy name) that
+            picks among idle nodes using their observed load; by default the top of
+            the idle pool is taken.
+        :param steal_threshold: Number of queued tasks the team always keeps for
+            itself rather than letting other teams steal them.
+        """
         super().__init__(name=f"Local Orchestrator: {team_name}")
         self.team_name = team_name
         self.nodes = {}  # Dictionary of nodes in this team
+        self.idle_index = IdleNodeIndex(pool_order)
+        self.dispatch_policy = get_dispatch_policy(dispatch_policy)
+        self.load = LoadTracker()
+        self.dispatched_at = {}  # node_id -> start time of its current task
+        self.node_status = {}  # node_id -> status the idle index reflects
+        self.task_capacity = Counter()  # task -> number of nodes supporting it
+        self.run_queue = RunQueue()  # Tasks that arrived while no node was free
+        self.steal_threshold = steal_threshold
+        self.reported_status = {}  # node_id -> status in the last progress report
+        self.status_counts = Counter()  # status -> nodes, as of the last report
+        self.changed_nodes = set()  # Nodes whose status may have changed since then
+        self.progress_seq = 0  # Number of progress reports made
+        self._progress_lock = threading.Lock()
+
+    def register_node(self, node):
+        """
+        Register a node in the team and index it if it is idle. The team follows
+        the node's later status changes through its state change observers.
+        """
+        if node.node_id not in self.nodes:
+            self.task_capacity.update(node.supported_tasks)
+            node.subscribe_state_change(self.on_node_state_change)
+        super().register_node(node)
+        self.refresh_node(node)
+
+    def supports_task(self, task):
+        """Return True if any node in the team supports the task."""
+        return self.task_capacity[task] > 0
+
+    def get_load(self, task=None, priority=1):
+        """
+        Summarize the team's load as a Candidate for team-level dispatch.
+        Outstanding work is divided by the number of nodes that can run the task.
+        """
+        capacity = self.task_capacity[task] if task is not None else len(self.nodes)
+        outstanding = self.load.get_outstanding() + len(self.run_queue)
+        return Candidate(
+            self.team_name,
+            priority,
+            outstanding / max(capacity, 1),
+            self.load.get_latency(),
+        )
+
+    def refresh_node(self, node):
+        """
+        Re-index a node after its status changed. Nodes running a task the team
+        dispatched stay out of the idle pools until they respond.
+        """
+        status = node.get_status()
+        self.node_status[node.node_id] = status
+        self.mark_changed(node.node_id)
+        if status == "idle" and node.node_id not in self.dispatched_at:
+            self.idle_index.add(node)
+        else:
+            self.idle_index.remove(node)
+
+    def on_node_state_change(self, node):
+        """
+        Observer keeping the idle pools in step with status changes nodes make, and
+        handing queued work to nodes that become idle.
+        """
+        status = node.get_status()
+        if status == self.node_status.get(node.node_id):
+            return
+        self.refresh_node(node)
+        if status == "idle" and node.node_id not in self.dispatched_at:
+            self.run_queued(node)
 
-    def assign_task(self, task):
-        """Distribute tasks to suitable nodes within the team."""
-        suitable_node = self.find_suitable_node(task)
+    def assign_task(self, task, priority=1, pinned=False):
+        """
+        Distribute tasks to suitable nodes within the team. Tasks the team supports
+        but has no idle node for are queued until one of its nodes responds.
+        :param priority: Queue priority if the task has to wait (lower runs first).
+        :param pinned: Keep the task in this team even if it waits.
+        :return: The node the task was assigned to, or None.
+        """
+        suitable_node = self.claim_node(task)
         if suitable_node:
-            suitable_node.set_task(task)
+            try:
+                suitable_node.set_task(task)
+            except Exception:
+                self.refresh_node(suitable_node)  # Return the node to its pools
+                raise
+            self.dispatched_at[suitable_node.node_id] = self.load.start(
+                suitable_node.node_id
+            )
+            self.mark_changed(suitable_node.node_id)
             self.log_activity(f"Task '{task}' assigned to node {suitable_node.name}.")
+        elif self.supports_task(task):
+            self.run_queue.push(task, priority, pinned)
+            self.log_activity(f"No idle node for task '{task}'; queued.")
         else:
             self.log_activity(f"No suitable node found for task: {task}.")
+        return suitable_node
+
+    def run_queued(self, node):
+        """Give a node that became idle the most urgent queued task it supports."""
+        entry = self.run_queue.pop(node.supported_tasks)
+        if entry is not None:
+            self.assign_task(*entry)
+
+    def get_queue_depth(self):
+        return len(self.run_queue)
+
+    def get_idle_capacity(self):
+        """
+        Summarize what the team could take on now, for work stealing.
+        :return: {"nodes": number of idle nodes, "tasks": task types they support}
+        """
+        tasks = [task for task in self.task_capacity if self.find_suitable_node(task)]
+        return {"nodes": self.idle_index.count_idle(), "tasks": tasks}
+
+    def steal_tasks(self, tasks, max_tasks):
+        """
+        Hand queued tasks over to another team, most urgent first. The team keeps
+        at least steal_threshold queued tasks, and pinned tasks are never given up.
+        :param tasks: Task types the stealing team can run.
+        :return: List of (task, priority) removed from the queue.
+        """
+        max_tasks = min(max_tasks, len(self.run_queue) - self.steal_threshold)
+        if max_tasks <= 0:
+            return []
+        stolen = self.run_queue.steal(tasks, max_tasks)
+        if stolen:
+            self.log_activity(f"{len(stolen)} queued task(s) stolen by another team.")
+        return stolen
 
     def find_suitable_node(self, task):
         """Find a node capable of handling the task."""
-        # Example logic: Return the first idle node that supports the task
-        for node in self.nodes.values():
-            if node.is_task_supported(task) and node.get_status() == "idle":
-                return node
-        return None
+        return self.idle_index.peek(task)
+
+    def claim_node(self, task):
+        """Atomically claim an idle node that supports the task."""
+        if self.dispatch_policy is None:
+            return self.idle_index.claim(task)
+        return self.idle_index.claim(task, self.choose_node)
+
+    def choose_node(self, nodes):
+        """Pick one of several idle nodes with the dispatch policy."""
+        by_id = {node.node_id: node for node in nodes}
+        candidates = [
+            self.load.get_candidate(node.node_id, node.priority) for node in nodes
+        ]
+        return by_id[self.dispatch_policy.select(candidates).target_id]
+
+    def record_response(self, node_id, node, response):
+        """Record a node's response and return it to the idle pools if it is idle again."""
+        super().record_response(node_id, node, response)
+        if node_id in self.dispatched_at:
+            self.load.finish(node_id, self.dispatched_at.pop(node_id))
+        if response.get("status") != "timeout":
+            self.refresh_node(node)
+            if node.get_status() == "idle":
+                self.run_queued(node)
+
+    def mark_changed(self, node_id):
+        """Include a node in the next progress report."""
+        with self._progress_lock:
+            self.changed_nodes.add(node_id)
 
-    def report_progress(self):
-        """Collect progress updates from all nodes."""
-        progress = {node_id: node.get_status() for node_id, node in self.nodes.items()}
-        self.log_activity(f"Progress report: {progress}")
-        return {"team_name": self.team_name, "progress": progress}
+    def report_progress(self, full=False):
+        """
+        Summarize progress since the last report: node counts per status and the
+        statuses of nodes that changed. Only nodes marked as changed are checked, so
+        a report costs O(changes); nodes are marked when the team assigns, refreshes
+        or hears from them, and whenever they report a status change through
+        notify_state_change().
+        :param full: Check every node and list all of them under "changed", e.g.
+            for a new listener or after a status was assigned without notification.
+        """
+        with self._progress_lock:
+            node_ids = list(self.nodes) if full else self.changed_nodes
+            self.changed_nodes = set()
+            changed = {}
+            for node_id in node_ids:
+                if node_id not in self.nodes:
+                    continue
+                status = self.nodes[node_id].get_status()
+                previous = self.reported_status.get(node_id)
+                if status != previous:
+                    if previous is not None:
+                        self.status_counts[previous] -= 1
+                        if not self.status_counts[previous]:
+                            del self.status_counts[previous]
+                    self.status_counts[status] += 1
+                    self.reported_status[node_id] = status
+                if full or status != previous:
+                    changed[node_id] = status
+            self.progress_seq += 1
+            report = {
+                "team_name": self.team_name,
+                "seq": self.progress_seq,
+                "full": full,
+                "counts": dict(self.status_counts),
+                "changed": changed,
+            }
+        self.log_activity(
+            f"Progress report {report['seq']}: {report['counts']}, "
+            f"{len(changed)} changed"
+        )
+        return report
 
     def receive_data(self, data, from_team=None):
         """Handle incoming data from other teams."""
@@ -0,0 +1,313 @@
+import asyncio
+import heapq
+import itertools
+import math
+import threading
+import time
+
+from src.shared.MessageCodec import encode_deadline
+from src.shared.utils import MessagingError
+
+DEFAULT_MAILBOX_CAPACITY = 1000
+DEFAULT_MESSAGE_PRIORITY = 5  # Lower numbers are delivered first
+DEFAULT_BATCH_SIZE = 64
+
+
+class MailboxFullError(MessagingError):
+    """Raised when a recipient's mailbox stays full for the whole publish timeout."""
+
+    pass
+
+
+class UnknownRecipientError(MessagingError):
+    """Raised when a message is addressed to a recipient without a mailbox."""
+
+    pass
+
+
+def get_message_order(message):
+    """
+    Return the (priority, deadline) ordering key of a message.
+    Messages without a priority or deadline sort after those that have one.
+    """
+    priority = getattr(message, "priority", None)
+    deadline = getattr(message, "deadline", None)
+    return (
+        DEFAULT_MESSAGE_PRIORITY if priority is None else priority,
+        math.inf if deadline is None else encode_deadline(deadline),
+    )
+
+
+class Mailbox:
+    """
+    Bounded per-recipient queue that dequeues by priority, then deadline, then arrival.
+    Usable from threads and from asyncio code at the same time.
+    """
+
+    def __init__(self, capacity=DEFAULT_MAILBOX_CAPACITY):
+        self.capacity = capacity
+        self.heap = []
+        self.closed = False
+        self.consumers = 0  # Consumers started through MessageBus that drain the mailbox
+        self._sequence = itertools.count()
+        self._lock = threading.Lock()
+        self._not_empty = threading.Condition(self._lock)
+        self._not_full = threading.Condition(self._lock)
+        self._async_readers = []  # (loop, future) pairs waiting for messages
+        self._async_writers = []  # (loop, future) pairs waiting for space
+
+    def __len__(self):
+        return len(self.heap)
+
+    def attach_consumer(self):
+        """Record a consumer that drains the mailbox as messages arrive."""
+        with self._lock:
+            self.consumers += 1
+
+    def detach_consumer(self):
+        with self._lock:
+            self.consumers -= 1
+
+    def get_pressure(self):
+        """Fraction of the mailbox in use, for backpressure decisions."""
+        return len(self.heap) / self.capacity
+
+    def try_put(self, message):
+        """Add a message if there is room. Returns False when the mailbox is full."""
+        with self._lock:
+            if self.closed:
+                raise MessagingError("Mailbox is closed.")
+            if len(self.heap) >= self.capacity:
+                return False
+            heapq.heappush(
+                self.heap, (*get_message_order(message), next(self._sequence), message)
+            )
+            self._not_empty.notify()
+            self._wake(self._async_readers)
+            return True
+
+    def put(self, message, timeout=0):
+        """
+        Add a message, waiting up to timeout seconds for space (None waits forever).
+        :raises MailboxFullError: If the mailbox is still full after the timeout.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while not self.try_put(message):
+            with self._lock:
+                if len(self.heap) < self.capacity:
+                    continue
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    raise MailboxFullError(
+                        f"Mailbox full ({self.capacity} messages)."
+                    )
+                self._not_full.wait(remaining)
+
+    async def aput(self, message, timeout=0):
+        """
+        Asynchronously add a message, waiting up to timeout seconds for space.
+        :raises MailboxFullError: If the mailbox is still full after the timeout.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while not self.try_put(message):
+            remaining = None if deadline is None else deadline - time.monotonic()
+            if remaining is not None and remaining <= 0:
+                raise MailboxFullError(f"Mailbox full ({self.capacity} messages).")
+            await self._wait_async(
+                self._async_writers,
+                remaining,
+                lambda: len(self.heap) < self.capacity or self.closed,
+            )
+
+    def get_batch(self, max_messages=DEFAULT_BATCH_SIZE):
+        """Remove and return up to max_messages messages without waiting."""
+        with self._lock:
+            return self._pop_batch(max_messages)
+
+    def get(self, max_messages=DEFAULT_BATCH_SIZE, timeout=None):
+        """
+        Wait up to timeout seconds for messages and return a batch (empty on timeout or close).
+        """
+        with self._lock:
+            if not self.heap and not self.closed:
+                self._not_empty.wait_for(lambda: self.heap or self.closed, timeout)
+            return self._pop_batch(max_messages)
+
+    async def aget(self, max_messages=DEFAULT_BATCH_SIZE, timeout=None):
+        """
+        Asynchronously wait up to timeout seconds for messages and return a batch.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            batch = self.get_batch(max_messages)
+            if batch or self.closed:
+                return batch
+            remaining = None if deadline is None else deadline - time.monotonic()
+            if remaining is not None and remaining <= 0:
+                return []
+            await self._wait_async(
+                self._async_readers, remaining, lambda: self.heap or self.closed
+            )
+
+    def close(self):
+        """Stop accepting messages and wake every waiting consumer and producer."""
+        with self._lock:
+            self.closed = True
+            self._not_empty.notify_all()
+            self._not_full.notify_all()
+            self._wake(self._async_readers)
+            self._wake(self._async_writers)
+
+    def _pop_batch(self, max_messages):
+        """Pop up to max_messages in order. Caller holds the lock."""
+        batch = []
+        while self.heap and len(batch) < max_messages:
+            batch.append(heapq.heappop(self.heap)[-1])
+        if batch:
+            self._not_full.notify(len(batch))
+            self._wake(self._async_writers)
+        return batch
+
+    async def _wait_async(self, waiters, timeout, is_ready):
+        """
+        Park the current task until the mailbox wakes this waiter list.
+        is_ready is re-checked under the same lock the waiter is registered with, so
+        a wake-up from another thread between the caller's check and here is not lost.
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        with self._lock:
+            if is_ready():
+                return
+            waiters.append((loop, future))
+        try:
+            await asyncio.wait_for(future, timeout)
+        except asyncio.TimeoutError:
+            pass
+        finally:
+            with self._lock:
+                if (loop, future) in waiters:
+                    waiters.remove((loop, future))
+
+    @staticmethod
+    def _wake(waiters):
+        """Resolve every pending asyncio waiter. Caller holds the lock."""
+        for loop, future in waiters:
+            loop.call_soon_threadsafe(_resolve, future)
+        waiters.clear()
+
+
+def _resolve(future):
+    if not future.done():
+        future.set_result(None)
+
+
+class MessageBus:
+    """
+    In-process message router with one bounded priority mailbox per recipient.
+    """
+
+    def __init__(self, default_capacity=DEFAULT_MAILBOX_CAPACITY):
+        self.default_capacity = default_capacity
+        self.mailboxes = {}
+        self._lock = threading.Lock()
+
+    def register(self, recipient, capacity=None):
+        """Create (or return) the mailbox for a recipient."""
+        with self._lock:
+            if recipient not in self.mailboxes:
+                self.mailboxes[recipient] = Mailbox(capacity or self.default_capacity)
+            return self.mailboxes[recipient]
+
+    def unregister(self, recipient):
+        """Close and remove a recipient's mailbox."""
+        with self._lock:
+            mailbox = self.mailboxes.pop(recipient, None)
+        if mailbox is not None:
+            mailbox.close()
+
+    def get_mailbox(self, recipient):
+        """Return a recipient's mailbox."""
+        mailbox = self.mailboxes.get(recipient)
+        if mailbox is None:
+            raise UnknownRecipientError(f"No mailbox registered for {recipient}.")
+        return mailbox
+
+    def publish(self, message, timeout=0):
+        """
+        Deliver a message to its recipient's mailbox.
+        :param timeout: Seconds to wait for space when the mailbox is full (None waits forever).
+        :raises MailboxFullError: If the mailbox is still full after the timeout.
+        """
+        self.get_mailbox(message.recipient).put(message, timeout)
+
+    def try_publish(self, message):
+        """Deliver a message if its mailbox has room. Returns False to signal backpressure."""
+        return self.get_mailbox(message.recipient).try_put(message)
+
+    async def apublish(self, message, timeout=0):
+        """Asynchronously deliver a message, waiting up to timeout seconds for space."""
+        await self.get_mailbox(message.recipient).aput(message, timeout)
+
+    def publish_batch(self, messages):
+        """
+        Deliver several messages without waiting.
+        :return: Messages that were rejected because their mailbox was full.
+        """
+        return [message for message in messages if not self.try_publish(message)]
+
+    def receive(self, recipient, max_messages=DEFAULT_BATCH_SIZE, timeout=None):
+        """Wait for and return a batch of messages for a recipient (threaded consumers)."""
+        return self.get_mailbox(recipient).get(max_messages, timeout)
+
+    async def areceive(self, recipient, max_messages=DEFAULT_BATCH_SIZE, timeout=None):
+        """Wait for and return a batch of messages for a recipient (asyncio consumers)."""
+        return await self.get_mailbox(recipient).aget(max_messages, timeout)
+
+    def get_pressure(self, recipient):
+        """Fraction of a recipient's mailbox in use."""
+        return self.get_mailbox(recipient).get_pressure()
+
+    def start_consumer(self, recipient, handler, max_messages=DEFAULT_BATCH_SIZE):
+        """
+        Start a daemon thread that passes each batch for recipient to handler(batch).
+        The thread exits once the recipient is unregistered or the bus is closed.
+        """
+        mailbox = self.get_mailbox(recipient)
+        mailbox.attach_consumer()
+
+        def run():
+            try:
+                while True:
+                    batch = mailbox.get(max_messages)
+                    if batch:
+                        handler(batch)
+                    elif mailbox.closed:
+                        return
+            finally:
+                mailbox.detach_consumer()
+
+        thread = threading.Thread(target=run, name=f"consumer-{recipient}", daemon=True)
+        thread.start()
+        return thread
+
+    async def aconsume(self, recipient, max_messages=DEFAULT_BATCH_SIZE):
+        """Async iterator over message batches until the mailbox is closed."""
+        mailbox = self.get_mailbox(recipient)
+        mailbox.attach_consumer()
+        try:
+            while True:
+                batch = await mailbox.aget(max_messages)
+                if batch:
+                    yield batch
+                elif mailbox.closed:
+                    return
+        finally:
+            mailbox.detach_consumer()
+
+    def close(self):
+        """Close every mailbox, releasing all waiting consumers."""
+        with self._lock:
+            mailboxes = list(self.mailboxes.values())
+        for mailbox in mailboxes:
+            mailbox.close()
@@ -0,0 +1,303 @@
+import json
+import math
+import struct
+from datetime import datetime
+
+from src.shared.NodeMessage import (
+    DependencyRequestMessage,
+    DependencyResponseMessage,
+    StatusUpdateMessage,
+    TaskMessage,
+)
+from src.shared.utils import MessagingError
+
+# Batch layout (little-endian):
+#   header      magic, message count, value count
+#   values      value count x (u8 kind + u32 length + UTF-8 bytes)
+#   offsets     message count x u32, absolute offset of each record
+#   records     common fields + type-specific fields
+# Node IDs, task IDs, statuses and other scalar fields are stored once in the value
+# table and referenced by fixed-width u32 indexes. Strings are stored as text, other
+# values as JSON (or ISO 8601 for datetimes), so every value decodes to what was
+# encoded. Variable-size payloads are blobs (u32 length + bytes, NONE_LENGTH meaning
+# None).
+MAGIC = b"NMB2"
+HEADER = struct.Struct("<4sII")
+COMMON = struct.Struct("<B16sIId")  # type tag, message ID, sender, recipient, created_at
+U8 = struct.Struct("<B")
+U32 = struct.Struct("<I")
+NONE_LENGTH = 0xFFFFFFFF
+
+TASK_FIELDS = struct.Struct("<IIII")  # task_id, description, priority, deadline
+STATUS_FIELDS = struct.Struct("<III")  # task_id, status, progress
+REQUEST_FIELDS = struct.Struct("<I")  # task_id
+RESPONSE_FIELDS = struct.Struct("<IB")  # task_id, payload kind
+
+VALUE_STR = 0
+VALUE_JSON = 1
+VALUE_DATETIME = 2
+
+PAYLOAD_RAW = 0  # provided_data is bytes-like, decoded as a zero-copy memoryview
+PAYLOAD_JSON = 1
+
+TYPE_TAGS = {
+    TaskMessage: 1,
+    StatusUpdateMessage: 2,
+    DependencyRequestMessage: 3,
+    DependencyResponseMessage: 4,
+}
+TAG_TYPES = {tag: cls for cls, tag in TYPE_TAGS.items()}
+
+
+def encode_messages(messages):
+    """
+    Encode a batch of messages into a single bytes buffer.
+    :param messages: Iterable of TaskMessage, StatusUpdateMessage,
+        DependencyRequestMessage or DependencyResponseMessage instances.
+    :return: bytes holding the whole batch.
+    :raises MessagingError: If a message type has no wire schema, or a field value
+        cannot be encoded.
+    """
+    values = {}  # (kind, text) -> index in the value table
+
+    def ref(value):
+        return values.setdefault(encode_value(value), len(values))
+
+    records = []
+    for message in messages:
+        tag = TYPE_TAGS.get(type(message))
+        if tag is None:
+            raise MessagingError(
+                f"No wire schema for message type {type(message).__name__}."
+            )
+        parts = [
+            COMMON.pack(
+                tag,
+                message.message_id_bytes,
+                ref(message.sender),
+                ref(message.recipient),
+                message.created_at,
+            )
+        ]
+        if tag == 1:
+            parts.append(
+                TASK_FIELDS.pack(
+                    ref(message.task_id),
+                    ref(message.description),
+                    ref(message.priority),
+                    ref(message.deadline),
+                )
+            )
+            parts.append(U32.pack(len(message.dependencies)))
+            parts.extend(U32.pack(ref(dep)) for dep in message.dependencies)
+        elif tag == 2:
+            parts.append(
+                STATUS_FIELDS.pack(
+                    ref(message.task_id), ref(message.status), ref(message.progress)
+                )
+            )
+            parts.append(encode_json_blob(message.issues))
+        elif tag == 3:
+            parts.append(REQUEST_FIELDS.pack(ref(message.task_id)))
+            parts.append(encode_json_blob(message.required_data))
+        else:
+            data = message.provided_data
+            if isinstance(data, (bytes, bytearray, memoryview)):
+                parts.append(RESPONSE_FIELDS.pack(ref(message.task_id), PAYLOAD_RAW))
+                parts.append(encode_blob(data))
+            else:
+                parts.append(RESPONSE_FIELDS.pack(ref(message.task_id), PAYLOAD_JSON))
+                parts.append(encode_json_blob(data))
+        records.append(b"".join(parts))
+
+    value_table = b"".join(
+        U8.pack(kind) + encode_blob(text.encode("utf-8")) for kind, text in values
+    )
+    offset = HEADER.size + len(value_table) + U32.size * len(records)
+    offsets = []
+    for record in records:
+        offsets.append(offset)
+        offset += len(record)
+
+    return b"".join(
+        [
+            HEADER.pack(MAGIC, len(records), len(values)),
+            value_table,
+            struct.pack(f"<{len(offsets)}I", *offsets),
+            *records,
+        ]
+    )
+
+
+def decode_messages(buffer):
+    """
+    Lazily decode a batch produced by encode_messages().
+    :param buffer: bytes, bytearray or memoryview.
+    :return: MessageBatch; messages are only decoded when accessed.
+    """
+    return MessageBatch(buffer)
+
+
+class MessageBatch:
+    """
+    Read-only view over an encoded batch. Only the header, value table and offsets are
+    parsed up front; each message is decoded on access, and raw provided_data payloads
+    are returned as memoryview slices of the original buffer. Non-string values are
+    decoded afresh on every access, so messages never share mutable values.
+    """
+
+    def __init__(self, buffer):
+        self.buffer = memoryview(buffer).cast("B")
+        try:
+            magic, count, value_count = HEADER.unpack_from(self.buffer, 0)
+        except struct.error as e:
+            raise MessagingError("Truncated message batch.") from e
+        if magic != MAGIC:
+            raise MessagingError("Not a node message batch.")
+
+        position = HEADER.size
+        self.kinds = []
+        self.texts = []
+        for _ in range(value_count):
+            (kind,) = U8.unpack_from(self.buffer, position)
+            data, position = read_blob(self.buffer, position + U8.size)
+            self.kinds.append(kind)
+            self.texts.append(str(data, "utf-8"))
+        self.offsets = struct.unpack_from(f"<{count}I", self.buffer, position)
+
+    def __len__(self):
+        return len(self.offsets)
+
+    def __iter__(self):
+        for index in range(len(self.offsets)):
+            yield self[index]
+
+    def get_type(self, index):
+        """Return the message class at index without decoding the message."""
+        return TAG_TYPES[self.buffer[self.offsets[index]]]
+
+    def get_recipient(self, index):
+        """Return the recipient at index without decoding the message."""
+        _, _, _, recipient, _ = COMMON.unpack_from(self.buffer, self.offsets[index])
+        return self.get_value(recipient)
+
+    def get_value(self, index):
+        """Decode an entry of the value table."""
+        kind = self.kinds[index]
+        if kind == VALUE_STR:
+            return self.texts[index]
+        if kind == VALUE_JSON:
+            return json.loads(self.texts[index])
+        if kind == VALUE_DATETIME:
+            return datetime.fromisoformat(self.texts[index])
+        raise MessagingError(f"Unknown value kind: {kind}")
+
+    def __getitem__(self, index):
+        position = self.offsets[index]
+        tag, message_id, sender, recipient, created_at = COMMON.unpack_from(
+            self.buffer, position
+        )
+        position += COMMON.size
+        cls = TAG_TYPES.get(tag)
+        if cls is None:
+            raise MessagingError(f"Unknown message type tag: {tag}")
+
+        message = cls.__new__(cls)
+        message.sender = self.get_value(sender)
+        message.recipient = self.get_value(recipient)
+        message.message_id_bytes = bytes(message_id)
+        message.created_at = created_at
+        message._message_id = None
+
+        if tag == 1:
+            task_id, description, priority, deadline = TASK_FIELDS.unpack_from(
+                self.buffer, position
+            )
+            position += TASK_FIELDS.size
+            (dependency_count,) = U32.unpack_from(self.buffer, position)
+            dependencies = struct.unpack_from(
+                f"<{dependency_count}I", self.buffer, position + U32.size
+            )
+            message.task_id = self.get_value(task_id)
+            message.description = self.get_value(description)
+            message.priority = self.get_value(priority)
+            message.deadline = self.get_value(deadline)
+            message.dependencies = [self.get_value(dep) for dep in dependencies]
+        elif tag == 2:
+            task_id, status, progress = STATUS_FIELDS.unpack_from(
+                self.buffer, position
+            )
+            issues, _ = read_blob(self.buffer, position + STATUS_FIELDS.size)
+            message.task_id = self.get_value(task_id)
+            message.status = self.get_value(status)
+            message.progress = self.get_value(progress)
+            message.issues = decode_json(issues)
+        elif tag == 3:
+            (task_id,) = REQUEST_FIELDS.unpack_from(self.buffer, position)
+            required_data, _ = read_blob(self.buffer, position + REQUEST_FIELDS.size)
+            message.task_id = self.get_value(task_id)
+            message.required_data = decode_json(required_data)
+        else:
+            task_id, kind = RESPONSE_FIELDS.unpack_from(self.buffer, position)
+            data, _ = read_blob(self.buffer, position + RESPONSE_FIELDS.size)
+            message.task_id = self.get_value(task_id)
+            message.provided_data = data if kind == PAYLOAD_RAW else decode_json(data)
+        return message
+
+
+def encode_blob(data):
+    """Length-prefix a bytes-like value (None is encoded as NONE_LENGTH)."""
+    if data is None:
+        return U32.pack(NONE_LENGTH)
+    return U32.pack(len(data)) + bytes(data)
+
+
+def encode_json_blob(value):
+    """Encode an arbitrary JSON-serializable value as a blob."""
+    if value is None:
+        return encode_blob(None)
+    return encode_blob(json.dumps(value, separators=(",", ":")).encode("utf-8"))
+
+
+def read_blob(buffer, position):
+    """Read a blob, returning (memoryview or None, next position) without copying."""
+    (length,) = U32.unpack_from(buffer, position)
+    position += U32.size
+    if length == NONE_LENGTH:
+        return None, position
+    return buffer[position:position + length], position + length
+
+
+def decode_json(data):
+    """Decode a JSON blob returned by read_blob()."""
+    return None if data is None else json.loads(str(data, "utf-8"))
+
+
+def encode_value(value):
+    """
+    Return the (kind, text) value table entry for a field value.
+    :raises MessagingError: If the value is neither a string, a datetime nor
+        JSON-serializable.
+    """
+    if isinstance(value, str):
+        return VALUE_STR, value
+    if isinstance(value, datetime):
+        return VALUE_DATETIME, value.isoformat()
+    try:
+        text = json.dumps(
+            value, sort_keys=True, separators=(",", ":"), allow_nan=False
+        )
+    except (TypeError, ValueError) as e:
+        raise MessagingError(f"Cannot encode field value {value!r}: {e}") from e
+    return VALUE_JSON, text
+
+
+def encode_deadline(deadline):
+    """Convert a deadline (epoch seconds, ISO string, datetime or None) to a float."""
+    if deadline is None:
+        return math.nan
+    if isinstance(deadline, str):
+        deadline = datetime.fromisoformat(deadline)
+    if isinstance(deadline, datetime):
+        return deadline.timestamp()
+    return float(deadline)
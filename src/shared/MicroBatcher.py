@@ -0,0 +1,173 @@
+import asyncio
+import threading
+import time
+import weakref
+
+from src.shared import config
+
+
+class BatchMetrics:
+    """
+    Counters for batch occupancy and the time items wait before dispatch.
+    """
+
+    def __init__(self, max_batch_size):
+        self.max_batch_size = max_batch_size
+        self.batches = 0
+        self.items = 0
+        self.total_queue_wait = 0.0
+        self.max_queue_wait = 0.0
+        self.total_dispatch_time = 0.0
+        self._lock = threading.Lock()
+
+    def record(self, size, queue_waits, dispatch_time):
+        with self._lock:
+            self.batches += 1
+            self.items += size
+            self.total_queue_wait += sum(queue_waits)
+            self.max_queue_wait = max(self.max_queue_wait, max(queue_waits))
+            self.total_dispatch_time += dispatch_time
+
+    def snapshot(self):
+        """
+        Return averages: occupancy is the mean fraction of max_batch_size filled.
+        """
+        with self._lock:
+            batches = self.batches or 1
+            return {
+                "batches": self.batches,
+                "items": self.items,
+                "mean_batch_size": self.items / batches,
+                "occupancy": self.items / batches / self.max_batch_size,
+                "mean_queue_wait": self.total_queue_wait / (self.items or 1),
+                "max_queue_wait": self.max_queue_wait,
+                "mean_dispatch_time": self.total_dispatch_time / batches,
+            }
+
+
+class MicroBatcher:
+    """
+    Collects items submitted by many callers and dispatches them together once
+    max_batch_size items are waiting or the oldest has waited max_wait_ms.
+    Each caller gets back the result at its own position in the batch.
+    Batches are formed per event loop.
+    """
+
+    def __init__(
+        self,
+        dispatch,
+        max_batch_size=config.MODEL_BATCH_MAX_SIZE,
+        max_wait_ms=config.MODEL_BATCH_MAX_WAIT_MS,
+    ):
+        """
+        :param dispatch: Async callable taking a list of items and returning a list of
+            results in the same order. A result that is an exception is raised to its
+            caller only.
+        """
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be >= 1.")
+        self.dispatch = dispatch
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self.metrics = BatchMetrics(max_batch_size)
+        self._queues = weakref.WeakKeyDictionary()  # loop -> pending queue
+
+    async def submit(self, item):
+        """Queue an item for the next batch and wait for its result."""
+        loop = asyncio.get_running_loop()
+        queue = self._queues.get(loop)
+        if queue is None:
+            queue = self._queues[loop] = _PendingQueue()
+
+        future = loop.create_future()
+        queue.items.append((item, future, time.monotonic()))
+        if len(queue.items) >= self.max_batch_size:
+            self._flush(loop, queue)
+        elif queue.timer is None:
+            queue.timer = loop.call_later(self.max_wait, self._flush, loop, queue)
+        return await future
+
+    def _flush(self, loop, queue):
+        """Send the waiting items as one or more full batches."""
+        if queue.timer is not None:
+            queue.timer.cancel()
+            queue.timer = None
+        while queue.items:
+            batch = queue.items[: self.max_batch_size]
+            del queue.items[: self.max_batch_size]
+            task = loop.create_task(self._run_batch(batch))
+            queue.running.add(task)  # Keep a reference until the batch finishes
+            task.add_done_callback(queue.running.discard)
+
+    async def _run_batch(self, batch):
+        started = time.monotonic()
+        items = [item for item, _, _ in batch]
+        try:
+            results = await self.dispatch(items)
+            if len(results) != len(items):
+                raise ValueError(
+                    f"Batch dispatch returned {len(results)} results "
+                    f"for {len(items)} items."
+                )
+        except Exception as e:
+            for _, future, _ in batch:
+                if not future.done():
+                    future.set_exception(e)
+        else:
+            for (_, future, _), result in zip(batch, results):
+                if future.done():
+                    continue
+                if isinstance(result, BaseException):
+                    future.set_exception(result)
+                else:
+                    future.set_result(result)
+        finally:
+            self.metrics.record(
+                len(batch),
+                [started - enqueued for _, _, enqueued in batch],
+                time.monotonic() - started,
+            )
+
+
+class _PendingQueue:
+    __slots__ = ("items", "timer", "running")
+
+    def __init__(self):
+        self.items = []  # (item, future, enqueued_at)
+        self.timer = None
+        self.running = set()  # Batch tasks in flight
+
+
+def make_model_batcher(client, **batcher_options):
+    """
+    Return a MicroBatcher for (model, prompt) items that sends each model's prompts
+    as one request to the legacy completions endpoint, so nodes using different
+    models can share it. Only use it with providers that accept a list of prompts
+    there; otherwise leave nodes unbatched, as separate chat requests would only
+    wait for the batch window without saving any requests.
+    """
+
+    async def dispatch(items):
+        by_model = {}
+        for index, (model, prompt) in enumerate(items):
+            by_model.setdefault(model, []).append((index, prompt))
+        results = [None] * len(items)
+
+        async def complete(model, entries):
+            try:
+                texts = await client.complete_batch(
+                    [prompt for _, prompt in entries],
+                    model=model,
+                    legacy_endpoint=True,
+                )
+            except Exception as e:
+                texts = [e] * len(entries)
+            for (index, _), text in zip(entries, texts):
+                results[index] = text
+
+        await asyncio.gather(
+            *(complete(model, entries) for model, entries in by_model.items())
+        )
+        return results
+
+    return MicroBatcher(dispatch, **batcher_options)
@@ -0,0 +1,538 @@
+import asyncio
+import json
+import threading
+import weakref
+from urllib.parse import urlsplit
+
+from src.shared import config
+from src.shared.CircuitBreaker import CircuitBreaker
+from src.shared.rate_limiting import RetryBudget, RetryPolicy, TokenBucket
+from src.shared.utils import ModelClientError
+
+RETRYABLE_STATUSES = frozenset({408, 429, 500, 502, 503, 504})
+
+
+class ProviderLimits:
+    """
+    Semaphore-bounded concurrency limits per model provider.
+    asyncio semaphores belong to a single event loop, so limits apply per provider per loop.
+    """
+
+    def __init__(self, limits=None, default_limit=None):
+        self.limits = dict(config.PROVIDER_MAX_CONCURRENCY)
+        self.limits.update(limits or {})
+        self.default_limit = default_limit or config.DEFAULT_PROVIDER_MAX_CONCURRENCY
+        self._semaphores = weakref.WeakKeyDictionary()
+
+    def get_limit(self, provider):
+        """Return the maximum number of in-flight requests for a provider."""
+        return self.limits.get(provider, self.default_limit)
+
+    def set_limit(self, provider, limit):
+        """Change a provider's limit. Applies to semaphores created afterwards."""
+        if limit < 1:
+            raise ValueError("Provider concurrency limit must be >= 1.")
+        self.limits[provider] = limit
+        for semaphores in self._semaphores.values():
+            semaphores.pop(provider, None)
+
+    def get_semaphore(self, provider):
+        """Return the running loop's semaphore for a provider."""
+        loop = asyncio.get_running_loop()
+        semaphores = self._semaphores.setdefault(loop, {})
+        if provider not in semaphores:
+            semaphores[provider] = asyncio.Semaphore(self.get_limit(provider))
+        return semaphores[provider]
+
+
+# Shared across all clients so every node calling a provider counts against one limit
+provider_limits = ProviderLimits()
+
+
+class AsyncModelClient:
+    """
+    Minimal asyncio client for OpenAI-compatible chat completion endpoints.
+    Connections are kept alive and reused per event loop. With a rate_limiter
+    (TokenBucket) requests wait for a token; with a retry_policy (RetryPolicy)
+    transient failures are retried with backoff; with a circuit_breaker
+    (CircuitBreaker) requests fail fast while the provider is failing.
+    """
+
+    def __init__(
+        self,
+        base_url,
+        api_key=None,
+        provider=config.DEFAULT_PROVIDER,
+        timeout=config.NODE_TIMEOUT_SECONDS,
+        limits=None,
+        rate_limiter=None,
+        retry_policy=None,
+        circuit_breaker=None,
+        max_idle_connections=config.MODEL_CLIENT_MAX_IDLE_CONNECTIONS,
+    ):
+        parts = urlsplit(base_url)
+        if parts.scheme not in ("http", "https"):
+            raise ValueError(f"Unsupported model API URL: {base_url}")
+        self.base_url = base_url
+        self.host = parts.hostname
+        self.port = parts.port or (443 if parts.scheme == "https" else 80)
+        self.use_ssl = parts.scheme == "https"
+        self.base_path = parts.path.rstrip("/")
+        self.api_key = api_key
+        self.provider = provider
+        self.timeout = timeout
+        self.limits = limits or provider_limits
+        self.rate_limiter = rate_limiter
+        self.retry_policy = retry_policy
+        self.circuit_breaker = circuit_breaker
+        self.max_idle_connections = max_idle_connections
+        self.connections_opened = 0
+        self._idle = weakref.WeakKeyDictionary()  # loop -> idle (reader, writer) pairs
+
+    async def complete(self, prompt, model=config.DEFAULT_MODEL, **params):
+        """
+        Send a single prompt and return the generated text.
+        :param prompt: Full prompt text.
+        :param model: Model name to request.
+        :param params: Extra request parameters (temperature, max_tokens, ...).
+        """
+        payload = {
+            "model": model,
+            "messages": [{"role": "user", "content": prompt}],
+            **params,
+        }
+        response = await self.post_json("/chat/completions", payload)
+        try:
+            return response["choices"][0]["message"]["content"]
+        except (KeyError, IndexError, TypeError) as e:
+            raise ModelClientError(f"Malformed completion response: {response}") from e
+
+    async def complete_batch(
+        self,
+        prompts,
+        model=config.DEFAULT_MODEL,
+        legacy_endpoint=False,
+        return_exceptions=False,
+        **params,
+    ):
+        """
+        Complete several prompts and return the generated texts in prompt order. Each
+        prompt is sent as its own chat request, concurrently over the pooled
+        connections.
+        :param legacy_endpoint: Send all prompts in one request to the legacy
+            completions endpoint instead, for providers that still accept a list of
+            prompts there.
+        :param return_exceptions: Put a failed prompt's exception in its place instead
+            of raising it, as asyncio.gather() does.
+        """
+        if not legacy_endpoint:
+            return await asyncio.gather(
+                *(self.complete(prompt, model=model, **params) for prompt in prompts),
+                return_exceptions=return_exceptions,
+            )
+        payload = {"model": model, "prompt": list(prompts), **params}
+        response = await self.post_json("/completions", payload)
+        try:
+            texts = [None] * len(prompts)
+            for choice in response["choices"]:
+                texts[choice["index"]] = choice["text"]
+        except (KeyError, IndexError, TypeError) as e:
+            raise ModelClientError(f"Malformed completion response: {response}") from e
+        if None in texts:
+            missing = texts.count(None)
+            raise ModelClientError(
+                f"Batch response is missing {missing} of {len(texts)} prompts."
+            )
+        return texts
+
+    async def post_json(self, path, payload):
+        """
+        POST a JSON payload, bounded by the provider's concurrency limit and rate
+        limit, retrying transient failures as the retry policy allows.
+        """
+        if self.retry_policy is None:
+            return await self._post_once(path, payload)
+
+        self.retry_policy.budget.record_request()
+        attempt = 0
+        while True:
+            try:
+                return await self._post_once(path, payload)
+            except ModelClientError as e:
+                delay = self.retry_policy.get_retry_delay(e, attempt)
+                if delay is None:
+                    raise
+            attempt += 1
+            await asyncio.sleep(delay)
+
+    async def _post_once(self, path, payload):
+        if self.rate_limiter is not None:
+            await self.rate_limiter.acquire()
+        if self.circuit_breaker is not None:
+            return await self.circuit_breaker.acall(lambda: self._send(path, payload))
+        return await self._send(path, payload)
+
+    async def _send(self, path, payload):
+        async with self.limits.get_semaphore(self.provider):
+            try:
+                return await asyncio.wait_for(
+                    self._request("POST", path, payload), timeout=self.timeout
+                )
+            except asyncio.TimeoutError as e:
+                raise ModelClientError(
+                    f"Request to {self.provider} timed out after {self.timeout}s.",
+                    retryable=True,
+                ) from e
+            except OSError as e:
+                raise ModelClientError(
+                    f"Request to {self.provider} failed: {e}", retryable=True
+                ) from e
+
+    async def stream_complete(self, prompt, model=config.DEFAULT_MODEL, **params):
+        """
+        Send a single prompt with streaming enabled and yield text chunks as the
+        provider produces them (server-sent events).
+        :raises ModelClientError: If the request fails or no data arrives for
+            timeout seconds.
+        """
+        payload = {
+            "model": model,
+            "messages": [{"role": "user", "content": prompt}],
+            "stream": True,
+            **params,
+        }
+        if self.rate_limiter is not None:
+            await self.rate_limiter.acquire()
+        async with self.limits.get_semaphore(self.provider):
+            try:
+                reader, writer, status, headers = await asyncio.wait_for(
+                    self._open("POST", "/chat/completions", payload), self.timeout
+                )
+            except asyncio.TimeoutError as e:
+                raise ModelClientError(
+                    f"Request to {self.provider} timed out after {self.timeout}s.",
+                    retryable=True,
+                ) from e
+            except OSError as e:
+                raise ModelClientError(
+                    f"Request to {self.provider} failed: {e}", retryable=True
+                ) from e
+            try:
+                if status >= 400:
+                    body = await read_response_body(reader, headers)
+                    raise self._status_error(status, headers, body)
+                pending = b""
+                async for data in iter_response_body(reader, headers, self.timeout):
+                    *lines, pending = (pending + data).split(b"\n")
+                    for line in lines:
+                        chunk = parse_stream_line(line)
+                        if chunk is STREAM_END:
+                            return
+                        if chunk:
+                            yield chunk
+            except asyncio.TimeoutError as e:
+                raise ModelClientError(
+                    f"Stream from {self.provider} stalled for {self.timeout}s."
+                ) from e
+            finally:
+                writer.close()
+
+    async def _request(self, method, path, payload):
+        """Perform one HTTP/1.1 request and decode the JSON response body."""
+        reader, writer, status, response_headers = await self._open(
+            method, path, payload
+        )
+        try:
+            response_body = await read_response_body(reader, response_headers)
+        except BaseException:
+            writer.close()
+            raise
+        self._release(reader, writer, response_headers)
+
+        if status >= 400:
+            raise self._status_error(status, response_headers, response_body)
+        return json.loads(response_body)
+
+    async def _open(self, method, path, payload):
+        """
+        Send one HTTP/1.1 request, on an idle keep-alive connection if there is one,
+        and read the response head.
+        :return: (reader, writer, status, headers); the caller releases or closes the
+            connection.
+        """
+        body = json.dumps(payload).encode("utf-8")
+        headers = [
+            f"{method} {self.base_path}{path} HTTP/1.1",
+            f"Host: {self.host}:{self.port}",
+            "Content-Type: application/json",
+            "Accept: application/json",
+            f"Content-Length: {len(body)}",
+            "Connection: keep-alive",
+        ]
+        if self.api_key:
+            headers.append(f"Authorization: Bearer {self.api_key}")
+        request = ("\r\n".join(headers) + "\r\n\r\n").encode("latin-1") + body
+
+        while True:
+            connection = self._take_idle()
+            reused = connection is not None
+            if not reused:
+                connection = await asyncio.open_connection(
+                    self.host, self.port, ssl=self.use_ssl or None
+                )
+                self.connections_opened += 1
+            reader, writer = connection
+            try:
+                writer.write(request)
+                await writer.drain()
+                status, response_headers = await read_response_head(reader)
+            except (ModelClientError, ConnectionError):
+                writer.close()
+                if reused:
+                    continue  # The server closed the idle connection; use another
+                raise
+            except BaseException:
+                writer.close()
+                raise
+            return reader, writer, status, response_headers
+
+    def _take_idle(self):
+        """Return an open idle connection for the running loop, or None."""
+        idle = self._idle.get(asyncio.get_running_loop())
+        while idle:
+            reader, writer = idle.pop()
+            if not writer.is_closing() and not reader.at_eof():
+                return reader, writer
+            writer.close()
+        return None
+
+    def _release(self, reader, writer, headers):
+        """Keep a connection whose response was fully read for reuse, or close it."""
+        idle = self._idle.setdefault(asyncio.get_running_loop(), [])
+        if (
+            headers.get("connection", "").lower() == "close"
+            or writer.is_closing()
+            or len(idle) >= self.max_idle_connections
+        ):
+            writer.close()
+        else:
+            idle.append((reader, writer))
+
+    def close_idle_connections(self):
+        """Close the running loop's idle connections."""
+        for _, writer in self._idle.pop(asyncio.get_running_loop(), ()):
+            writer.close()
+
+    def _status_error(self, status, headers, body):
+        retry_after = headers.get("retry-after")
+        return ModelClientError(
+            f"{self.provider} returned HTTP {status}: {body[:200]!r}",
+            status=status,
+            retryable=status in RETRYABLE_STATUSES,
+            retry_after=(
+                float(retry_after)
+                if retry_after and retry_after.replace(".", "", 1).isdigit()
+                else None
+            ),
+        )
+
+
+async def read_response_head(reader):
+    """Read an HTTP status line and headers. Returns (status, headers)."""
+    status_line = await reader.readline()
+    parts = status_line.decode("latin-1").split(" ", 2)
+    if len(parts) < 2 or not parts[1].isdigit():
+        raise ModelClientError(f"Invalid HTTP status line: {status_line!r}")
+
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            break
+        key, _, value = line.decode("latin-1").partition(":")
+        headers[key.strip().lower()] = value.strip()
+    if parts[0] == "HTTP/1.0":
+        headers.setdefault("connection", "close")  # HTTP/1.0 closes unless told otherwise
+    return int(parts[1]), headers
+
+
+async def read_response_body(reader, headers):
+    """Read an HTTP body using Content-Length, chunked encoding or EOF."""
+    if headers.get("transfer-encoding", "").lower() == "chunked":
+        chunks = []
+        while True:
+            size = int((await reader.readline()).split(b";")[0].strip(), 16)
+            if size == 0:
+                await reader.readline()
+                break
+            chunks.append(await reader.readexactly(size))
+            await reader.readline()
+        return b"".join(chunks)
+    if "content-length" in headers:
+        return await reader.readexactly(int(headers["content-length"]))
+    return await reader.read()
+
+
+async def iter_response_body(reader, headers, timeout=None):
+    """
+    Yield an HTTP body piece by piece as it arrives (chunked, Content-Length or EOF).
+    :param timeout: Longest wait for each piece, in seconds.
+    """
+    if headers.get("transfer-encoding", "").lower() == "chunked":
+        while True:
+            line = await asyncio.wait_for(reader.readline(), timeout)
+            size = int(line.split(b";")[0].strip(), 16)
+            if size == 0:
+                await reader.readline()
+                return
+            yield await asyncio.wait_for(reader.readexactly(size), timeout)
+            await reader.readline()
+    remaining = int(headers["content-length"]) if "content-length" in headers else None
+    while remaining is None or remaining > 0:
+        data = await asyncio.wait_for(
+            reader.read(65536 if remaining is None else min(remaining, 65536)), timeout
+        )
+        if not data:
+            return
+        if remaining is not None:
+            remaining -= len(data)
+        yield data
+
+
+STREAM_END = object()
+
+
+def parse_stream_line(line):
+    """
+    Decode one server-sent event line of a streamed chat completion.
+    :return: The text delta (possibly empty), None for non-data lines, or STREAM_END.
+    """
+    line = line.strip()
+    if not line.startswith(b"data:"):
+        return None
+    data = line[5:].strip()
+    if data == b"[DONE]":
+        return STREAM_END
+    try:
+        event = json.loads(data)
+        return event["choices"][0]["delta"].get("content") or ""
+    except (ValueError, KeyError, IndexError, TypeError) as e:
+        raise ModelClientError(f"Malformed stream event: {data[:200]!r}") from e
+
+
+class ClientManager:
+    """
+    Hands out one shared AsyncModelClient per provider, endpoint and API key, so
+    nodes reuse its keep-alive connections. Each provider and API key pair gets a
+    token bucket from rate_limits, and every client draws retries from one budget.
+    """
+
+    def __init__(
+        self,
+        rate_limits=None,
+        default_rate_limit=None,
+        retry_budget=None,
+        circuit_breaker_options=None,
+        **retry_options,
+    ):
+        """
+        :param rate_limits: Provider -> (requests per second, burst) overrides.
+        :param circuit_breaker_options: CircuitBreaker arguments for the breaker shared
+            by each provider's clients, or False to disable provider breakers.
+        :param retry_options: RetryPolicy arguments (max_retries, base_delay, ...).
+        """
+        self.rate_limits = dict(config.PROVIDER_RATE_LIMITS)
+        self.rate_limits.update(rate_limits or {})
+        self.default_rate_limit = default_rate_limit or config.DEFAULT_PROVIDER_RATE_LIMIT
+        self.retry_budget = retry_budget or RetryBudget()
+        self.retry_policy = RetryPolicy(budget=self.retry_budget, **retry_options)
+        self.clients = {}  # (provider, base_url, api_key) -> AsyncModelClient
+        self.rate_limiters = {}  # (provider, api_key) -> TokenBucket
+        self.circuit_breaker_options = circuit_breaker_options
+        self.circuit_breakers = {}  # provider -> CircuitBreaker
+        self._lock = threading.Lock()
+
+    def get_client(self, base_url, api_key=None, provider=config.DEFAULT_PROVIDER):
+        """Return the shared client for an endpoint and API key."""
+        key = (provider, base_url, api_key)
+        with self._lock:
+            client = self.clients.get(key)
+            if client is None:
+                client = self.clients[key] = AsyncModelClient(
+                    base_url,
+                    api_key=api_key,
+                    provider=provider,
+                    rate_limiter=self._get_rate_limiter(provider, api_key),
+                    retry_policy=self.retry_policy,
+                    circuit_breaker=self._get_circuit_breaker(provider),
+                )
+            return client
+
+    def get_stats(self):
+        """Return retry budget counters and connection counts per client."""
+        with self._lock:
+            connections = {
+                f"{provider} {base_url}": client.connections_opened
+                for (provider, base_url, _), client in self.clients.items()
+            }
+            breakers = {
+                provider: breaker.get_stats()
+                for provider, breaker in self.circuit_breakers.items()
+            }
+        return {
+            "retry_budget": self.retry_budget.get_stats(),
+            "connections": connections,
+            "circuit_breakers": breakers,
+        }
+
+    def _get_circuit_breaker(self, provider):
+        """Caller holds the lock."""
+        if self.circuit_breaker_options is False:
+            return None
+        if provider not in self.circuit_breakers:
+            self.circuit_breakers[provider] = CircuitBreaker(
+                f"provider:{provider}",
+                is_failure=is_provider_failure,
+                **(self.circuit_breaker_options or {}),
+            )
+        return self.circuit_breakers[provider]
+
+    def _get_rate_limiter(self, provider, api_key):
+        """Caller holds the lock."""
+        limit = self.rate_limits.get(provider, self.default_rate_limit)
+        if limit is None:
+            return None
+        key = (provider, api_key)
+        if key not in self.rate_limiters:
+            rate, burst = limit
+            self.rate_limiters[key] = TokenBucket(rate, burst)
+        return self.rate_limiters[key]
+
+
+def is_provider_failure(error):
+    """Only transient errors (outages, overload, timeouts) count against a provider."""
+    return getattr(error, "retryable", True)
+
+
+_default_manager = None
+_default_manager_lock = threading.Lock()
+
+
+def get_default_client_manager():
+    """Return the process-wide ClientManager."""
+    global _default_manager
+    with _default_manager_lock:
+        if _default_manager is None:
+            _default_manager = ClientManager()
+    return _default_manager
+
+
+def get_default_model_client():
+    """
+    Return a shared client for config.MODEL_API_BASE_URL, or None if no endpoint is configured.
+    """
+    if not config.MODEL_API_BASE_URL:
+        return None
+    return get_default_client_manager().get_client(
+        config.MODEL_API_BASE_URL, api_key=config.MODEL_API_KEY
+    )
@@ -1,16 +1,48 @@
-from src.shared.utils import get_current_timestamp, get_unique_id
+import time
+import uuid
+from datetime import datetime
+
+from src.shared.utils import get_unique_id_bytes
 
 
 class NodeMessage:
     """
     Base class for all messages in the system.
+    IDs are kept as 16 raw bytes and timestamps as epoch seconds; the string forms
+    used by to_dict() are only built when requested.
     """
 
+    __slots__ = ("sender", "recipient", "message_id_bytes", "created_at", "_message_id")
+
     def __init__(self, sender, recipient, message_id=None, timestamp=None):
         self.sender = sender
         self.recipient = recipient
-        self.message_id = message_id or get_unique_id()
-        self.timestamp = timestamp or get_current_timestamp()
+        self._message_id = None
+        if message_id is None:
+            self.message_id_bytes = get_unique_id_bytes()
+        elif isinstance(message_id, bytes):
+            self.message_id_bytes = message_id
+        else:
+            self.message_id_bytes = uuid.UUID(message_id).bytes
+            self._message_id = message_id
+        if timestamp is None:
+            self.created_at = time.time()
+        elif isinstance(timestamp, str):
+            self.created_at = datetime.fromisoformat(timestamp).timestamp()
+        else:
+            self.created_at = float(timestamp)
+
+    @property
+    def message_id(self):
+        """Message ID as a UUID string."""
+        if self._message_id is None:
+            self._message_id = str(uuid.UUID(bytes=self.message_id_bytes))
+        return self._message_id
+
+    @property
+    def timestamp(self):
+        """Creation time as an ISO 8601 string."""
+        return datetime.fromtimestamp(self.created_at).isoformat()
 
     def to_dict(self):
         """Serialize the message to a dictionary for queueing or logging."""
@@ -33,6 +65,8 @@ class TaskMessage(NodeMessage):
     Message for assigning tasks to nodes.
     """
 
+    __slots__ = ("task_id", "description", "priority", "deadline", "dependencies")
+
     def __init__(
         self,
         sender,
@@ -42,8 +76,10 @@ class TaskMessage(NodeMessage):
         priority,
         deadline,
         dependencies=None,
+        message_id=None,
+        timestamp=None,
     ):
-        super().__init__(sender, recipient)
+        super().__init__(sender, recipient, message_id, timestamp)
         self.task_id = task_id
         self.description = description
         self.priority = priority
@@ -65,8 +101,20 @@ class StatusUpdateMessage(NodeMessage):
     Message for reporting progress or status updates.
     """
 
-    def __init__(self, sender, recipient, task_id, status, progress, issues=None):
-        super().__init__(sender, recipient)
+    __slots__ = ("task_id", "status", "progress", "issues")
+
+    def __init__(
+        self,
+        sender,
+        recipient,
+        task_id,
+        status,
+        progress,
+        issues=None,
+        message_id=None,
+        timestamp=None,
+    ):
+        super().__init__(sender, recipient, message_id, timestamp)
         self.task_id = task_id
         self.status = status
         self.progress = progress
@@ -86,8 +134,12 @@ class DependencyRequestMessage(NodeMessage):
     Message for requesting unresolved dependencies.
     """
 
-    def __init__(self, sender, recipient, task_id, required_data):
-        super().__init__(sender, recipient)
+    __slots__ = ("task_id", "required_data")
+
+    def __init__(
+        self, sender, recipient, task_id, required_data, message_id=None, timestamp=None
+    ):
+        super().__init__(sender, recipient, message_id, timestamp)
         self.task_id = task_id
         self.required_data = required_data
 
@@ -103,8 +155,12 @@ class DependencyResponseMessage(NodeMessage):
     Message for responding to dependency requests.
     """
 
-    def __init__(self, sender, recipient, task_id, provided_data):
-        super().__init__(sender, recipient)
+    __slots__ = ("task_id", "provided_data")
+
+    def __init__(
+        self, sender, recipient, task_id, provided_data, message_id=None, timestamp=None
+    ):
+        super().__init__(sender, recipient, message_id, timestamp)
         self.task_id = task_id
         self.provided_data = provided_data
 
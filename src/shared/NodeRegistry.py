@@ -1,10 +1,38 @@
-from typing import Dict, Optional, TYPE_CHECKING
+import threading
+from collections import deque
+from typing import Deque, Dict, List, Optional, Set, TYPE_CHECKING
 from src.shared.logger_manager import LoggerMixin
 
 if TYPE_CHECKING:
     from src.shared.AI_Node import AI_Node
 
 
+def get_dependency_id(dependency) -> str:
+    """
+    Return the node ID of a dependency entry.
+    Dependencies are either plain node IDs or dicts with an "id" key.
+    """
+    if isinstance(dependency, dict):
+        return dependency["id"]
+    return dependency
+
+
+def is_streaming_dependency(dependency) -> bool:
+    """
+    Streaming dependencies ({"id": ..., "stream": True}) do not block the dependent:
+    it reads the upstream node's output stream while that node is still running.
+    """
+    return isinstance(dependency, dict) and bool(dependency.get("stream"))
+
+
+def is_node_resolved(node: "AI_Node") -> bool:
+    """
+    A node satisfies its dependents when it is idle and in the 'ready' state.
+    """
+    state = node.state_machine.get_state()
+    return node.get_status() == "idle" and state is not None and state.name == "ready"
+
+
 class NodeRegistry(LoggerMixin):
     def __init__(self):
         """
@@ -14,22 +42,44 @@ class NodeRegistry(LoggerMixin):
             {}
         )  # Properly annotate the type of the nodes dictionary
 
+        # Dependency index: node_id -> dependency IDs, and dependency ID -> waiting node IDs
+        self.dependencies: Dict[str, Set[str]] = {}
+        self.dependents: Dict[str, Set[str]] = {}
+        self.unresolved: Dict[str, Set[str]] = {}
+        self.resolved_nodes: Set[str] = set()
+        # Nodes whose last dependency resolved, each queued at most once until popped
+        self.ready_queue: Deque[str] = deque()
+        self.queued: Set[str] = set()
+        self._index_lock = threading.RLock()
+
         super().__init__()  # Initialize loggers
 
     def register_node(self, node: "AI_Node") -> None:
         """
-        Register a node in the registry.
+        Register a node in the registry and index its dependencies.
         """
-        self.nodes[node.node_id] = node
+        with self._index_lock:
+            if node.node_id in self.nodes:
+                self._unindex_node(node.node_id)
+            self.nodes[node.node_id] = node
+            self._index_node(node)
+            self._refresh_resolution(node.node_id)
         self.log_debugger(f"Registered Node: {node.node_id} ({node.name})")
 
     def deregister_node(self, node_id: str) -> None:
         """
         Remove a node from the registry by its ID.
         """
-        if node_id in self.nodes:
+        with self._index_lock:
+            if node_id not in self.nodes:
+                return
             del self.nodes[node_id]
-            self.log_debugger(f"Deregistered Node: {node_id}")
+            self._unindex_node(node_id)
+            if node_id in self.resolved_nodes:
+                self.resolved_nodes.discard(node_id)
+                for dependent_id in self.dependents.get(node_id, ()):
+                    self.unresolved[dependent_id].add(node_id)
+        self.log_debugger(f"Deregistered Node: {node_id}")
 
     def get_node_by_id(self, node_id: str) -> Optional["AI_Node"]:
         """
@@ -43,6 +93,61 @@ class NodeRegistry(LoggerMixin):
         """
         return self.nodes
 
+    def get_dependents(self, node_id: str) -> Set[str]:
+        """
+        Get the IDs of registered nodes that depend on the given node.
+        """
+        with self._index_lock:
+            return set(self.dependents.get(node_id, ()))
+
+    def get_unresolved_dependencies(self, node_id: str) -> List[str]:
+        """
+        Get the dependency IDs of a node that are not yet resolved.
+        """
+        with self._index_lock:
+            return sorted(self.unresolved.get(node_id, ()))
+
+    def get_unresolved_count(self, node_id: str) -> int:
+        """
+        Get the number of unresolved dependencies of a node.
+        """
+        with self._index_lock:
+            return len(self.unresolved.get(node_id, ()))
+
+    def notify_state_change(self, node_id: str) -> None:
+        """
+        Re-evaluate a node after a state or status change and wake its direct dependents.
+        Dependents whose last dependency just resolved are pushed onto the ready queue.
+        """
+        with self._index_lock:
+            if node_id in self.nodes:
+                self._refresh_resolution(node_id)
+
+    def update_dependencies(self, node: "AI_Node") -> None:
+        """
+        Re-index a node after its dependency list has changed.
+        """
+        with self._index_lock:
+            if node.node_id not in self.nodes:
+                return
+            self._unindex_node(node.node_id)
+            self._index_node(node)
+            self._push_if_unblocked(node.node_id)
+
+    def pop_ready_nodes(self) -> List["AI_Node"]:
+        """
+        Drain the ready queue, returning nodes whose dependencies have all resolved.
+        """
+        with self._index_lock:
+            ready = []
+            while self.ready_queue:
+                node_id = self.ready_queue.popleft()
+                self.queued.discard(node_id)
+                node = self.nodes.get(node_id)
+                if node is not None and not self.unresolved.get(node_id):
+                    ready.append(node)
+            return ready
+
     def debug_registry(self) -> None:
         """
         Print all nodes in the registry for debugging purposes.
@@ -51,3 +156,53 @@ class NodeRegistry(LoggerMixin):
             self.log_debugger(
                 f"Node ID: {node_id}, Node Name: {node.name}, Status: {node.status}"
             )
+
+    def _index_node(self, node: "AI_Node") -> None:
+        """Add a node's forward and reverse dependency edges."""
+        dependency_ids = {
+            get_dependency_id(dep)
+            for dep in node.dependencies
+            if not is_streaming_dependency(dep)
+        }
+        self.dependencies[node.node_id] = dependency_ids
+        self.unresolved[node.node_id] = {
+            dep_id for dep_id in dependency_ids if dep_id not in self.resolved_nodes
+        }
+        for dep_id in dependency_ids:
+            self.dependents.setdefault(dep_id, set()).add(node.node_id)
+
+    def _unindex_node(self, node_id: str) -> None:
+        """Remove a node's forward dependency edges."""
+        for dep_id in self.dependencies.pop(node_id, ()):
+            waiting = self.dependents.get(dep_id)
+            if waiting is not None:
+                waiting.discard(node_id)
+                if not waiting:
+                    del self.dependents[dep_id]
+        self.unresolved.pop(node_id, None)
+
+    def _refresh_resolution(self, node_id: str) -> None:
+        """Propagate a change in a node's resolved status to its direct dependents."""
+        resolved = is_node_resolved(self.nodes[node_id])
+        if resolved == (node_id in self.resolved_nodes):
+            return
+
+        if resolved:
+            self.resolved_nodes.add(node_id)
+            for dependent_id in self.dependents.get(node_id, ()):
+                self.unresolved[dependent_id].discard(node_id)
+                self._push_if_unblocked(dependent_id)
+        else:
+            self.resolved_nodes.discard(node_id)
+            for dependent_id in self.dependents.get(node_id, ()):
+                self.unresolved[dependent_id].add(node_id)
+
+    def _push_if_unblocked(self, node_id: str) -> None:
+        """Queue a node once it has no unresolved dependencies left."""
+        if (
+            self.dependencies.get(node_id)
+            and not self.unresolved[node_id]
+            and node_id not in self.queued
+        ):
+            self.queued.add(node_id)
+            self.ready_queue.append(node_id)
@@ -1,10 +1,23 @@
-from src.shared.utils import get_current_timestamp
+import asyncio
+import queue
+import time
+from concurrent.futures import FIRST_COMPLETED, Executor, ThreadPoolExecutor, wait
+
+from src.shared.ActivityLog import ActivityLog
+from src.shared.config import NODE_TIMEOUT_SECONDS
+from src.shared.OutputStream import StreamEvent
+from src.shared.state import ERROR
+from src.shared.utils import get_background_loop, run_sync
+
+_STREAM_DONE = object()
 
 
 class Orchestrator:
-    def __init__(self):
+    def __init__(self, name="Orchestrator"):
+        self.name = name
         self.nodes = {}
-        self.activity_logs = []  # Shared Logging Mechanism
+        self.registries = {}  # id -> NodeRegistry of the registered nodes
+        self.activity_logs = ActivityLog()  # Shared Logging Mechanism
         self.context = {}  # Shared attribute for managing context
 
     def register_node(self, node):
@@ -12,6 +25,8 @@ class Orchestrator:
         Register a node in the orchestrator.
         """
         self.nodes[node.node_id] = node
+        if node.node_registry:
+            self.registries[id(node.node_registry)] = node.node_registry
         self.log_activity(f"Registered node: {node.node_id} ({node.name})")
 
     def assign_task(self, node_id, task):
@@ -34,25 +49,273 @@ class Orchestrator:
             state = node.state_machine.get_state()
             self.log_activity(f"Node {node_id} is in state: {state.name}")
 
-    def collect_responses(self):
+    def collect_responses(self, timeout=NODE_TIMEOUT_SECONDS):
         """
         Collect responses from all nodes and update their states accordingly.
+        Thin synchronous wrapper over acollect_responses().
         """
-        responses = {}
-        for node_id, node in self.nodes.items():
-            if node.task:
-                response = node.process_task()
-                responses[node_id] = response
-                node.update_state()  # Reflect state changes after processing
-                self.log_activity(f"Response from {node_id}: {response}")
+        return run_sync(self.acollect_responses(timeout))
+
+    async def acollect_responses(self, timeout=NODE_TIMEOUT_SECONDS):
+        """
+        Concurrently collect responses from all nodes with a task and update their states.
+        """
+        return {
+            node_id: response
+            async for node_id, response in self.astream_responses(timeout)
+        }
+
+    def collect_incremental(self, executor):
+        """
+        Thin synchronous wrapper over acollect_incremental().
+        """
+        return run_sync(self.acollect_incremental(executor))
+
+    async def acollect_incremental(self, executor):
+        """
+        Bring all nodes with a task up to date through an IncrementalExecutor, which
+        re-executes only the nodes whose inputs changed since it last ran them.
+        """
+        nodes = [node for _, node in self.get_eligible_nodes()]
+        responses = await executor.arun(nodes)
+        for node_id, response in responses.items():
+            self.record_response(node_id, self.nodes[node_id], response)
         return responses
 
+    def get_eligible_nodes(self):
+        """
+        Return (node_id, node) pairs for nodes that have a task to process.
+        """
+        return [(node_id, node) for node_id, node in self.nodes.items() if node.task]
+
+    async def astream_responses(self, timeout=NODE_TIMEOUT_SECONDS):
+        """
+        Run eligible nodes concurrently and yield (node_id, response) pairs as each completes.
+        :param timeout: Per-node timeout in seconds; slower nodes yield a timeout response.
+        """
+
+        async def run_node(node_id, node):
+            try:
+                response = await asyncio.wait_for(node.aprocess_task(), timeout)
+            except asyncio.TimeoutError:
+                response = self.timeout_response(node_id, timeout)
+            except Exception as e:
+                response = {"status": "error", "node_id": node_id, "message": str(e)}
+            return node_id, node, response
+
+        tasks = [
+            asyncio.ensure_future(run_node(node_id, node))
+            for node_id, node in self.get_eligible_nodes()
+        ]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                node_id, node, response = await next_done
+                self.record_response(node_id, node, response)
+                yield node_id, response
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    def stream_responses(
+        self, executor="thread", max_workers=None, timeout=NODE_TIMEOUT_SECONDS
+    ):
+        """
+        Run eligible nodes concurrently and yield (node_id, response) pairs as each completes.
+        :param executor: "thread" for a thread pool, "asyncio" for the shared event loop,
+            or an existing concurrent.futures.Executor.
+        :param max_workers: Thread pool size when executor is "thread".
+        :param timeout: Per-node timeout in seconds, measured from when the node starts.
+        """
+        if executor == "asyncio":
+            yield from self._stream_from_event_loop(self.astream_responses(timeout))
+            return
+
+        if isinstance(executor, Executor):
+            pool, owns_pool = executor, False
+        elif executor == "thread":
+            pool, owns_pool = ThreadPoolExecutor(max_workers=max_workers), True
+        else:
+            raise ValueError(f"Unknown executor: {executor}")
+
+        started = {}
+
+        def run_node(node_id, node):
+            started[node_id] = time.monotonic()
+            return node.process_task()
+
+        try:
+            pending = {
+                pool.submit(run_node, node_id, node): (node_id, node)
+                for node_id, node in self.get_eligible_nodes()
+            }
+            while pending:
+                deadlines = [
+                    started[node_id] + timeout
+                    for node_id, _ in pending.values()
+                    if node_id in started
+                ]
+                wait_for = max(0, min(deadlines) - time.monotonic()) if deadlines else None
+                done, _ = wait(pending, timeout=wait_for, return_when=FIRST_COMPLETED)
+
+                for future in done:
+                    node_id, node = pending.pop(future)
+                    try:
+                        response = future.result()
+                    except Exception as e:
+                        response = {"status": "error", "node_id": node_id, "message": str(e)}
+                    self.record_response(node_id, node, response)
+                    yield node_id, response
+
+                now = time.monotonic()
+                for future, (node_id, node) in list(pending.items()):
+                    if node_id in started and now - started[node_id] >= timeout:
+                        future.cancel()
+                        del pending[future]
+                        response = self.timeout_response(node_id, timeout)
+                        self.record_response(node_id, node, response)
+                        yield node_id, response
+        finally:
+            if owns_pool:
+                pool.shutdown(wait=False, cancel_futures=True)
+
+    async def astream_tokens(self, timeout=NODE_TIMEOUT_SECONDS):
+        """
+        Run eligible nodes concurrently and yield StreamEvents as their output is
+        produced: each chunk as it arrives, then one final event per node carrying its
+        response. Consumers can act on partial output before any node finishes.
+        :param timeout: Per-node timeout in seconds; slower nodes end with a timeout response.
+        """
+        events = asyncio.Queue()
+
+        async def pump(node_id, node):
+            async for chunk in node.astream_task():
+                events.put_nowait(StreamEvent(node_id, chunk))
+            return node.output_stream.response
+
+        async def run_node(node_id, node):
+            try:
+                response = await asyncio.wait_for(pump(node_id, node), timeout)
+            except asyncio.TimeoutError:
+                response = self.timeout_response(node_id, timeout)
+            except Exception as e:
+                response = {"status": "error", "node_id": node_id, "message": str(e)}
+            events.put_nowait(StreamEvent(node_id, response=response))
+
+        tasks = [
+            asyncio.ensure_future(run_node(node_id, node))
+            for node_id, node in self.get_eligible_nodes()
+        ]
+        try:
+            running = len(tasks)
+            while running:
+                event = await events.get()
+                if event.done:
+                    running -= 1
+                    self.record_response(
+                        event.node_id, self.nodes[event.node_id], event.response
+                    )
+                yield event
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    def stream_tokens(self, timeout=NODE_TIMEOUT_SECONDS):
+        """
+        Synchronous version of astream_tokens(), run on the shared event loop.
+        """
+        yield from self._stream_from_event_loop(self.astream_tokens(timeout))
+
+    def _stream_from_event_loop(self, stream):
+        """
+        Bridge an async generator on the shared event loop to a synchronous generator.
+        If the consumer stops early, the pump is cancelled and the stream closed.
+        :raises RuntimeError: If iterated from the shared event loop itself.
+        """
+        loop = get_background_loop()
+        try:
+            running_loop = asyncio.get_running_loop()
+        except RuntimeError:
+            running_loop = None
+        if running_loop is loop:
+            raise RuntimeError(
+                "Synchronous streams cannot be consumed from the shared event loop; use the async stream instead."
+            )
+
+        results = queue.Queue()
+
+        async def pump():
+            try:
+                async for item in stream:
+                    results.put(item)
+            finally:
+                try:
+                    await stream.aclose()
+                finally:
+                    results.put(_STREAM_DONE)
+
+        future = asyncio.run_coroutine_threadsafe(pump(), loop)
+        try:
+            while True:
+                item = results.get()
+                if item is _STREAM_DONE:
+                    break
+                yield item
+        finally:
+            if not future.done():
+                loop.call_soon_threadsafe(future.cancel)
+        future.result()  # Surface any orchestration error
+
+    def record_response(self, node_id, node, response):
+        """
+        Update a node's state after it responds and log the response.
+        """
+        # Nodes in 'error' stay there until the error is cleared
+        if (
+            response.get("status") != "timeout"
+            and node.state_machine.get_state() is not ERROR
+        ):
+            node.update_state()  # Reflect state changes after processing
+        self.log_activity(f"Response from {node_id}: {response}")
+        self.wake_ready_nodes()
+
+    def wake_ready_nodes(self):
+        """
+        Drain the registries' ready queues and move registered nodes whose last
+        dependency has resolved out of 'waiting', so they never poll for it.
+        :return: IDs of the nodes woken.
+        """
+        woken = []
+        for registry in self.registries.values():
+            ready = registry.pop_ready_nodes()
+            while ready:
+                for node in ready:
+                    if self.nodes.get(node.node_id) is not node:
+                        continue
+                    state = node.state_machine.get_state()
+                    if state is None or state.name != "waiting":
+                        continue
+                    node.state_machine.handle_task()
+                    node.update_status()  # May unblock nodes further down
+                    woken.append(node.node_id)
+                    self.log_activity(f"Dependencies resolved for {node.node_id}")
+                ready = registry.pop_ready_nodes()
+        return woken
+
+    def timeout_response(self, node_id, timeout):
+        """
+        Build the response reported for a node that exceeded its timeout.
+        """
+        return {
+            "status": "timeout",
+            "node_id": node_id,
+            "message": f"Node did not respond within {timeout} seconds.",
+        }
+
     def log_activity(self, activity):
         """
         Log an orchestrator-level activity.
         """
-        timestamp = get_current_timestamp()
-        self.activity_logs.append({"activity": activity, "timestamp": timestamp})
+        self.activity_logs.append(activity)
 
     def get_context(self):
         """Retrieve the orchestrator's current context."""
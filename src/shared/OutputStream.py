@@ -0,0 +1,121 @@
+import asyncio
+import threading
+
+
+class OutputStream:
+    """
+    Append-only stream of output chunks from one node run. Any number of consumers,
+    threaded or asyncio, can read it from the start while it is still being written;
+    the final response dict is attached when the stream is closed.
+    """
+
+    def __init__(self):
+        self.chunks = []
+        self.response = None
+        self.done = False
+        self._lock = threading.Lock()
+        self._changed = threading.Condition(self._lock)
+        self._async_waiters = []  # (loop, future) pairs waiting for more output
+
+    def append(self, chunk):
+        """Publish a chunk to every consumer."""
+        with self._lock:
+            if self.done:
+                raise ValueError("Cannot append to a closed output stream.")
+            self.chunks.append(chunk)
+            self._wake()
+
+    def close(self, response=None):
+        """Mark the stream complete and attach the node's final response."""
+        with self._lock:
+            if self.done:
+                return
+            self.response = response
+            self.done = True
+            self._wake()
+
+    def text(self):
+        """Output produced so far."""
+        with self._lock:
+            return "".join(self.chunks)
+
+    def __iter__(self):
+        """Yield chunks from the start, blocking until more arrive or the stream closes."""
+        position = 0
+        while True:
+            with self._lock:
+                self._changed.wait_for(lambda: position < len(self.chunks) or self.done)
+                chunks = self.chunks[position:]
+                done = self.done
+            position += len(chunks)
+            yield from chunks
+            if done and position == len(self.chunks):
+                return
+
+    async def __aiter__(self):
+        """Asynchronously yield chunks from the start until the stream closes."""
+        position = 0
+        while True:
+            with self._lock:
+                chunks = self.chunks[position:]
+                done = self.done
+                if not chunks and not done:
+                    loop = asyncio.get_running_loop()
+                    waiter = loop.create_future()
+                    self._async_waiters.append((loop, waiter))
+            if chunks:
+                position += len(chunks)
+                for chunk in chunks:
+                    yield chunk
+            elif done:
+                return
+            else:
+                await waiter
+
+    def result(self, timeout=None):
+        """Block until the stream closes and return the final response."""
+        with self._lock:
+            if not self._changed.wait_for(lambda: self.done, timeout):
+                raise TimeoutError("Output stream did not finish in time.")
+            return self.response
+
+    async def aresult(self):
+        """Wait for the stream to close and return the final response."""
+        async for _ in self:
+            pass
+        return self.response
+
+    def _wake(self):
+        """Caller holds the lock."""
+        self._changed.notify_all()
+        for loop, waiter in self._async_waiters:
+            loop.call_soon_threadsafe(_resolve, waiter)
+        self._async_waiters.clear()
+
+
+def _resolve(future):
+    if not future.done():
+        future.set_result(None)
+
+
+class StreamEvent:
+    """
+    One item of an orchestrator token stream: a chunk of a node's output, or (with
+    response set) the end of that node's run.
+    """
+
+    __slots__ = ("node_id", "chunk", "response")
+
+    def __init__(self, node_id, chunk="", response=None):
+        self.node_id = node_id
+        self.chunk = chunk
+        self.response = response
+
+    @property
+    def done(self):
+        return self.response is not None
+
+    def __repr__(self):
+        if self.done:
+            return f"StreamEvent({self.node_id!r}, response={self.response!r})"
+        return f"StreamEvent({self.node_id!r}, {self.chunk!r})"
@@ -0,0 +1,237 @@
+import multiprocessing
+import os
+import pickle
+import socket
+import threading
+from multiprocessing.connection import AuthenticationError, Client, Listener
+
+from src.shared import config
+from src.shared.config import NODE_TIMEOUT_SECONDS
+from src.shared.utils import OrchestratorError
+
+# LocalOrchestrator methods a TeamServer answers
+TEAM_METHODS = frozenset(
+    {
+        "assign_task",
+        "supports_task",
+        "get_load",
+        "report_progress",
+        "receive_data",
+        "collect_responses",
+        "mark_changed",
+        "get_queue_depth",
+        "get_idle_capacity",
+        "steal_tasks",
+    }
+)
+
+
+class TeamServer:
+    """
+    Serves a LocalOrchestrator over an authenticated socket, so a GlobalOrchestrator
+    in another process or on another host can drive it through a RemoteTeam.
+    Each connection is handled on its own thread; requests are (method, args,
+    kwargs) tuples and replies are ("ok", result) or ("error", exception).
+    """
+
+    def __init__(self, team, address=("127.0.0.1", 0), authkey=None):
+        """
+        :param address: (host, port) to listen on; port 0 picks a free port.
+        :param authkey: Shared secret clients must prove they know before anything
+            they send is unpickled. A random key is generated if none is given; hand
+            self.authkey to the clients.
+        """
+        self.team = team
+        self.authkey = authkey or os.urandom(32)
+        self.listener = Listener(address, authkey=self.authkey)
+        self.address = self.listener.address
+        self._closed = threading.Event()
+
+    def serve_forever(self):
+        """Accept and serve connections until shutdown()."""
+        while not self._closed.is_set():
+            try:
+                connection = self.listener.accept()
+            except (OSError, EOFError, AuthenticationError):
+                continue  # Failed handshake, or the wake-up from shutdown()
+            threading.Thread(
+                target=self.serve_connection, args=(connection,), daemon=True
+            ).start()
+        self.listener.close()
+
+    def serve_connection(self, connection):
+        with connection:
+            while not self._closed.is_set():
+                try:
+                    method, args, kwargs = connection.recv()
+                except (OSError, EOFError):
+                    return  # Client went away
+                if method == "shutdown":
+                    connection.send(("ok", None))
+                    self.shutdown()
+                    return
+                connection.send(self.handle(method, args, kwargs))
+
+    def handle(self, method, args, kwargs):
+        """Run one request against the team and build the reply."""
+        try:
+            if method == "get_team_name":
+                return ("ok", self.team.team_name)
+            if method not in TEAM_METHODS:
+                raise OrchestratorError(f"Team method '{method}' is not served.")
+            result = getattr(self.team, method)(*args, **kwargs)
+            if method == "assign_task" and result is not None:
+                result = result.node_id  # Nodes stay in the team's process
+            return ("ok", result)
+        except Exception as e:
+            try:
+                pickle.dumps(e)
+            except Exception:
+                e = OrchestratorError(f"{type(e).__name__}: {e}")
+            return ("error", e)
+
+    def shutdown(self):
+        """Stop accepting connections; serve_forever() returns."""
+        self._closed.set()
+        try:
+            # Wake the accept() call blocked in serve_forever()
+            socket.create_connection(self.address, timeout=1).close()
+        except OSError:
+            pass
+
+
+class RemoteTeam:
+    """
+    Proxy for a team served by TeamServer, usable wherever GlobalOrchestrator expects
+    a LocalOrchestrator. assign_task() returns the ID of the node the task went to
+    instead of the node itself. Calls are serialized over one connection.
+    """
+
+    def __init__(self, address, authkey, process=None):
+        """
+        :param authkey: The server's TeamServer.authkey.
+        :param process: Worker process running the server, stopped by close().
+        """
+        if not authkey:
+            raise OrchestratorError("An authkey is required to connect to a team.")
+        self.address = address
+        self.process = process
+        self.connection = Client(address, authkey=authkey)
+        self._lock = threading.Lock()
+        self.team_name = self.call("get_team_name")
+
+    def call(self, method, *args, **kwargs):
+        """
+        Call a team method remotely and return its result.
+        :raises OrchestratorError: If the team cannot be reached; errors raised by
+            the team are re-raised as-is.
+        """
+        with self._lock:
+            try:
+                self.connection.send((method, args, kwargs))
+                outcome, value = self.connection.recv()
+            except (OSError, EOFError) as e:
+                raise OrchestratorError(
+                    f"Team at {self.address} is unreachable: {e}"
+                ) from e
+        if outcome == "error":
+            raise value
+        return value
+
+    def assign_task(self, task, priority=1, pinned=False):
+        return self.call("assign_task", task, priority, pinned)
+
+    def supports_task(self, task):
+        return self.call("supports_task", task)
+
+    def get_load(self, task=None, priority=1):
+        return self.call("get_load", task, priority)
+
+    def report_progress(self, full=False):
+        return self.call("report_progress", full)
+
+    def receive_data(self, data, from_team=None):
+        return self.call("receive_data", data, from_team)
+
+    def get_queue_depth(self):
+        return self.call("get_queue_depth")
+
+    def get_idle_capacity(self):
+        return self.call("get_idle_capacity")
+
+    def steal_tasks(self, tasks, max_tasks):
+        return self.call("steal_tasks", tasks, max_tasks)
+
+    def collect_responses(self, timeout=NODE_TIMEOUT_SECONDS):
+        return self.call("collect_responses", timeout)
+
+    def close(self):
+        """Disconnect, stopping the team's worker process if it was spawned."""
+        if self.process is not None:
+            try:
+                self.call("shutdown")
+            except OrchestratorError:
+                pass
+        self.connection.close()
+        if self.process is not None:
+            self.process.join(config.TEAM_RPC_STOP_TIMEOUT)
+            if self.process.is_alive():
+                self.process.terminate()
+                self.process.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def serve_team(build_team, args, address, authkey, ready):
+    """
+    Worker process entry point: build the team and serve it, reporting the
+    listening address (or the build error) through the ready pipe.
+    """
+    try:
+        server = TeamServer(build_team(*args), address, authkey)
+    except Exception as e:
+        ready.send(("error", OrchestratorError(f"{type(e).__name__}: {e}")))
+        return
+    ready.send(("ok", server.address))
+    ready.close()
+    server.serve_forever()
+
+
+def spawn_team(build_team, *args, mp_context=None):
+    """
+    Start a team in its own worker process and connect to it.
+    :param build_team: Importable callable returning the LocalOrchestrator, with
+        its nodes registered; called as build_team(*args) in the worker.
+    :param mp_context: multiprocessing context or start method name.
+    :return: RemoteTeam whose close() stops the worker.
+    """
+    if not isinstance(mp_context, multiprocessing.context.BaseContext):
+        mp_context = multiprocessing.get_context(
+            mp_context or config.WORKER_START_METHOD
+        )
+    authkey = os.urandom(32)  # Known only to this process and the worker
+    receiver, sender = mp_context.Pipe(duplex=False)
+    process = mp_context.Process(
+        target=serve_team,
+        args=(build_team, args, ("127.0.0.1", 0), authkey, sender),
+        daemon=True,
+    )
+    process.start()
+    sender.close()
+    try:
+        if not receiver.poll(config.TEAM_RPC_START_TIMEOUT):
+            raise OrchestratorError("Team worker did not start in time.")
+        outcome, value = receiver.recv()
+    except EOFError:
+        outcome, value = "error", OrchestratorError("Team worker exited on start.")
+    finally:
+        receiver.close()
+    if outcome == "error":
+        process.kill()
+        process.join()
+        raise value
+    return RemoteTeam(value, authkey, process=process)
@@ -0,0 +1,324 @@
+import asyncio
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+from src.shared import config
+
+_MISSING = object()
+
+
+def make_cache_key(model, prompt, **params):
+    """
+    Content-address a model request: SHA-256 of the model, parameters and full prompt.
+    """
+    canonical = json.dumps(
+        {"model": model, "params": params, "prompt": prompt},
+        sort_keys=True,
+        separators=(",", ":"),
+        default=str,
+    )
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    """
+    Two-tier cache of model responses: an in-memory LRU in front of an optional
+    SQLite file. Entries expire after ttl seconds; the disk tier is trimmed to
+    max_disk_bytes by evicting the least recently used rows. Access times of disk
+    hits are written in batches rather than on every hit. The tiers have separate
+    locks, so memory hits never wait on disk I/O; aget() and aset() run the disk
+    tier in a worker thread. Concurrent identical requests on one event loop are
+    coalesced into a single computation.
+    Values must be JSON-serializable when a disk path is set.
+    """
+
+    def __init__(
+        self,
+        max_entries=config.RESPONSE_CACHE_MAX_ENTRIES,
+        ttl=config.RESPONSE_CACHE_TTL_SECONDS,
+        path=None,
+        max_disk_bytes=config.RESPONSE_CACHE_MAX_DISK_BYTES,
+        access_flush_size=config.RESPONSE_CACHE_ACCESS_FLUSH_SIZE,
+    ):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.path = path
+        self.max_disk_bytes = max_disk_bytes
+        self.access_flush_size = access_flush_size
+        self.entries = OrderedDict()  # key -> (expires_at, value), oldest first
+        self.in_flight = {}  # key -> asyncio.Future of the computation filling it
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self._lock = threading.Lock()  # Memory tier and counters
+        self._disk_lock = threading.Lock()  # SQLite connection and disk bookkeeping
+        self._db = None
+        self._disk_bytes = 0
+        self._accessed = {}  # key -> access time of disk hits not yet written
+        if path:
+            self._open_disk()
+
+    def get(self, key, default=None):
+        """Return a cached value, checking memory then disk."""
+        value = self._memory_get(key)
+        if value is _MISSING and self._db:
+            value = self._disk_lookup(key)
+        return default if value is _MISSING else value
+
+    async def aget(self, key, default=None):
+        """Like get(), reading the disk tier in a worker thread."""
+        value = self._memory_get(key)
+        if value is _MISSING and self._db:
+            value = await asyncio.to_thread(self._disk_lookup, key)
+        return default if value is _MISSING else value
+
+    def set(self, key, value, ttl=None):
+        """Store a value in both tiers."""
+        expires_at = time.time() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._memory_set(key, expires_at, value)
+        if self._db:
+            self._disk_store(key, expires_at, value)
+
+    async def aset(self, key, value, ttl=None):
+        """Like set(), writing the disk tier in a worker thread."""
+        expires_at = time.time() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._memory_set(key, expires_at, value)
+        if self._db:
+            await asyncio.to_thread(self._disk_store, key, expires_at, value)
+
+    def delete(self, key):
+        with self._lock:
+            self.entries.pop(key, None)
+        with self._disk_lock:
+            if self._db:
+                self._accessed.pop(key, None)
+                self._disk_delete(key=key)
+
+    def clear(self):
+        """Drop every entry from both tiers."""
+        with self._lock:
+            self.entries.clear()
+        with self._disk_lock:
+            if self._db:
+                self._accessed.clear()
+                self._disk_delete()
+
+    async def aget_or_compute(self, key, compute):
+        """
+        Return the cached value for key, or await compute() to produce and cache it.
+        Callers asking for a key that is already being computed wait for that result.
+        :param compute: Zero-argument callable returning an awaitable.
+        """
+        value = await self.aget(key, _MISSING)
+        if value is not _MISSING:
+            return value
+
+        loop = asyncio.get_running_loop()
+        pending = self.in_flight.get(key)
+        if pending is not None and pending.get_loop() is loop:
+            self.coalesced += 1
+            return await asyncio.shield(pending)
+
+        future = loop.create_future()
+        self.in_flight[key] = future
+        try:
+            value = await compute()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            future.exception()  # Waiters re-raise it; don't warn if there are none
+            raise
+        else:
+            await self.aset(key, value)
+            future.set_result(value)
+            return value
+        finally:
+            if self.in_flight.get(key) is future:
+                del self.in_flight[key]
+
+    def get_stats(self):
+        """Return hit/miss counters and tier sizes."""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "coalesced": self.coalesced,
+                "memory_entries": len(self.entries),
+                "disk_bytes": self._disk_bytes,
+            }
+
+    def close(self):
+        with self._disk_lock:
+            if self._db:
+                self._flush_access_times()
+                self._db.close()
+                self._db = None
+
+    def _memory_get(self, key):
+        """
+        Return the value from memory or _MISSING. Misses are only counted here when
+        there is no disk tier to try next.
+        """
+        now = time.time()
+        with self._lock:
+            entry = self.entries.get(key)
+            if entry is not None:
+                if entry[0] > now:
+                    self.entries.move_to_end(key)
+                    self.hits += 1
+                    return entry[1]
+                del self.entries[key]
+            if not self._db:
+                self.misses += 1
+            return _MISSING
+
+    def _disk_lookup(self, key):
+        """Return the value from disk or _MISSING, promoting hits into memory."""
+        now = time.time()
+        with self._disk_lock:
+            row = self._disk_get(key, now) if self._db else None
+        with self._lock:
+            if row is None:
+                self.misses += 1
+                return _MISSING
+            expires_at, value = row
+            self.hits += 1
+            self._memory_set(key, expires_at, value)
+            return value
+
+    def _disk_store(self, key, expires_at, value):
+        with self._disk_lock:
+            if self._db:
+                self._disk_set(key, expires_at, value)
+
+    def _memory_set(self, key, expires_at, value):
+        """Caller holds the lock."""
+        self.entries[key] = (expires_at, value)
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+    def _open_disk(self):
+        self._db = sqlite3.connect(self.path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL, "
+            "accessed_at REAL NOT NULL, size INTEGER NOT NULL)"
+        )
+        self._db.execute(
+            "CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed_at)"
+        )
+        self._db.execute(
+            "CREATE INDEX IF NOT EXISTS responses_expires ON responses (expires_at)"
+        )
+        self._disk_delete(expired_before=time.time())
+        self._disk_bytes = self._db.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM responses"
+        ).fetchone()[0]
+
+    def _disk_get(self, key, now):
+        """Return (expires_at, value) for a live row. Caller holds the disk lock."""
+        row = self._db.execute(
+            "SELECT value, expires_at FROM responses WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return None
+        text, expires_at = row
+        if expires_at <= now:
+            self._disk_delete(key=key)
+            return None
+        self._accessed[key] = now
+        if len(self._accessed) >= self.access_flush_size:
+            self._flush_access_times()
+        return expires_at, json.loads(text)
+
+    def _disk_set(self, key, expires_at, value):
+        """
+        Write a row, then evict least recently used rows down to the low-water mark
+        once the size limit is exceeded. Caller holds the disk lock.
+        """
+        text = json.dumps(value)
+        size = len(key) + len(text.encode("utf-8"))
+        self._accessed.pop(key, None)
+        self._disk_delete(key=key, commit=False)
+        self._db.execute(
+            "INSERT INTO responses VALUES (?, ?, ?, ?, ?)",
+            (key, text, expires_at, time.time(), size),
+        )
+        self._disk_bytes += size
+        if self._disk_bytes > self.max_disk_bytes:
+            self._flush_access_times(commit=False)  # Evict by up-to-date access times
+            self._disk_delete(expired_before=time.time(), commit=False)
+            low_water = self.max_disk_bytes * config.RESPONSE_CACHE_DISK_LOW_WATER
+            while self._disk_bytes > low_water:
+                rows = self._db.execute(
+                    "SELECT key, size FROM responses ORDER BY accessed_at LIMIT ?",
+                    (config.RESPONSE_CACHE_EVICT_BATCH,),
+                ).fetchall()
+                if not rows:
+                    break
+                evict = []
+                for old_key, old_size in rows:
+                    if self._disk_bytes <= low_water:
+                        break
+                    evict.append((old_key,))
+                    self._disk_bytes -= old_size
+                self._db.executemany("DELETE FROM responses WHERE key = ?", evict)
+        self._db.commit()
+
+    def _flush_access_times(self, commit=True):
+        """Write the access times of recent disk hits. Caller holds the disk lock."""
+        if not self._accessed:
+            return
+        self._db.executemany(
+            "UPDATE responses SET accessed_at = ? WHERE key = ?",
+            [(accessed_at, key) for key, accessed_at in self._accessed.items()],
+        )
+        self._accessed.clear()
+        if commit:
+            self._db.commit()
+
+    def _disk_delete(self, key=None, expired_before=None, commit=True):
+        """
+        Delete the row for key, the rows expired by expired_before, or with neither
+        every row, keeping the size total in step. Caller holds the disk lock.
+        """
+        if key is not None:
+            where, args = " WHERE key = ?", (key,)
+        elif expired_before is not None:
+            where, args = " WHERE expires_at <= ?", (expired_before,)
+        else:
+            where, args = "", ()
+        freed = self._db.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM responses" + where, args
+        ).fetchone()[0]
+        self._db.execute("DELETE FROM responses" + where, args)
+        self._disk_bytes -= freed
+        if commit:
+            self._db.commit()
+
+
+_default_cache = None
+_default_cache_lock = threading.Lock()
+
+
+def get_default_response_cache():
+    """
+    Return the shared response cache, or None if config.RESPONSE_CACHE_ENABLED is off.
+    """
+    global _default_cache
+    if not config.RESPONSE_CACHE_ENABLED:
+        return None
+    with _default_cache_lock:
+        if _default_cache is None:
+            _default_cache = ResponseCache(path=config.RESPONSE_CACHE_PATH)
+    return _default_cache
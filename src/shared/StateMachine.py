@@ -1,4 +1,8 @@
-from src.shared.State import WaitingState, ProcessingState, ReadyState, ErrorState
+import logging
+import time
+
+from src.shared.NodeRegistry import is_streaming_dependency
+from src.shared.state import ERROR, STATES, TRANSITIONS
 
 
 class InvalidStateException(Exception):
@@ -8,22 +12,44 @@ class InvalidStateException(Exception):
         super().__init__(message)
 
 
+def add_transition_observer(observer):
+    """
+    Subscribe to state transitions of every StateMachine.
+    :param observer: Callable taking (node, from_state, to_state, reason, monotonic_ts).
+    """
+    StateMachine.observers = StateMachine.observers + (observer,)
+
+
+def remove_transition_observer(observer):
+    """
+    Unsubscribe a previously added transition observer.
+    """
+    StateMachine.observers = tuple(o for o in StateMachine.observers if o is not observer)
+
+
 class StateMachine:
-    def __init__(self):
+    __slots__ = ("node", "current_state")
+
+    # Shared transition observers; replaced (never mutated) so notification needs no lock
+    observers = ()
+    # Interned state singletons and the compiled transition table, shared by every machine
+    states = STATES
+    transitions = TRANSITIONS
+
+    def __init__(self, node=None):
+        self.node = node  # Node that owns this machine, passed to observers
         self.current_state = None  # Start with no state
-        self.states = {
-            "waiting": WaitingState(self),
-            "processing": ProcessingState(self),
-            "ready": ReadyState(self),
-            "error": ErrorState(self),
-        }
 
     # Dependencies is a list of node id's
     def set_initial_state(self, dependencies=None, task=None):
         """
         Determine and set the initial state based on dependencies and tasks.
         """
-        if dependencies and any(not dep["resolved"] for dep in dependencies):
+        if dependencies and any(
+            not dep["resolved"]
+            for dep in dependencies
+            if not is_streaming_dependency(dep)
+        ):
             self.transition_to("waiting", "Unresolved dependencies.")
             return
 
@@ -42,60 +68,81 @@ class StateMachine:
         """
         self.set_initial_state(dependencies, task)
 
-    def transition_to(self, state_name, reason):
+    def transition_to(self, state_name, reason=None):
         """
         Transition to a new state with validation and logging.
         """
-        if self.current_state and self.current_state.name == state_name:
-            # Avoid redundant transitions
-            print(
-                f"State transition to '{state_name}' ignored: already in this state."
-            )  # Replace with logging
-            return  # No transition needed
-
-        if state_name not in self.states:
+        previous_state = self.current_state
+        if previous_state is not None:
+            if previous_state.name == state_name:
+                return  # Avoid redundant transitions
+            if (previous_state.name, state_name) not in self.transitions:
+                if state_name not in self.states:
+                    raise ValueError(f"State '{state_name}' is not recognized.")
+                raise ValueError(
+                    f"Invalid state transition from '{previous_state.name}' to '{state_name}'."
+                )
+        elif state_name not in self.states:
             raise ValueError(f"State '{state_name}' is not recognized.")
 
-        if self.current_state and not self.current_state.can_transition_to(state_name):
-            raise ValueError(
-                f"Invalid state transition from '{self.current_state.name}' to '{state_name}'."
-            )
-
         self.current_state = self.states[state_name]
-        print(
-            f"Transitioned to state '{state_name}' due to: {reason}"
-        )  # Replace with logging
+        if self.observers:
+            self.notify_observers(previous_state, state_name, reason)
+
+    def notify_observers(self, previous_state, state_name, reason):
+        """
+        Send a transition event to every observer. Observer errors are logged, not raised.
+        """
+        from_state = previous_state.name if previous_state else None
+        timestamp = time.monotonic()
+        for observer in self.observers:
+            try:
+                observer(self.node, from_state, state_name, reason, timestamp)
+            except Exception as e:
+                logging.getLogger("error_logger").error(
+                    "Error: Transition observer %r failed: %s", observer, e
+                )
 
     def validate_task_processing(self):
         """
         Validate if the task can be processed in the current state.
         Throws an exception if the state does not allow processing.
         """
-        if not self.current_state or not self.current_state.can_process_task():
+        if not self.current_state or not self.current_state.allows_processing:
+            state_name = self.current_state.name if self.current_state else None
             raise InvalidStateException(
-                f"Cannot process task in state '{self.current_state.name}'."
+                f"Cannot process task in state '{state_name}'."
             )
 
     def resolve_error(self):
         """
         Attempt to resolve the error and transition to a valid state.
         """
-        if isinstance(self.current_state, ErrorState):
-            print("Attempting to resolve error state.")  # Replace with logging
+        if self.current_state is ERROR:
             self.transition_to("ready", "Error resolved.")
-        else:
-            print("No error state to resolve.")  # Replace with logging
 
-    def set_state(self, state_name):
+    def set_state(self, state_name, reason="State set directly."):
         """
         Set the current state without checks (internal use only).
         """
-        if state_name not in self.states:
+        state = self.states.get(state_name)
+        if state is None:
             raise ValueError(f"State '{state_name}' is not recognized.")
-        self.current_state = self.states[state_name]
+        previous_state = self.current_state
+        self.current_state = state
+        if self.observers and previous_state is not self.current_state:
+            self.notify_observers(previous_state, state_name, reason)
 
     def get_state(self):
         """
         Get the current state.
         """
         return self.current_state
+
+    def handle_task(self):
+        """
+        Delegate task handling to the current state.
+        """
+        if self.current_state is None:
+            self.update_state()
+        return self.current_state.handle_task(self)
@@ -0,0 +1,206 @@
+import asyncio
+import atexit
+import multiprocessing
+import pickle
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor, wait
+from multiprocessing import resource_tracker, shared_memory
+
+from src.shared import config
+from src.shared.MessageCodec import TYPE_TAGS, decode_messages, encode_messages
+
+
+class WireMessage:
+    """
+    A node message shipped to a worker in the binary batch format instead of pickled.
+    """
+
+    __slots__ = ("data",)
+
+    def __init__(self, message):
+        self.data = encode_messages([message])
+
+    def __getstate__(self):
+        return self.data
+
+    def __setstate__(self, data):
+        self.data = data
+
+    def decode(self):
+        return decode_messages(self.data)[0]
+
+
+class SharedResult:
+    """
+    Handle to a pickled result a worker left in a shared memory block.
+    """
+
+    __slots__ = ("name", "size")
+
+    def __init__(self, name, size):
+        self.name = name
+        self.size = size
+
+    def __getstate__(self):
+        return (self.name, self.size)
+
+    def __setstate__(self, state):
+        self.name, self.size = state
+
+    def load(self):
+        """Unpickle the result and release the shared memory block."""
+        block = shared_memory.SharedMemory(name=self.name)
+        try:
+            return pickle.loads(block.buf[: self.size])
+        finally:
+            block.close()
+            block.unlink()
+
+
+def pack_args(args):
+    """Replace node messages with their compact wire form."""
+    return tuple(WireMessage(arg) if type(arg) in TYPE_TAGS else arg for arg in args)
+
+
+def unpack_args(args):
+    """Decode wire messages back into node messages (runs in the worker)."""
+    return tuple(arg.decode() if isinstance(arg, WireMessage) else arg for arg in args)
+
+
+def run_in_worker(func, args, shared_memory_threshold):
+    """
+    Worker entry point: call func(*args) and return its result, moving results of at
+    least shared_memory_threshold pickled bytes into shared memory.
+    """
+    result = func(*unpack_args(args))
+    if shared_memory_threshold is None:
+        return result
+    data = pickle.dumps(result, protocol=pickle.HIGHEST_PROTOCOL)
+    if len(data) < shared_memory_threshold:
+        return result
+    block = shared_memory.SharedMemory(create=True, size=len(data))
+    try:
+        block.buf[: len(data)] = data
+    finally:
+        block.close()
+    # The parent unlinks the block once it has read it
+    resource_tracker.unregister(block._name, "shared_memory")
+    return SharedResult(block.name, len(data))
+
+
+def warm_up_worker():
+    """
+    Near no-op task used to start worker processes ahead of real work. The short
+    sleep keeps one worker from taking every warm-up task while others still boot.
+    """
+    time.sleep(0.01)
+    return multiprocessing.current_process().pid
+
+
+class WorkerPool:
+    """
+    Long-lived process pool for CPU-bound node work that would otherwise be
+    serialized by the GIL. Functions must be importable (defined at module level).
+    """
+
+    def __init__(
+        self,
+        max_workers=None,
+        shared_memory_threshold=config.WORKER_SHARED_MEMORY_THRESHOLD,
+        mp_context=None,
+        initializer=None,
+        initargs=(),
+    ):
+        """
+        :param max_workers: Number of worker processes (defaults to the CPU count).
+        :param shared_memory_threshold: Pickled result size in bytes from which results
+            are returned through shared memory; None always uses the result pipe.
+        :param mp_context: multiprocessing context or start method name.
+        :param initializer: Optional callable run once in each worker, e.g. to load models.
+        """
+        if isinstance(mp_context, str):
+            mp_context = multiprocessing.get_context(mp_context)
+        self.max_workers = (
+            max_workers or config.WORKER_POOL_SIZE or multiprocessing.cpu_count()
+        )
+        self.shared_memory_threshold = shared_memory_threshold
+        self.executor = ProcessPoolExecutor(
+            max_workers=self.max_workers,
+            mp_context=mp_context,
+            initializer=initializer,
+            initargs=initargs,
+        )
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.shutdown()
+
+    def warm_up(self):
+        """
+        Start every worker process now so the first tasks do not pay the spawn cost.
+        :return: Set of PIDs of the workers that ran a warm-up task.
+        """
+        futures = [
+            self.executor.submit(warm_up_worker) for _ in range(self.max_workers)
+        ]
+        wait(futures)
+        return {future.result() for future in futures}
+
+    def submit(self, func, *args):
+        """
+        Run func(*args) in a worker process.
+        Node messages among args are shipped in the binary batch format.
+        :return: concurrent.futures.Future resolving to func's result.
+        """
+        inner = self.executor.submit(
+            run_in_worker, func, pack_args(args), self.shared_memory_threshold
+        )
+        outer = Future()
+
+        def relay(done):
+            if done.cancelled():
+                outer.cancel()
+                outer.set_running_or_notify_cancel()
+                return
+            try:
+                result = done.result()
+                if isinstance(result, SharedResult):
+                    result = result.load()
+            except BaseException as e:
+                outer.set_exception(e)
+            else:
+                outer.set_result(result)
+
+        inner.add_done_callback(relay)
+        return outer
+
+    def run(self, func, *args):
+        """Run func(*args) in a worker process and wait for its result."""
+        return self.submit(func, *args).result()
+
+    async def arun(self, func, *args):
+        """Run func(*args) in a worker process without blocking the event loop."""
+        return await asyncio.wrap_future(self.submit(func, *args))
+
+    def shutdown(self, wait=True):
+        """Stop the worker processes."""
+        self.executor.shutdown(wait=wait, cancel_futures=True)
+
+
+_default_pool = None
+_default_pool_lock = threading.Lock()
+
+
+def get_default_worker_pool():
+    """
+    Return the shared worker pool, starting it on first use.
+    """
+    global _default_pool
+    with _default_pool_lock:
+        if _default_pool is None:
+            _default_pool = WorkerPool(mp_context=config.WORKER_START_METHOD)
+            atexit.register(_default_pool.shutdown)
+    return _default_pool
@@ -0,0 +1,226 @@
+import json
+import os
+import threading
+from collections import Counter
+
+
+class WorkflowState:
+    """
+    Thread-safe store for workflow node state ({"nodes": {name: {"status": ...}}}).
+    Status changes are atomic, per-status counts are kept incrementally, and
+    subscribers are told about every status change.
+    Wrapping an existing state dict writes through to it, so code reading
+    state["nodes"] directly keeps working. With a journal attached (see
+    CheckpointJournal) every node change is logged as it is applied.
+    """
+
+    def __init__(self, data=None):
+        self.data = data if data is not None else {}
+        self.nodes = self.data.setdefault("nodes", {})
+        self.counts = Counter(node.get("status") for node in self.nodes.values())
+        self.version = 0  # Incremented on every change
+        self.observers = ()
+        self.journal = None  # CheckpointJournal logging node changes, if any
+        self._lock = threading.RLock()
+
+    def __getitem__(self, key):
+        return self.data[key]
+
+    def __contains__(self, key):
+        return key in self.data
+
+    def get(self, key, default=None):
+        """Read a top-level value such as "total_tasks" or "progress"."""
+        return self.data.get(key, default)
+
+    def set(self, key, value):
+        """Set a top-level value."""
+        with self._lock:
+            self.data[key] = value
+            self.version += 1
+
+    def __len__(self):
+        return len(self.nodes)
+
+    def subscribe(self, observer):
+        """
+        Call observer(name, old_status, new_status, fields) after each status change.
+        Observers run on the thread that made the change, outside the store's lock.
+        """
+        with self._lock:
+            self.observers = self.observers + (observer,)
+
+    def unsubscribe(self, observer):
+        """Stop notifying an observer."""
+        with self._lock:
+            self.observers = tuple(o for o in self.observers if o != observer)
+
+    def ensure_node(self, name, **fields):
+        """
+        Add a node if it does not exist yet, with the given initial fields. Observers
+        are told about the new node as a change from status None.
+        """
+        with self._lock:
+            if name in self.nodes:
+                return
+            self.nodes[name] = dict(fields)
+            self.counts[fields.get("status")] += 1
+            self.version += 1
+            self._log(name, fields, fields.get("status"))
+        self._notify(name, None, fields.get("status"), fields)
+
+    def get_node(self, name):
+        """Return a copy of a node's fields, or None."""
+        with self._lock:
+            node = self.nodes.get(name)
+            return dict(node) if node is not None else None
+
+    def get_status(self, name):
+        """Return a node's status, or None."""
+        node = self.nodes.get(name)
+        return node.get("status") if node is not None else None
+
+    def set_status(self, name, status, **fields):
+        """
+        Set a node's status (and any other fields) unconditionally.
+        :return: The previous status.
+        """
+        with self._lock:
+            previous = self._write(name, status, fields)
+        self._notify(name, previous, status, fields)
+        return previous
+
+    def compare_and_set(self, name, expected, status, **fields):
+        """
+        Set a node's status only if it currently has one of the expected statuses.
+        :param expected: A status, or a tuple/set/frozenset of statuses.
+        :return: True if the status was changed.
+        """
+        if not isinstance(expected, (tuple, set, frozenset)):
+            expected = (expected,)
+        with self._lock:
+            if self.get_status(name) not in expected:
+                return False
+            previous = self._write(name, status, fields)
+        self._notify(name, previous, status, fields)
+        return True
+
+    def update_node(self, name, **fields):
+        """Update non-status fields of a node."""
+        if "status" in fields:
+            raise ValueError("Use set_status() or compare_and_set() to change status.")
+        with self._lock:
+            self.nodes.setdefault(name, {}).update(fields)
+            self.version += 1
+            self._log(name, fields, has_status=False)
+
+    def restore(self, nodes):
+        """
+        Merge node fields (e.g. recovered from a checkpoint) into the store without
+        journalling. Observers are told about added nodes and changed statuses.
+        """
+        changes = []
+        with self._lock:
+            for name, fields in nodes.items():
+                node = self.nodes.get(name)
+                added = node is None
+                if added:
+                    node = self.nodes[name] = {}
+                    previous = None
+                else:
+                    previous = node.get("status")
+                    self.counts[previous] -= 1
+                node.update(fields)
+                status = node.get("status")
+                self.counts[status] += 1
+                if added or status != previous:
+                    changes.append((name, previous, status, fields))
+            self.version += 1
+        for change in changes:
+            self._notify(*change)
+
+    def checkpoint(self):
+        """Compact the attached journal into a snapshot of the current nodes."""
+        with self._lock:
+            if self.journal is not None:
+                self.journal.compact(self.snapshot()["nodes"])
+
+    def get_count(self, status):
+        """Number of nodes with a status, in O(1)."""
+        return self.counts[status]
+
+    def get_counts(self):
+        """Return a copy of the per-status node counts."""
+        with self._lock:
+            return {status: count for status, count in self.counts.items() if count}
+
+    def snapshot(self):
+        """
+        Return a consistent copy of the state, including its version.
+        """
+        with self._lock:
+            data = {key: value for key, value in self.data.items() if key != "nodes"}
+            data["nodes"] = {name: dict(node) for name, node in self.nodes.items()}
+            data["version"] = self.version
+            return data
+
+    def save_snapshot(self, path):
+        """
+        Atomically write a JSON snapshot to path.
+        """
+        temp_path = f"{path}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as handle:
+            json.dump(self.snapshot(), handle, default=str)
+        os.replace(temp_path, path)
+
+    @classmethod
+    def load_snapshot(cls, path):
+        """
+        Create a store from a snapshot written by save_snapshot().
+        """
+        with open(path, encoding="utf-8") as handle:
+            data = json.load(handle)
+        version = data.pop("version", 0)
+        store = cls(data)
+        store.version = version
+        return store
+
+    def _write(self, name, status, fields):
+        """Apply a status change and return the previous status. Caller holds the lock."""
+        node = self.nodes.get(name)
+        if node is None:
+            node = self.nodes[name] = {}
+            previous = None
+        else:
+            previous = node.get("status")
+            self.counts[previous] -= 1
+        node.update(fields)
+        node["status"] = status
+        self.counts[status] += 1
+        self.version += 1
+        self._log(name, fields, status)
+        return previous
+
+    def _log(self, name, fields, status=None, has_status=True):
+        """Journal a node change. Caller holds the lock."""
+        if self.journal is not None and self.journal.append(
+            name, fields, status, has_status
+        ):
+            self.journal.compact(self.snapshot()["nodes"])
+
+    def _notify(self, name, previous, status, fields):
+        for observer in self.observers:
+            observer(name, previous, status, fields)
+
+
+def as_workflow_state(state):
+    """
+    Return state as a WorkflowState, wrapping a plain state dict if needed.
+    """
+    if isinstance(state, WorkflowState):
+        return state
+    return WorkflowState(state)
+
+
+# Shared store for the task modules
+workflow_state = WorkflowState()
@@ -1,2 +1,71 @@
 # shared/config.py
+import os
+
 NODE_TIMEOUT_SECONDS = 5  # Set timeout duration for tasks
+ACTIVITY_LOG_CAPACITY = 1000  # Entries kept per node/orchestrator activity log
+
+# Model provider settings
+MODEL_API_BASE_URL = os.environ.get("MODEL_API_BASE_URL")  # e.g. http://localhost:8000/v1
+MODEL_API_KEY = os.environ.get("OPENAI_API_KEY")
+DEFAULT_MODEL = "gpt-4o-mini"
+DEFAULT_PROVIDER = "openai"
+
+# Maximum in-flight model requests per provider (per event loop)
+DEFAULT_PROVIDER_MAX_CONCURRENCY = 64
+PROVIDER_MAX_CONCURRENCY = {}  # Per-provider overrides, e.g. {"openai": 128}
+
+# Request rate limits per provider and API key, as (requests per second, burst)
+DEFAULT_PROVIDER_RATE_LIMIT = None  # None is unlimited
+PROVIDER_RATE_LIMITS = {}  # Per-provider overrides, e.g. {"openai": (50, 100)}
+MODEL_CLIENT_MAX_IDLE_CONNECTIONS = 32  # Keep-alive connections per client per loop
+
+# Retries of failed model requests
+MODEL_MAX_RETRIES = 3  # Per request
+MODEL_RETRY_BASE_DELAY = 0.5  # Backoff ceiling for the first retry, doubled each time
+MODEL_RETRY_MAX_DELAY = 30
+RETRY_BUDGET_RATIO = 0.2  # Retries allowed per request, across all nodes
+RETRY_BUDGET_MIN_PER_SECOND = 10  # Retries allowed regardless of traffic
+RETRY_BUDGET_WINDOW_SECONDS = 10
+
+# Circuit breakers for nodes and providers
+CIRCUIT_FAILURE_RATE_THRESHOLD = 0.5  # Failure share of the window that opens a breaker
+CIRCUIT_LATENCY_PERCENTILE = 0.95  # Percentile checked against latency thresholds and used as the hedging deadline
+CIRCUIT_WINDOW_SIZE = 20  # Most recent calls considered
+CIRCUIT_MIN_CALLS = 10  # Calls needed before a breaker can open
+CIRCUIT_OPEN_SECONDS = 5  # Time open before trial calls are allowed
+CIRCUIT_HALF_OPEN_MAX_CALLS = 1  # Trial calls that must succeed to close again
+
+# Process pool for CPU-bound node work
+WORKER_POOL_SIZE = None  # Worker processes; None uses the CPU count
+WORKER_START_METHOD = None  # multiprocessing start method; None uses the platform default
+WORKER_SHARED_MEMORY_THRESHOLD = 64 * 1024  # Results this large return via shared memory
+
+# Work stealing between teams
+WORK_STEAL_MIN_QUEUE_DEPTH = 2  # Queued tasks a team keeps from stealing (locality)
+
+# Teams served from worker processes or other hosts
+TEAM_RPC_START_TIMEOUT = 30  # Seconds a spawned team may take to start serving
+TEAM_RPC_STOP_TIMEOUT = 5  # Seconds a spawned team may take to exit after shutdown
+
+# Model response cache
+RESPONSE_CACHE_ENABLED = os.environ.get("RESPONSE_CACHE_ENABLED") == "1"  # Opt in
+RESPONSE_CACHE_PATH = os.environ.get("RESPONSE_CACHE_PATH")  # SQLite file; None is memory only
+RESPONSE_CACHE_MAX_ENTRIES = 1024  # In-memory LRU entries
+RESPONSE_CACHE_TTL_SECONDS = 24 * 60 * 60
+RESPONSE_CACHE_MAX_DISK_BYTES = 256 * 1024 * 1024
+RESPONSE_CACHE_ACCESS_FLUSH_SIZE = 256  # Disk hits whose access times are written together
+RESPONSE_CACHE_DISK_LOW_WATER = 0.9  # Full disk tiers are trimmed to this fraction
+RESPONSE_CACHE_EVICT_BATCH = 64  # Rows read per eviction query
+
+# Incremental re-execution of workflow graphs
+RESULT_STORE_MAX_ENTRIES = 4096  # Node results kept in memory
+RESULT_STORE_TTL_SECONDS = 7 * 24 * 60 * 60
+
+# Micro-batching of model requests
+MODEL_BATCH_MAX_SIZE = 16  # Prompts per batched request
+MODEL_BATCH_MAX_WAIT_MS = 10  # Longest a prompt waits for a batch to fill
+
+# Workflow checkpoint journal
+CHECKPOINT_FSYNC_INTERVAL = 0.05  # Longest time a journal record waits for fsync
+CHECKPOINT_FSYNC_BATCH = 64  # Records that trigger an immediate fsync
+CHECKPOINT_COMPACT_EVERY = 10_000  # Records between snapshots
@@ -0,0 +1,216 @@
+# shared/dispatch.py
+import random
+import threading
+import time
+
+DEFAULT_LATENCY_SECONDS = 1.0  # Assumed latency before anything has been observed
+LATENCY_SMOOTHING = 0.2  # EWMA weight of each new latency sample
+
+
+class Candidate:
+    """
+    Load snapshot of a dispatch target (a node or a team) at decision time.
+    Lower priority numbers are favoured, matching AI_Node.priority.
+    """
+
+    __slots__ = ("target_id", "priority", "outstanding", "latency")
+
+    def __init__(self, target_id, priority=1, outstanding=0, latency=None):
+        self.target_id = target_id
+        self.priority = priority
+        self.outstanding = outstanding
+        self.latency = DEFAULT_LATENCY_SECONDS if latency is None else latency
+
+    def get_expected_work(self):
+        """Seconds of work queued ahead of a new task, including the task itself."""
+        return (self.outstanding + 1) * self.latency
+
+    def __repr__(self):
+        return (
+            f"Candidate({self.target_id!r}, priority={self.priority}, "
+            f"outstanding={self.outstanding}, latency={self.latency:.3f})"
+        )
+
+
+class LoadTracker:
+    """
+    Thread-safe record of outstanding tasks and EWMA latency per target.
+    Targets that have not completed anything yet are assumed to be as fast as the
+    observed average, so new nodes are neither starved nor flooded.
+    """
+
+    def __init__(self, smoothing=LATENCY_SMOOTHING):
+        self.smoothing = smoothing
+        self.outstanding = {}  # target_id -> tasks dispatched but not finished
+        self.latency = {}  # target_id -> EWMA of observed latency in seconds
+        self._latency_total = 0.0
+        self._lock = threading.Lock()
+
+    def start(self, target_id):
+        """Record a dispatch and return its start time for finish()."""
+        with self._lock:
+            self.outstanding[target_id] = self.outstanding.get(target_id, 0) + 1
+        return time.monotonic()
+
+    def finish(self, target_id, started_at=None, latency=None):
+        """
+        Record a completed task.
+        :param started_at: Value returned by start(); used when latency is not given.
+        :param latency: Observed latency in seconds.
+        """
+        if latency is None and started_at is not None:
+            latency = time.monotonic() - started_at
+        with self._lock:
+            count = self.outstanding.get(target_id, 0)
+            if count > 1:
+                self.outstanding[target_id] = count - 1
+            else:
+                self.outstanding.pop(target_id, None)
+            if latency is None:
+                return
+            previous = self.latency.get(target_id)
+            updated = (
+                latency
+                if previous is None
+                else previous + self.smoothing * (latency - previous)
+            )
+            self.latency[target_id] = updated
+            self._latency_total += updated - (previous or 0.0)
+
+    def get_outstanding(self, target_id=None):
+        """Outstanding tasks for a target, or across all targets."""
+        with self._lock:
+            if target_id is None:
+                return sum(self.outstanding.values())
+            return self.outstanding.get(target_id, 0)
+
+    def get_latency(self, target_id=None):
+        """EWMA latency of a target, or the mean across targets (None if unobserved)."""
+        with self._lock:
+            return self._get_latency(target_id)
+
+    def get_candidate(self, target_id, priority=1):
+        """Build the Candidate a dispatch policy sees for a target."""
+        with self._lock:
+            return Candidate(
+                target_id,
+                priority,
+                self.outstanding.get(target_id, 0),
+                self._get_latency(target_id),
+            )
+
+    def snapshot(self):
+        """
+        Return a copy of the per-target load.
+        """
+        with self._lock:
+            return {
+                "outstanding": dict(self.outstanding),
+                "latency": dict(self.latency),
+            }
+
+    def _get_latency(self, target_id):
+        """Caller holds the lock."""
+        latency = self.latency.get(target_id) if target_id is not None else None
+        if latency is None and self.latency:
+            latency = self._latency_total / len(self.latency)
+        return latency
+
+
+def get_least_loaded(candidates):
+    """Return the candidate with the least expected work, breaking ties by priority."""
+    return min(
+        candidates,
+        key=lambda candidate: (candidate.get_expected_work(), candidate.priority),
+    )
+
+
+class DispatchPolicy:
+    """
+    Chooses one of several candidates for a task. Subclasses implement select().
+    """
+
+    name = None
+
+    def select(self, candidates):
+        """
+        Pick a candidate.
+        :param candidates: Non-empty sequence of Candidate instances.
+        :return: The chosen Candidate.
+        """
+        raise NotImplementedError("Subclasses must implement select().")
+
+
+class LeastOutstandingWorkPolicy(DispatchPolicy):
+    """
+    Send the task where the least work is queued (outstanding tasks x observed latency),
+    breaking ties by priority.
+    """
+
+    name = "least_outstanding"
+
+    def select(self, candidates):
+        return get_least_loaded(candidates)
+
+
+class PowerOfTwoChoicesPolicy(DispatchPolicy):
+    """
+    Sample two candidates at random and keep the one with less outstanding work.
+    Spreads load almost as well as a full scan without every dispatcher herding onto
+    the same momentarily-idle target.
+    """
+
+    name = "power_of_two"
+
+    def __init__(self, seed=None):
+        self.random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def select(self, candidates):
+        if len(candidates) > 2:
+            with self._lock:
+                candidates = self.random.sample(candidates, 2)
+        return get_least_loaded(candidates)
+
+
+class WeightedPriorityPolicy(DispatchPolicy):
+    """
+    Least outstanding work, scaled by priority: a priority-2 target is chosen over a
+    priority-1 target only once the latter has twice as much work queued.
+    """
+
+    name = "weighted_priority"
+
+    def select(self, candidates):
+        return min(
+            candidates,
+            key=lambda candidate: (
+                candidate.get_expected_work() * candidate.priority,
+                candidate.priority,
+            ),
+        )
+
+
+DISPATCH_POLICIES = {
+    policy.name: policy
+    for policy in (
+        LeastOutstandingWorkPolicy,
+        PowerOfTwoChoicesPolicy,
+        WeightedPriorityPolicy,
+    )
+}
+
+
+def get_dispatch_policy(policy):
+    """
+    Resolve a dispatch policy.
+    :param policy: None, a DispatchPolicy instance, or the name of a built-in policy
+        ("least_outstanding", "power_of_two" or "weighted_priority").
+    :return: A DispatchPolicy instance, or None.
+    :raises ValueError: If the name is unknown.
+    """
+    if policy is None or isinstance(policy, DispatchPolicy):
+        return policy
+    if policy not in DISPATCH_POLICIES:
+        raise ValueError(f"Unknown dispatch policy: {policy}")
+    return DISPATCH_POLICIES[policy]()
@@ -0,0 +1,170 @@
+import asyncio
+import hashlib
+import json
+
+from src.shared import config
+from src.shared.NodeRegistry import get_dependency_id
+from src.shared.ResponseCache import ResponseCache, make_cache_key
+from src.shared.parallel_execution import find_cycle
+from src.shared.utils import DependencyCycleError, get_current_timestamp, run_sync
+
+
+def fingerprint_output(output):
+    """SHA-256 of a node's output; dependents only go stale when it changes."""
+    canonical = json.dumps(output, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def make_node_fingerprint(node, prompt, dependency_fingerprints):
+    """
+    Key a node's result by what determines it: the node type, task, generated prompt,
+    model (for model-backed nodes) and the output fingerprints of its dependencies.
+    :param dependency_fingerprints: Mapping of dependency ID -> output fingerprint.
+    """
+    return make_cache_key(
+        getattr(node, "model", None),
+        prompt,
+        node_type=type(node).__name__,
+        task=node.task,
+        dependencies=sorted(dependency_fingerprints.items()),
+    )
+
+
+class IncrementalExecutor:
+    """
+    Build-system-style runner for a graph of nodes. Each node's result is stored
+    under make_node_fingerprint(); on later runs a node whose fingerprint is
+    unchanged is served from the result store, so a changed task or prompt only
+    re-executes the nodes downstream of it. A re-executed node whose output comes
+    out identical does not invalidate its dependents.
+    """
+
+    def __init__(self, result_store=None, max_concurrency=None):
+        """
+        :param result_store: ResponseCache holding results; pass one with a path to
+            keep results between processes.
+        :param max_concurrency: Most nodes executing at once; None is unbounded.
+        """
+        if result_store is None:
+            result_store = ResponseCache(
+                max_entries=config.RESULT_STORE_MAX_ENTRIES,
+                ttl=config.RESULT_STORE_TTL_SECONDS,
+            )
+        self.result_store = result_store
+        self.max_concurrency = max_concurrency
+        self.executed = []  # Node IDs executed in the last run
+        self.reused = []  # Node IDs served from the result store in the last run
+
+    def run(self, nodes):
+        """Synchronous wrapper over arun()."""
+        return run_sync(self.arun(nodes))
+
+    async def arun(self, nodes):
+        """
+        Bring every node's output up to date, executing nodes as their dependencies
+        finish. Dependents of a failed node are skipped.
+        :param nodes: Nodes with a task; dependencies outside this set are ignored.
+        :return: Mapping of node ID -> response.
+        :raises DependencyCycleError: If the nodes' dependencies form a cycle.
+        """
+        nodes = {node.node_id: node for node in nodes}
+        dependencies = {
+            node_id: [
+                dep_id
+                for dep_id in map(get_dependency_id, node.dependencies)
+                if dep_id in nodes
+            ]
+            for node_id, node in nodes.items()
+        }
+        dependents = {node_id: [] for node_id in nodes}
+        in_degree = {node_id: len(deps) for node_id, deps in dependencies.items()}
+        for node_id, deps in dependencies.items():
+            for dep_id in deps:
+                dependents[dep_id].append(node_id)
+        cycle = find_cycle(dependents, in_degree)
+        if cycle:
+            raise DependencyCycleError(f"Dependency cycle detected between: {cycle}")
+
+        self.executed, self.reused = [], []
+        responses = {}
+        output_fingerprints = {}
+        semaphore = asyncio.Semaphore(self.max_concurrency or len(nodes) or 1)
+
+        async def bring_up_to_date(node_id):
+            async with semaphore:
+                node = nodes[node_id]
+                fingerprints = {
+                    dep_id: output_fingerprints[dep_id]
+                    for dep_id in dependencies[node_id]
+                }
+                return await self.aupdate_node(node, fingerprints)
+
+        ready = [node_id for node_id, degree in in_degree.items() if degree == 0]
+        running = {}
+        while ready or running:
+            for node_id in ready:
+                running[asyncio.ensure_future(bring_up_to_date(node_id))] = node_id
+            ready = []
+            done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+            for future in done:
+                node_id = running.pop(future)
+                response, output_fingerprint = future.result()
+                responses[node_id] = response
+                if response["status"] != "success":
+                    self._skip_dependents(node_id, dependents, responses)
+                    continue
+                output_fingerprints[node_id] = output_fingerprint
+                for child in dependents[node_id]:
+                    in_degree[child] -= 1
+                    if in_degree[child] == 0 and child not in responses:
+                        ready.append(child)
+        return responses
+
+    async def aupdate_node(self, node, dependency_fingerprints):
+        """
+        Serve a node's result from the store if its fingerprint is known, otherwise
+        execute it and store the result.
+        :return: (response, output fingerprint)
+        """
+        try:
+            prompt = node.generate_task_prompt()
+            key = make_node_fingerprint(node, prompt, dependency_fingerprints)
+            stored = await self.result_store.aget(key)
+            if stored is not None:
+                self.reused.append(node.node_id)
+                response = {
+                    "status": "success",
+                    "node_id": node.node_id,
+                    "task": node.task,
+                    "output": stored["output"],
+                    "timestamp": get_current_timestamp(),
+                    "cached": True,
+                }
+                return response, stored["fingerprint"]
+
+            circuit_open = node.get_circuit_open_response()
+            if circuit_open is not None:
+                return circuit_open, None
+            self.executed.append(node.node_id)
+            output = await node.aexecute_guarded(prompt)
+        except Exception as e:
+            response = node.record_failure(e)
+            response["node_id"] = node.node_id
+            return response, None
+        output_fingerprint = fingerprint_output(output)
+        stored = {"output": output, "fingerprint": output_fingerprint}
+        await self.result_store.aset(key, stored)
+        return node.record_output(output), output_fingerprint
+
+    def _skip_dependents(self, node_id, dependents, responses):
+        stack = list(dependents[node_id])
+        while stack:
+            child = stack.pop()
+            if child in responses:
+                continue
+            responses[child] = {
+                "status": "skipped",
+                "node_id": child,
+                "message": f"Dependency {node_id} failed.",
+            }
+            stack.extend(dependents[child])
@@ -1,17 +1,39 @@
+import atexit
 import logging
 import logging.config
+import queue
 import threading  # For explicit locking if needed
 from src.shared.utils import get_current_timestamp
 
-# Global lock for logging operations
+# Global lock for logging configuration (never taken when logging a record)
 _logger_lock = threading.Lock()
 
+# Defaults for the queue-based (async) logging mode
+DEFAULT_LOG_QUEUE_SIZE = 10000
+DEFAULT_LOG_BATCH_SIZE = 256
+DEFAULT_LOG_FLUSH_INTERVAL = 0.05  # Seconds the writer waits for records between stop checks
+DEFAULT_LOG_BLOCK_TIMEOUT = 0.1  # Seconds a "block" overflow waits before dropping
 
-def configure_logging():
+_MANAGED_LOGGERS = ["default", "debugger", "error_logger", ""]
+
+_log_writer = None
+
+
+def configure_logging(
+    async_logging=False,
+    queue_size=DEFAULT_LOG_QUEUE_SIZE,
+    overflow="drop",
+    batch_size=DEFAULT_LOG_BATCH_SIZE,
+):
     """
     Configures the logging system for the application.
+    :param async_logging: Route records through a bounded queue drained by a background writer.
+    :param queue_size: Maximum number of records buffered in async mode.
+    :param overflow: "drop" to discard records when the buffer is full, "block" to wait briefly first.
+    :param batch_size: Maximum number of records written per batch in async mode.
     """
     with _logger_lock:  # Ensure the configuration is thread-safe
+        _stop_log_writer()
         logging.config.dictConfig(
             {
                 "version": 1,
@@ -57,60 +79,275 @@ def configure_logging():
                 },
             }
         )
+        if async_logging:
+            _start_log_writer(queue_size, overflow, batch_size)
+
+
+def stop_async_logging():
+    """
+    Flush any queued records and restore the loggers' original handlers.
+    """
+    with _logger_lock:
+        _stop_log_writer()
+
+
+def get_dropped_log_count():
+    """
+    Returns the number of records dropped because the async log buffer was full.
+    """
+    return _log_writer.dropped if _log_writer else 0
+
+
+class BatchLogWriter:
+    """
+    Background writer that drains queued log records and writes them in batches.
+    """
+
+    def __init__(
+        self,
+        queue_size=DEFAULT_LOG_QUEUE_SIZE,
+        overflow="drop",
+        batch_size=DEFAULT_LOG_BATCH_SIZE,
+    ):
+        if overflow not in ("drop", "block"):
+            raise ValueError(f"Unknown log overflow policy: {overflow}")
+        self.buffer = queue.Queue(maxsize=queue_size)
+        self.queue_size = queue_size
+        self.overflow = overflow
+        self.batch_size = batch_size
+        self.dropped = 0  # Approximate under contention; never locked on the hot path
+        self.original_handlers = {}  # Logger name -> handlers replaced by the dispatcher
+        self._stopping = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run, name="log-writer", daemon=True
+        )
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        """Write all queued records and stop the writer thread."""
+        self._stopping.set()
+        self._thread.join()
+
+    def enqueue(self, record, handlers):
+        """
+        Queue a record for the given handlers without blocking on I/O. A full buffer
+        drops the record, after waiting up to DEFAULT_LOG_BLOCK_TIMEOUT for room
+        under the "block" policy.
+        """
+        try:
+            if self.overflow == "block":
+                self.buffer.put((record, handlers), timeout=DEFAULT_LOG_BLOCK_TIMEOUT)
+            else:
+                self.buffer.put_nowait((record, handlers))
+        except queue.Full:
+            self.dropped += 1
+
+    def _run(self):
+        while True:
+            try:
+                batch = [self.buffer.get(timeout=DEFAULT_LOG_FLUSH_INTERVAL)]
+            except queue.Empty:
+                if self._stopping.is_set():
+                    break
+                continue
+            try:
+                while len(batch) < self.batch_size:
+                    batch.append(self.buffer.get_nowait())
+            except queue.Empty:
+                pass
+            self._write_batch(batch)
+
+    def _write_batch(self, batch):
+        """Format each record once per handler and write one chunk per stream."""
+        chunks = {}
+        for record, handlers in batch:
+            for handler in handlers:
+                if record.levelno < handler.level or not handler.filter(record):
+                    continue
+                if isinstance(handler, logging.StreamHandler):
+                    try:
+                        text = handler.format(record) + handler.terminator
+                    except Exception:
+                        handler.handleError(record)
+                        continue
+                    chunks.setdefault(handler, []).append(text)
+                else:
+                    handler.handle(record)
+
+        for handler, lines in chunks.items():
+            with handler.lock:
+                try:
+                    handler.stream.write("".join(lines))
+                    handler.stream.flush()
+                except Exception:
+                    handler.handleError(batch[-1][0])
+
+
+class QueueDispatchHandler(logging.Handler):
+    """
+    Handler that hands records to the BatchLogWriter on behalf of a logger's real handlers.
+    The message is merged with its args before queueing, so later changes to mutable
+    args are not seen; the handlers' formatting is deferred to the writer thread.
+    """
+
+    def __init__(self, writer, handlers):
+        super().__init__()
+        self.writer = writer
+        self.handlers = handlers
+
+    def handle(self, record):
+        # The writer's buffer is thread-safe, so skip the per-handler lock.
+        self.emit(record)
+        return True
+
+    def emit(self, record):
+        if not any(record.levelno >= handler.level for handler in self.handlers):
+            return
+        try:
+            record = self.prepare(record)
+        except Exception:
+            self.handleError(record)
+            return
+        self.writer.enqueue(record, self.handlers)
+
+    def prepare(self, record):
+        """Render the message now, as logging.handlers.QueueHandler.prepare() does."""
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+
+def _start_log_writer(queue_size, overflow, batch_size):
+    """Swap each managed logger's handlers for a queue dispatcher."""
+    global _log_writer
+    writer = BatchLogWriter(queue_size, overflow, batch_size)
+    for name in _MANAGED_LOGGERS:
+        logger = logging.getLogger(name)
+        handlers = list(logger.handlers)
+        writer.original_handlers[name] = handlers
+        logger.handlers = [QueueDispatchHandler(writer, handlers)]
+    writer.start()
+    _log_writer = writer
+
+
+def _stop_log_writer():
+    """Drain the writer, if any, and reattach the original handlers."""
+    global _log_writer
+    writer, _log_writer = _log_writer, None
+    if writer is None:
+        return
+    for name, handlers in writer.original_handlers.items():
+        logging.getLogger(name).handlers = handlers
+    writer.stop()
+
+
+atexit.register(stop_async_logging)
+
+
+class LazyMessage:
+    """
+    Defers %-formatting of a message until its record passes the level checks and
+    is rendered or queued.
+    """
+
+    __slots__ = ("message", "args")
+
+    def __init__(self, message, args):
+        self.message = message
+        self.args = args
+
+    def __str__(self):
+        return str(self.message) % self.args
+
+
+def _lazy(message, args):
+    """Wrap a message in a LazyMessage only when it has args to format."""
+    return LazyMessage(message, args) if args else message
 
 
 class LoggerMixin:
     """
     Mixin class to provide pre-configured loggers and reusable logging methods.
+    Messages accept %-style args, which are only formatted if the record is written.
     """
 
+    __slots__ = ()
+
+    # Default loggers are shared class attributes rather than per-instance references
+    logger = logging.getLogger("default")
+    debugger = logging.getLogger("debugger")
+    error_logger = logging.getLogger("error_logger")
+
     def __init__(
         self,
         logger_name="default",
         debugger_name="debugger",
         error_logger_name="error_logger",
     ):
-        self.logger = logging.getLogger(logger_name)
-        self.debugger = logging.getLogger(debugger_name)
-        self.error_logger = logging.getLogger(error_logger_name)
+        # Only instances using non-default loggers need their own references
+        if logger_name != "default":
+            self.logger = logging.getLogger(logger_name)
+        if debugger_name != "debugger":
+            self.debugger = logging.getLogger(debugger_name)
+        if error_logger_name != "error_logger":
+            self.error_logger = logging.getLogger(error_logger_name)
 
-    def log_info(self, message):
+    def log_info(self, message, *args):
         """Log an informational event."""
-        with _logger_lock:
-            self.logger.info(message)
+        if self.logger.isEnabledFor(logging.INFO):
+            self.logger.info("%s", _lazy(message, args))
 
-    def log_error(self, message):
+    def log_error(self, message, *args):
         """Log an error event."""
-        with _logger_lock:
-            self.error_logger.error(f"Error: {message}")
+        if self.error_logger.isEnabledFor(logging.ERROR):
+            self.error_logger.error("Error: %s", _lazy(message, args))
 
-    def log_task_event(self, task_name, in_id=None, message=""):
+    def log_task_event(self, task_name, in_id=None, message="", *args):
         """Log a task-specific event."""
-        with _logger_lock:
-            log_message = f"[Task-{task_name} - {in_id}] {message}"
-            self.logger.info(log_message)
+        if self.logger.isEnabledFor(logging.INFO):
+            self.logger.info(
+                "[Task-%s - %s] %s", task_name, in_id, _lazy(message, args)
+            )
 
-    def log_node_event(self, node_name, in_id=None, message=""):
+    def log_node_event(self, node_name, in_id=None, message="", *args):
         """Log a node-specific event."""
-        with _logger_lock:
-            log_message = f"[Node-{node_name} - {in_id}] {message}"
-            self.logger.info(log_message)
+        if self.logger.isEnabledFor(logging.INFO):
+            self.logger.info(
+                "[Node-%s - %s] %s", node_name, in_id, _lazy(message, args)
+            )
 
-    def log_debugger(self, in_name, in_id=None, message=""):
+    def log_debugger(self, in_name, in_id=None, message="", *args):
         """Log a debugger-specific event."""
-        with _logger_lock:
-            log_message = f"[Node-{in_name} - {in_id}] {message}"
-            self.debugger.debug(log_message)
+        if self.debugger.isEnabledFor(logging.DEBUG):
+            self.debugger.debug(
+                "[Node-%s - %s] %s", in_name, in_id, _lazy(message, args)
+            )
 
-    def log_state_transition(self, in_name, from_state, to_state, in_id=None):
+    def log_state_transition(
+        self, in_name, from_state, to_state, in_id=None, reason=None
+    ):
         """Log state transitions with structured logging."""
-        with _logger_lock:
+        if self.debugger.isEnabledFor(logging.DEBUG):
             log_message = {
                 "event": "state_transition",
                 "from_state": str(from_state),
                 "to_state": str(to_state),
+                "reason": reason,
                 "timestamp": get_current_timestamp(),
                 "name": in_name,
                 "ID": in_id,
             }
             self.debugger.debug(log_message)
+
+
+def log_transition(node, from_state, to_state, reason, timestamp):
+    """
+    Transition observer that forwards events to the node's log_state_transition.
+    Register with add_transition_observer(log_transition) from src.shared.StateMachine.
+    """
+    if isinstance(node, LoggerMixin):
+        node.log_state_transition(
+            node.name, from_state, to_state, in_id=node.node_id, reason=reason
+        )
@@ -0,0 +1,38 @@
+# shared/metrics.py
+import threading
+from collections import Counter, defaultdict
+
+
+class TransitionMetrics:
+    """
+    Transition observer that counts state transitions and time spent in each state.
+    Register with add_transition_observer(metrics) from src.shared.StateMachine.
+    """
+
+    def __init__(self):
+        self.transition_counts = Counter()  # (from_state, to_state) -> count
+        self.time_in_state = defaultdict(float)  # state -> total seconds
+        self.entered_at = {}  # node_id -> (state, monotonic timestamp)
+        self._lock = threading.Lock()
+
+    def __call__(self, node, from_state, to_state, reason, timestamp):
+        node_id = getattr(node, "node_id", None)
+        with self._lock:
+            self.transition_counts[(from_state, to_state)] += 1
+            if node_id is None:
+                return
+            previous = self.entered_at.get(node_id)
+            if previous is not None:
+                state, entered = previous
+                self.time_in_state[state] += timestamp - entered
+            self.entered_at[node_id] = (to_state, timestamp)
+
+    def snapshot(self):
+        """
+        Return a copy of the collected metrics.
+        """
+        with self._lock:
+            return {
+                "transition_counts": dict(self.transition_counts),
+                "time_in_state": dict(self.time_in_state),
+            }
@@ -1,62 +1,252 @@
-import threading
-from logger_manager import log_node_event
-from shared.state import are_dependencies_completed
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 
-import threading
-from logger_manager import logger, log_event, log_error, log_task_event
+from src.shared.CheckpointJournal import CheckpointJournal
+from src.shared.WorkflowState import as_workflow_state
+from src.shared.logger_manager import LoggerMixin
+from src.shared.utils import DependencyCycleError
 
+# Default bounds for the DAG scheduler
+DEFAULT_MAX_WORKERS = 8
+DEFAULT_MAX_RETRIES = 2
 
-from logger_manager import logger, log_task_event, log_error
+# Statuses a task may hold while running; anything else was set by someone else
+RUNNING_STATUSES = ("In Progress", None)
 
+_log = LoggerMixin()
 
-def execute_in_parallel(tasks, state):
-    logger.info("Starting parallel execution of tasks.")
-    threads = []
 
+def build_dependency_graph(tasks, state, dependencies=None):
+    """
+    Build the dependency graph for a list of (task, args) pairs once.
+    :param tasks: List of (task, args) tuples, where args[1] is the node name.
+    :param state: Workflow state dictionary with a "nodes" mapping.
+    :param dependencies: Optional mapping of node name -> list of dependency names.
+        Falls back to state["nodes"][name]["dependencies"].
+    :return: Tuple of (task_map, dependents, in_degree, unmet), where unmet maps
+        node names to dependencies that can never be satisfied in this run.
+    """
+    task_map = {}
     for task, args in tasks:
-        node_name = args[1]
-        node_status = state["nodes"].get(node_name, {}).get("status", "Not Started")
+        task_map[args[1]] = (task, args)
 
-        if node_status in ["Completed", "In Progress"]:
-            log_task_event(node_name, f"Task already {node_status}. Skipping.")
-            continue
+    dependents = {name: [] for name in task_map}
+    in_degree = {name: 0 for name in task_map}
+    unmet = {}
 
-        if are_dependencies_completed(node_name):
-            log_task_event(node_name, "Dependencies met. Starting execution.")
-            state["nodes"][node_name]["status"] = "In Progress"
-            thread = threading.Thread(target=task_wrapper, args=(task, args, state))
-            threads.append(thread)
-            thread.start()
+    for name in task_map:
+        if dependencies is not None:
+            deps = dependencies.get(name, [])
         else:
-            log_task_event(node_name, "Skipping due to unmet dependencies.")
-            state["nodes"][node_name]["status"] = "Waiting for Dependencies"
-
-    for thread in threads:
-        thread.join()
-
-    remaining_tasks = [
-        (task, args)
-        for task, args in tasks
-        if state["nodes"][args[1]]["status"] != "Completed"
-    ]
-    if remaining_tasks:
-        logger.info("Some tasks remain incomplete. Re-executing remaining tasks.")
-        execute_in_parallel(remaining_tasks, state)
+            deps = state["nodes"].get(name, {}).get("dependencies", [])
+
+        for dep in deps:
+            if dep in task_map:
+                dependents[dep].append(name)
+                in_degree[name] += 1
+            elif state["nodes"].get(dep, {}).get("status") != "Completed":
+                unmet.setdefault(name, []).append(dep)
+
+    return task_map, dependents, in_degree, unmet
+
+
+def find_cycle(dependents, in_degree):
+    """
+    Detect a dependency cycle using Kahn's algorithm.
+    :return: Sorted list of node names involved in (or blocked by) a cycle, or an empty list.
+    """
+    remaining = dict(in_degree)
+    queue = deque(name for name, degree in remaining.items() if degree == 0)
+    visited = 0
+    while queue:
+        name = queue.popleft()
+        visited += 1
+        for child in dependents[name]:
+            remaining[child] -= 1
+            if remaining[child] == 0:
+                queue.append(child)
+
+    if visited == len(remaining):
+        return []
+    return sorted(name for name, degree in remaining.items() if degree > 0)
+
+
+def execute_in_parallel(
+    tasks,
+    state,
+    dependencies=None,
+    max_workers=DEFAULT_MAX_WORKERS,
+    max_retries=DEFAULT_MAX_RETRIES,
+    worker_pool=None,
+    checkpoint_dir=None,
+):
+    """
+    Execute tasks as a DAG on a bounded worker pool.
+
+    The dependency graph is built once. A task is dispatched as soon as its last
+    dependency completes, failed tasks are retried up to max_retries times, and
+    dependents of a task that ultimately fails are marked "Skipped".
+    :param tasks: List of (task, args) tuples, where args[1] is the node name.
+    :param state: WorkflowState, or a workflow state dictionary with a "nodes" mapping
+        (updated in place through a WorkflowState wrapper).
+    :param dependencies: Optional mapping of node name -> list of dependency names.
+    :param max_workers: Maximum number of tasks running at once.
+    :param max_retries: Number of retries allowed per task after the first failure.
+    :param worker_pool: Optional WorkerPool; tasks then run in its worker processes
+        and must be module-level functions with picklable arguments.
+    :param checkpoint_dir: Optional directory for a CheckpointJournal. State from an
+        earlier run is recovered from it first, so tasks it completed are skipped,
+        and every status change and output of this run is journalled.
+    :raises DependencyCycleError: If the dependency graph contains a cycle.
+    """
+    if checkpoint_dir is None:
+        return run_dag(tasks, state, dependencies, max_workers, max_retries, worker_pool)
+    with CheckpointJournal(checkpoint_dir) as journal:
+        store = journal.open(state)
+        return run_dag(tasks, store, dependencies, max_workers, max_retries, worker_pool)
+
+
+def run_dag(tasks, state, dependencies, max_workers, max_retries, worker_pool):
+    """Scheduler loop behind execute_in_parallel()."""
+    _log.log_info("Starting parallel execution of tasks.")
+    task_map, dependents, in_degree, unmet = build_dependency_graph(
+        tasks, state, dependencies
+    )
+
+    cycle = find_cycle(dependents, in_degree)
+    if cycle:
+        raise DependencyCycleError(f"Dependency cycle detected between: {cycle}")
+
+    store = as_workflow_state(state)
+    for name in task_map:
+        store.ensure_node(name)
+
+    ready = deque()
+    blocked = set()
+
+    def block_dependents(name, reason="failed"):
+        """
+        Mark every unfinished transitive dependent of a task that will not complete
+        as skipped. Completed dependents, such as ones recovered from a checkpoint,
+        keep their results and do not block their own dependents.
+        """
+        stack = list(dependents[name])
+        while stack:
+            child = stack.pop()
+            if child in blocked or store.get_status(child) == "Completed":
+                continue
+            blocked.add(child)
+            store.set_status(child, "Skipped")
+            _log.log_task_event(child, message=f"Skipping: dependency {name} {reason}.")
+            stack.extend(dependents[child])
+
+    def complete(name):
+        """Release dependents whose last dependency just finished."""
+        for child in dependents[name]:
+            in_degree[child] -= 1
+            if (
+                in_degree[child] == 0
+                and child not in blocked
+                and store.get_status(child) != "Completed"
+            ):
+                ready.append(child)
+
+    for name, deps in unmet.items():
+        if store.get_status(name) == "Completed":
+            continue
+        _log.log_task_event(name, message=f"Skipping due to unmet dependencies: {deps}")
+        store.set_status(name, "Waiting for Dependencies")
+        blocked.add(name)
+        block_dependents(name)
+
+    for name, degree in in_degree.items():
+        if (
+            degree == 0
+            and name not in blocked
+            and store.get_status(name) != "Completed"
+        ):
+            ready.append(name)
+    for name in task_map:
+        if store.get_status(name) == "Completed":
+            _log.log_task_event(name, message="Task already Completed. Skipping.")
+            complete(name)
+
+    attempts = {name: 0 for name in task_map}
+    running = {}
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        while ready or running:
+            while ready:
+                name = ready.popleft()
+                task, args = task_map[name]
+                attempts[name] += 1
+                store.set_status(name, "In Progress")
+                _log.log_task_event(name, message="Dependencies met. Starting execution.")
+                future = executor.submit(task_wrapper, task, args, store, worker_pool)
+                running[future] = name
+
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                name = running.pop(future)
+                result = future.result()
+                if result:
+                    complete(name)
+                elif result is None:
+                    block_dependents(name, reason="was taken over by another writer")
+                elif attempts[name] <= max_retries:
+                    _log.log_task_event(
+                        name, message=f"Retrying (attempt {attempts[name] + 1})."
+                    )
+                    ready.append(name)
+                else:
+                    _log.log_error(
+                        f"Task {name}: giving up after {attempts[name]} attempts."
+                    )
+                    block_dependents(name)
+
+    if all(store.get_status(name) == "Completed" for name in task_map):
+        _log.log_info("All tasks have been executed successfully.")
     else:
-        logger.info("All tasks have been executed successfully.")
+        _log.log_info("Parallel execution finished with incomplete tasks.")
 
 
-def task_wrapper(task, args, state):
+def task_wrapper(task, args, state, worker_pool=None):
+    """
+    Run a single task and record its status and output in the workflow state.
+    The result is only recorded if the node is still "In Progress" (or new), so a
+    task finishing late cannot overwrite a status set by someone else meanwhile.
+    :param state: WorkflowState or workflow state dictionary.
+    :param worker_pool: Optional WorkerPool to run the task in a worker process.
+    :return: True if the task completed, False if it raised, or None if another
+        writer changed the node's status while it ran, leaving the node to them.
+    """
     node_name = args[1]
+    store = as_workflow_state(state)
     try:
-        logger.info(f"Task {node_name}: Starting execution.")
-        output = task(*args)  # Call the actual task function
-        state["nodes"][node_name]["status"] = "Completed"
-        state["nodes"][node_name]["output"] = output
-        logger.info(
+        _log.log_info(f"Task {node_name}: Starting execution.")
+        if worker_pool is not None:
+            output = worker_pool.run(task, *args)
+        else:
+            output = task(*args)  # Call the actual task function
+        if not store.compare_and_set(
+            node_name, RUNNING_STATUSES, "Completed", output=output
+        ):
+            status = store.get_status(node_name)
+            if status == "Completed":
+                return True
+            _log.log_info(
+                f"Task {node_name}: Status changed to {status} while running; "
+                f"result dropped."
+            )
+            return None
+        _log.log_info(
             f"Task {node_name}: Execution completed successfully. Output: {output}"
         )
+        return True
     except Exception as e:
-        logger.error(f"Task {node_name}: Execution failed with error: {e}")
-        state["nodes"][node_name]["status"] = "Error"
-        state["nodes"][node_name]["output"] = None
+        _log.log_error(f"Task {node_name}: Execution failed with error: {e}")
+        if not store.compare_and_set(
+            node_name, RUNNING_STATUSES, "Error", output=None
+        ):
+            return None
+        return False
@@ -0,0 +1,142 @@
+# shared/rate_limiting.py
+import asyncio
+import random
+import threading
+import time
+from collections import deque
+
+from src.shared import config
+
+
+class TokenBucket:
+    """
+    Token-bucket rate limiter: refills at rate tokens per second up to capacity.
+    Callers that find the bucket empty reserve a future token and sleep until it is
+    due, so waiters are served in order. Safe to share between threads and loops.
+    """
+
+    def __init__(self, rate, capacity=None, clock=time.monotonic):
+        if rate <= 0:
+            raise ValueError("Token bucket rate must be > 0.")
+        self.rate = rate
+        self.capacity = capacity or rate
+        self.clock = clock
+        self.tokens = float(self.capacity)
+        self.updated_at = clock()
+        self._lock = threading.Lock()
+
+    def reserve(self, tokens=1):
+        """Take tokens, going into debt if needed. Returns the seconds to wait."""
+        with self._lock:
+            now = self.clock()
+            self.tokens = min(
+                self.capacity, self.tokens + (now - self.updated_at) * self.rate
+            )
+            self.updated_at = now
+            self.tokens -= tokens
+            return max(0.0, -self.tokens / self.rate)
+
+    async def acquire(self, tokens=1):
+        """Wait until tokens are available."""
+        delay = self.reserve(tokens)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+class RetryBudget:
+    """
+    Caps retries at ratio of the requests made in the last window seconds, plus
+    min_per_second retries that are always allowed. Shared by every node calling a
+    provider, so an outage cannot turn each failed request into several more.
+    """
+
+    def __init__(
+        self,
+        ratio=config.RETRY_BUDGET_RATIO,
+        min_per_second=config.RETRY_BUDGET_MIN_PER_SECOND,
+        window=config.RETRY_BUDGET_WINDOW_SECONDS,
+        clock=time.monotonic,
+    ):
+        self.ratio = ratio
+        self.min_per_second = min_per_second
+        self.window = window
+        self.clock = clock
+        self.requests = deque()  # Timestamps of first attempts in the window
+        self.retries = deque()  # Timestamps of retries in the window
+        self.rejected = 0
+        self._lock = threading.Lock()
+
+    def record_request(self):
+        with self._lock:
+            now = self.clock()
+            self._prune(now)
+            self.requests.append(now)
+
+    def try_retry(self):
+        """Spend one retry from the budget. Returns False if it is exhausted."""
+        with self._lock:
+            now = self.clock()
+            self._prune(now)
+            allowed = self.ratio * len(self.requests) + self.min_per_second * self.window
+            if len(self.retries) >= allowed:
+                self.rejected += 1
+                return False
+            self.retries.append(now)
+            return True
+
+    def get_stats(self):
+        with self._lock:
+            self._prune(self.clock())
+            return {
+                "requests": len(self.requests),
+                "retries": len(self.retries),
+                "rejected": self.rejected,
+            }
+
+    def _prune(self, now):
+        """Caller holds the lock."""
+        cutoff = now - self.window
+        for timestamps in (self.requests, self.retries):
+            while timestamps and timestamps[0] <= cutoff:
+                timestamps.popleft()
+
+
+class RetryPolicy:
+    """
+    Exponential backoff with full jitter, bounded by max_retries per request and by
+    a retry budget. Only errors marked retryable are retried; a provider's
+    Retry-After is honoured as a lower bound on the delay.
+    """
+
+    def __init__(
+        self,
+        max_retries=config.MODEL_MAX_RETRIES,
+        base_delay=config.MODEL_RETRY_BASE_DELAY,
+        max_delay=config.MODEL_RETRY_MAX_DELAY,
+        budget=None,
+        rng=None,
+    ):
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.budget = budget or RetryBudget()
+        self.rng = rng or random.Random()
+
+    def get_backoff(self, attempt):
+        """Random delay in [0, base_delay * 2**attempt], capped at max_delay."""
+        return self.rng.uniform(0, min(self.max_delay, self.base_delay * 2**attempt))
+
+    def get_retry_delay(self, error, attempt):
+        """
+        Return the seconds to wait before retrying after error, or None to give up.
+        :param attempt: Number of retries already made for this request.
+        """
+        if not getattr(error, "retryable", False) or attempt >= self.max_retries:
+            return None
+        if not self.budget.try_retry():
+            return None
+        delay = self.get_backoff(attempt)
+        retry_after = getattr(error, "retry_after", None)
+        if retry_after is not None:
+            delay = max(delay, min(retry_after, self.max_delay))
+        return delay
@@ -5,24 +5,28 @@ if TYPE_CHECKING:
 
 
 class BaseState:
-    def __init__(self, state_machine: "StateMachine"):
-        self.state_machine = state_machine
+    """
+    Stateless state definition. One interned instance per state is shared by every
+    StateMachine, so behaviour that needs the machine receives it as an argument.
+    """
 
-    @property
-    def name(self):
-        return self.__class__.__name__.replace("State", "").lower()
+    __slots__ = ()
+
+    name = "base"
+    allowed_transitions = frozenset()  # Define valid state transitions
+    allows_processing = False  # By default, processing is not allowed in states
 
     def can_transition_to(self, new_state: str) -> bool:
         """Define valid state transitions."""
-        return True  # Allow all transitions by default
+        return new_state in self.allowed_transitions
 
     def can_process_task(self):
         """Determine if the state allows task processing."""
-        return False  # By default, processing is not allowed in states
+        return self.allows_processing
 
-    def handle_task(self):
+    def handle_task(self, state_machine: "StateMachine"):
         """Default behavior for handling tasks in a state."""
-        self.state_machine.node.log_debugger(
+        state_machine.node.log_debugger(
             f"State '{self.name}' does not support task processing."
         )
         return {
@@ -30,24 +34,22 @@ class BaseState:
             "message": f"Task processing is not allowed in state '{self.name}'.",
         }
 
+    def __repr__(self):
+        return f"<{self.__class__.__name__}>"
+
 
 class WaitingState(BaseState):
-    def can_transition_to(self, new_state):
-        return new_state in ["ready", "processing", "error", "inactive"]
+    __slots__ = ()
 
-    def can_process_task(self):
-        """Waiting state does not allow task processing."""
-        return False
+    name = "waiting"
+    allowed_transitions = frozenset(["ready", "processing", "error", "inactive"])
+    allows_processing = False  # Waiting state does not allow task processing.
 
-    def handle_task(self):
+    def handle_task(self, state_machine):
         """Handle task logic for waiting state."""
-        unresolved_dependencies = [
-            dep
-            for dep in self.state_machine.node.dependencies
-            if not self.state_machine.node.check_dependency(dep)
-        ]
+        unresolved_dependencies = state_machine.node.get_unresolved_dependencies()
         if unresolved_dependencies:
-            self.state_machine.node.log_debugger(
+            state_machine.node.log_debugger(
                 f"Node is in 'waiting' state due to unresolved dependencies: {unresolved_dependencies}"
             )
             return {
@@ -56,7 +58,7 @@ class WaitingState(BaseState):
                 "unresolved_dependencies": unresolved_dependencies,
             }
         # If no dependencies are unresolved, update the state.
-        self.state_machine.update_state()
+        state_machine.update_state()
         return {
             "status": "state_updated",
             "message": "Dependencies resolved. State updated.",
@@ -64,64 +66,61 @@ class WaitingState(BaseState):
 
 
 class ReadyState(BaseState):
-    def can_transition_to(self, new_state):
-        return new_state in ["waiting", "processing", "error", "inactive"]
+    __slots__ = ()
 
-    def can_process_task(self):
-        """Ready state allows task processing."""
-        return True
+    name = "ready"
+    allowed_transitions = frozenset(["waiting", "processing", "error", "inactive"])
+    allows_processing = True  # Ready state allows task processing.
 
-    def handle_task(self):
+    def handle_task(self, state_machine):
         """Handle task logic for ready state."""
-        if not self.state_machine.node.task:
-            self.state_machine.node.log_debugger(
-                f"No task assigned for Node {self.state_machine.node.name} in 'ready' state."
+        if not state_machine.node.task:
+            state_machine.node.log_debugger(
+                f"No task assigned for Node {state_machine.node.name} in 'ready' state."
             )
-            self.state_machine.update_state()
+            state_machine.update_state()
             return {
                 "status": "no_task",
                 "message": "No task assigned. State re-evaluated.",
             }
         # Transition to processing if a task is available.
-        self.state_machine.set_state("processing")
-        return self.state_machine.node.process_task()
+        state_machine.set_state("processing")
+        return state_machine.node.process_task()
 
 
 class ProcessingState(BaseState):
-    def can_transition_to(self, new_state):
-        return new_state in ["waiting", "ready", "error", "inactive"]
+    __slots__ = ()
 
-    def can_process_task(self):
-        """Processing state allows task processing."""
-        return True
+    name = "processing"
+    allowed_transitions = frozenset(["waiting", "ready", "error", "inactive"])
+    allows_processing = True  # Processing state allows task processing.
 
-    def handle_task(self):
+    def handle_task(self, state_machine):
         """Handle task processing in processing state."""
-        if not self.state_machine.node.task:
-            self.state_machine.node.log_error(
-                f"No task assigned in 'processing' state for Node {self.state_machine.node.name}."
+        if not state_machine.node.task:
+            state_machine.node.log_error(
+                f"No task assigned in 'processing' state for Node {state_machine.node.name}."
             )
-            self.state_machine.set_state("error")
+            state_machine.set_state("error")
             return {
                 "status": "error",
                 "message": "Processing state reached without a task. Transitioned to error.",
             }
         # Process the task
-        return self.state_machine.node.process_task()
+        return state_machine.node.process_task()
 
 
 class ErrorState(BaseState):
-    def can_transition_to(self, new_state):
-        return new_state in ["waiting", "ready", "inactive"]
+    __slots__ = ()
 
-    def can_process_task(self):
-        """Error state does not allow task processing."""
-        return False
+    name = "error"
+    allowed_transitions = frozenset(["waiting", "ready", "inactive"])
+    allows_processing = False  # Error state does not allow task processing.
 
-    def handle_task(self):
+    def handle_task(self, state_machine):
         """Error state should not process tasks."""
-        self.state_machine.node.log_error(
-            f"Cannot process tasks in 'error' state for Node {self.state_machine.node.name}."
+        state_machine.node.log_error(
+            f"Cannot process tasks in 'error' state for Node {state_machine.node.name}."
         )
         return {
             "status": "error",
@@ -130,19 +129,33 @@ class ErrorState(BaseState):
 
 
 class InactiveState(BaseState):
-    def can_transition_to(self, new_state):
-        return new_state in ["waiting", "ready", "error"]
+    __slots__ = ()
 
-    def can_process_task(self):
-        """Inactive state does not allow task processing."""
-        return False
+    name = "inactive"
+    allowed_transitions = frozenset(["waiting", "ready", "error"])
+    allows_processing = False  # Inactive state does not allow task processing.
 
-    def handle_task(self):
+    def handle_task(self, state_machine):
         """Inactive state does not process tasks."""
-        self.state_machine.node.log_debugger(
-            f"Node {self.state_machine.node.name} is inactive and cannot process tasks."
+        state_machine.node.log_debugger(
+            f"Node {state_machine.node.name} is inactive and cannot process tasks."
         )
         return {
             "status": "inactive",
             "message": "Node is inactive. Task processing is not allowed.",
         }
+
+
+# Interned state singletons shared by every StateMachine
+WAITING = WaitingState()
+PROCESSING = ProcessingState()
+READY = ReadyState()
+ERROR = ErrorState()
+INACTIVE = InactiveState()
+
+STATES = {state.name: state for state in (WAITING, PROCESSING, READY, ERROR, INACTIVE)}
+
+# Compiled transition table: (from_state, to_state) pairs that are allowed
+TRANSITIONS = frozenset(
+    (state.name, target) for state in STATES.values() for target in state.allowed_transitions
+)
@@ -1,6 +1,10 @@
 from datetime import datetime
+import asyncio
+import os
 import uuid
 import functools
+import random
+import threading
 import time
 
 
@@ -21,6 +25,16 @@ def get_unique_id():
     return str(uuid.uuid4())
 
 
+def get_unique_id_bytes():
+    """
+    Generates a unique id as 16 raw bytes (a version 4 UUID) without string formatting.
+    """
+    raw = bytearray(os.urandom(16))
+    raw[6] = (raw[6] & 0x0F) | 0x40  # Version 4
+    raw[8] = (raw[8] & 0x3F) | 0x80  # RFC 4122 variant
+    return bytes(raw)
+
+
 # ===========================
 # Custom Exceptions
 # ===========================
@@ -44,16 +58,41 @@ class MessagingError(Exception):
     pass
 
 
+class DependencyCycleError(OrchestratorError):
+    """Raised when a workflow's dependency graph contains a cycle."""
+
+    pass
+
+
+class ModelClientError(NodeError):
+    """Raised when a model provider request fails."""
+
+    def __init__(self, message, status=None, retryable=False, retry_after=None):
+        super().__init__(message)
+        self.status = status  # HTTP status, if the provider answered
+        self.retryable = retryable  # Transient: timeouts, connection errors, 429, 5xx
+        self.retry_after = retry_after  # Seconds the provider asked us to wait
+
+
+class CircuitOpenError(NodeError):
+    """Raised when a circuit breaker rejects a call without attempting it."""
+
+    pass
+
+
 # ===========================
 # Decorators
 # ===========================
 
 
-def retry_operation(retry_count=3, retry_delay=2):
+def retry_operation(retry_count=3, retry_delay=2, backoff_factor=1, jitter=False):
     """
     Retries a function in case of an exception.
     :param retry_count: Number of retries.
-    :param retry_delay: Delay (in seconds) between retries.
+    :param retry_delay: Delay (in seconds) before the first retry.
+    :param backoff_factor: Multiplier applied to the delay after each retry.
+    :param jitter: Sleep a random time up to the delay, so callers failing together
+        do not retry in lockstep.
     """
 
     def decorator(func):
@@ -64,7 +103,8 @@ def retry_operation(retry_count=3, retry_delay=2):
                     return func(*args, **kwargs)
                 except Exception as e:
                     if attempt < retry_count - 1:
-                        time.sleep(retry_delay)
+                        delay = retry_delay * backoff_factor**attempt
+                        time.sleep(random.uniform(0, delay) if jitter else delay)
                     else:
                         raise e
 
@@ -92,6 +132,51 @@ def fallback_on_error(fallback_func):
     return decorator
 
 
+# ===========================
+# Async Helpers
+# ===========================
+
+_background_loop = None
+_background_loop_lock = threading.Lock()
+
+
+def get_background_loop():
+    """
+    Returns the shared event loop used to run coroutines from synchronous code.
+    The loop runs in a daemon thread that is started on first use.
+    """
+    global _background_loop
+    with _background_loop_lock:
+        if _background_loop is None:
+            loop = asyncio.new_event_loop()
+            threading.Thread(
+                target=loop.run_forever, name="node-network-loop", daemon=True
+            ).start()
+            _background_loop = loop
+    return _background_loop
+
+
+def run_sync(coro):
+    """
+    Runs a coroutine to completion from synchronous code.
+    :param coro: Coroutine to run on the shared background event loop.
+    :return: The coroutine's result.
+    :raises RuntimeError: If called from the shared event loop itself.
+    """
+    loop = get_background_loop()
+    try:
+        running_loop = asyncio.get_running_loop()
+    except RuntimeError:
+        running_loop = None
+
+    if running_loop is loop:
+        coro.close()
+        raise RuntimeError(
+            "run_sync() cannot be called from the shared event loop; await the coroutine instead."
+        )
+    return asyncio.run_coroutine_threadsafe(coro, loop).result()
+
+
 # ===========================
 # Validation Helpers
 # ===========================
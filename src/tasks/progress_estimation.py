@@ -1,53 +1,211 @@
 # tasks/progress_estimation.py
-from shared.state import state
-from tqdm import tqdm
-from logger_manager import logger, log_event, log_error, log_task_event
+import sys
+import threading
+import time
+from collections import Counter
 
-# Global progress bar
-progress_bar = None
+from src.shared.WorkflowState import workflow_state
 
+try:
+    from tqdm import tqdm
+except ImportError:  # Fall back to plain console lines
+    tqdm = None
 
-def initialize_progress_bar(total_tasks=None):
+DEFAULT_REFRESH_INTERVAL = 0.5  # Minimum seconds between renders
+THROUGHPUT_SMOOTHING = 0.2  # EWMA weight of each new completion interval
+DEFAULT_TASK_TYPE = "default"
+
+# Global progress tracker
+progress_tracker = None
+
+
+class ProgressTracker:
     """
-    Initialize a progress bar.
-    If total_tasks is not provided, use the total tasks from the state.
+    Event-driven workflow progress. Subscribes to a WorkflowState so each completion
+    costs O(1), renders at most once per refresh interval, and estimates the ETA from
+    the EWMA of the time between completions of each task type (a node's "task_type"
+    field). Nodes added to the store later (ensure_node(), restore()) join the
+    totals; without an explicit total_tasks the total follows the store.
     """
-    global progress_bar
-    if total_tasks is None:
-        total_tasks = state.get("total_tasks", 0)
 
-    progress_bar = tqdm(total=total_tasks, desc="Workflow Progress", unit="task")
+    def __init__(
+        self,
+        store=None,
+        total_tasks=None,
+        refresh_interval=DEFAULT_REFRESH_INTERVAL,
+        smoothing=THROUGHPUT_SMOOTHING,
+        use_tqdm=True,
+        output=None,
+        clock=time.monotonic,
+    ):
+        self.store = store if store is not None else workflow_state
+        self.refresh_interval = refresh_interval
+        self.smoothing = smoothing
+        self.output = output or sys.stderr
+        self.clock = clock
+        self.started_at = clock()
+        self.last_render = None
+        self.renders = 0
+
+        # Per task type: nodes left, EWMA seconds between completions, last completion
+        self.tracked = set(self.store.nodes)
+        self.remaining = Counter(
+            node.get("task_type", DEFAULT_TASK_TYPE)
+            for node in self.store.nodes.values()
+            if node.get("status") != "Completed"
+        )
+        self.interval = {}
+        self.last_completion = {}
+        self.total_tasks = total_tasks
+        self._lock = threading.Lock()
+
+        self.bar = None
+        if use_tqdm and tqdm is not None:
+            self.bar = tqdm(
+                total=self.get_total(), desc="Workflow Progress", unit="task"
+            )
+        self.store.subscribe(self.on_status_change)
+
+    def on_status_change(self, name, old_status, new_status, fields):
+        """
+        WorkflowState observer: account for added nodes, completions and completed
+        nodes going back to work, and maybe re-render.
+        """
+        task_type = self.store.nodes.get(name, {}).get("task_type", DEFAULT_TASK_TYPE)
+        with self._lock:
+            added = name not in self.tracked
+            if added:
+                self.tracked.add(name)
+                self.remaining[task_type] += 1
+            elif old_status == "Completed" and new_status != "Completed":
+                self.remaining[task_type] += 1
+        if new_status == "Completed" and (added or old_status != "Completed"):
+            self.record_completion(task_type)
+        self.refresh()
+
+    def record_completion(self, task_type=DEFAULT_TASK_TYPE):
+        """Record one completed task of a type."""
+        now = self.clock()
+        with self._lock:
+            if self.remaining[task_type] > 0:
+                self.remaining[task_type] -= 1
+            previous = self.last_completion.get(task_type, self.started_at)
+            sample = now - previous
+            interval = self.interval.get(task_type)
+            self.interval[task_type] = (
+                sample
+                if interval is None
+                else interval + self.smoothing * (sample - interval)
+            )
+            self.last_completion[task_type] = now
+
+    def get_completed(self):
+        return self.store.get_count("Completed")
+
+    def get_total(self):
+        """The explicit total_tasks, else the store's "total_tasks" or node count."""
+        return self.total_tasks or self.store.get("total_tasks") or len(self.store)
+
+    def get_eta(self):
+        """
+        Estimated seconds until every task is complete, or None before any completion.
+        Task types drain concurrently, so the ETA is that of the slowest type; types
+        without completions yet use the mean interval of the others.
+        """
+        with self._lock:
+            if not self.interval:
+                return None
+            fallback = sum(self.interval.values()) / len(self.interval)
+            return max(
+                (
+                    count * self.interval.get(task_type, fallback)
+                    for task_type, count in self.remaining.items()
+                ),
+                default=0.0,
+            )
+
+    def refresh(self, force=False):
+        """Render progress if the refresh interval has passed (or force is set)."""
+        now = self.clock()
+        with self._lock:
+            if (
+                not force
+                and self.last_render is not None
+                and now - self.last_render < self.refresh_interval
+            ):
+                return False
+            self.last_render = now
+            self.renders += 1
+        self.render()
+        return True
+
+    def render(self):
+        completed = self.get_completed()
+        total = self.get_total()
+        eta = self.get_eta()
+        if self.bar is not None:
+            self.bar.total = total
+            self.bar.n = completed
+            self.bar.set_postfix_str(format_eta(eta), refresh=False)
+            self.bar.refresh()
+        else:
+            self.output.write(
+                f"Workflow Progress: {completed}/{total} tasks, "
+                f"{format_eta(eta)}\n"
+            )
+
+    def close(self):
+        """Render a final update and stop listening to the store."""
+        self.store.unsubscribe(self.on_status_change)
+        self.refresh(force=True)
+        if self.bar is not None:
+            self.bar.close()
+
+
+def format_eta(eta):
+    return "ETA unknown" if eta is None else f"ETA {eta:.1f}s"
+
+
+def initialize_progress_bar(total_tasks=None, **tracker_options):
+    """
+    Start tracking progress of the shared workflow state.
+    If total_tasks is not provided, use the total tasks from the state.
+    """
+    global progress_tracker
+    finalize_progress_bar()
+    progress_tracker = ProgressTracker(total_tasks=total_tasks, **tracker_options)
+    return progress_tracker
 
 
 def update_progress_bar():
     """
-    Update the progress bar based on the number of completed tasks.
+    Render progress now unless a render happened within the refresh interval.
+    Completions are already counted as they happen, so this does no scanning.
     """
-    global progress_bar
-    if progress_bar:
-        completed_tasks = sum(
-            1 for node in state["nodes"].values() if node.get("status") == "Completed"
-        )
-        progress_bar.n = completed_tasks  # Update progress bar position
-        progress_bar.refresh()
+    if progress_tracker is not None:
+        progress_tracker.refresh()
 
 
 def finalize_progress_bar():
-    global progress_bar
-    if progress_bar is not None:
-        progress_bar.close()
-        progress_bar = None
+    global progress_tracker
+    if progress_tracker is not None:
+        progress_tracker.close()
+        progress_tracker = None
 
 
-def progress_estimation_node():
+def progress_estimation_node(verbose=False):
     """
-    Display a simplified progress report with overall progress and task statuses.
+    Display a progress report with overall progress and the number of tasks in each
+    status. Per-node lines are only printed when verbose is set.
     """
     print("\n=== Progress Estimation ===")
-    print(f"Overall Progress: {state['progress']}%")
-    for node_name, details in state["nodes"].items():
-        status = details.get("status", "Unknown")
-        print(f"  - {node_name}: {status}")
+    print(f"Overall Progress: {workflow_state.get('progress', 0)}%")
+    counts = workflow_state.get_counts()
+    for status, count in sorted(counts.items(), key=lambda item: str(item[0])):
+        print(f"  - {status or 'Unknown'}: {count}")
+    if verbose:
+        for node_name, details in workflow_state.snapshot()["nodes"].items():
+            print(f"  - {node_name}: {details.get('status', 'Unknown')}")
     print("================================")
 
     # Update the progress bar after logging
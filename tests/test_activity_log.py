@@ -0,0 +1,79 @@
+import json
+
+from src.shared.ActivityLog import ActivityLog
+from src.shared.AI_Node import AI_Node
+from src.shared.Orchestrator import Orchestrator
+
+# --------------------------- Tests --------------------------- #
+
+
+def test_ring_buffer_keeps_latest_entries():
+    """Once full, the oldest entries are evicted and memory stays bounded."""
+    log = ActivityLog(capacity=3)
+    for i in range(5):
+        log.append(f"activity {i}", {"i": i})
+
+    assert len(log) == 3
+    assert log.evicted == 2
+    assert [entry["activity"] for entry in log] == [
+        "activity 2",
+        "activity 3",
+        "activity 4",
+    ]
+    assert log[-1]["details"] == {"i": 4}
+
+
+def test_export_columns_is_chronological():
+    """Columnar export returns numeric timestamps in order, oldest first."""
+    log = ActivityLog(capacity=4)
+    for i in range(6):
+        log.append(f"activity {i}", timestamp=float(i))
+
+    columns = log.export_columns()
+    assert list(columns["timestamp"]) == [2.0, 3.0, 4.0, 5.0]
+    assert columns["activity"][0] == "activity 2"
+    assert columns["timestamp"].typecode == "d"
+
+
+def test_evicted_entries_spill_to_disk(tmp_path):
+    """Evicted entries are appended to the spill file as JSON lines."""
+    spill_path = tmp_path / "spill.jsonl"
+    log = ActivityLog(capacity=2, spill_path=spill_path, spill_batch_size=2)
+    for i in range(5):
+        log.append(f"activity {i}", timestamp=float(i))
+    log.flush()
+
+    spilled = [json.loads(line) for line in spill_path.read_text().splitlines()]
+    assert [entry["activity"] for entry in spilled] == [
+        "activity 0",
+        "activity 1",
+        "activity 2",
+    ]
+
+    export_path = tmp_path / "export.jsonl"
+    log.write_jsonl(export_path)
+    assert len(export_path.read_text().splitlines()) == 2
+
+
+def test_nodes_and_orchestrators_use_bounded_logs():
+    """AI_Node and Orchestrator record activities in an ActivityLog."""
+    node = AI_Node(
+        in_name="Logger",
+        in_node_id="logger-1",
+        in_description="Activity log test node",
+        in_priority=1,
+        in_status="idle",
+        in_purpose="Testing",
+        in_node_registry=None,
+        in_activity_logs=[{"activity": "seeded", "timestamp": "2024-01-01"}],
+    )
+    node.log_activity("Processed task: task1", {"status": "success"})
+    orchestrator = Orchestrator()
+    orchestrator.log_activity("Registered node")
+
+    assert [entry["activity"] for entry in node.activity_logs] == [
+        "seeded",
+        "Processed task: task1",
+    ]
+    assert isinstance(orchestrator.activity_logs, ActivityLog)
+    assert orchestrator.activity_logs[0]["activity"] == "Registered node"
@@ -0,0 +1,161 @@
+import asyncio
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from src.shared.GPTNode import GPTNode
+from src.shared.ModelClient import AsyncModelClient, ProviderLimits
+from src.shared.NodeRegistry import NodeRegistry
+from src.shared.Orchestrator import Orchestrator
+
+# --------------------------- Fixtures --------------------------- #
+
+
+class StubModelServer(ThreadingHTTPServer):
+    """Local OpenAI-compatible server that records request concurrency."""
+
+    daemon_threads = True
+
+    def __init__(self, delay=0.0, status=200):
+        super().__init__(("127.0.0.1", 0), StubModelHandler)
+        self.delay = delay
+        self.status = status
+        self.requests = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.lock = threading.Lock()
+
+    @property
+    def base_url(self):
+        return f"http://127.0.0.1:{self.server_address[1]}/v1"
+
+
+class StubModelHandler(BaseHTTPRequestHandler):
+    def do_POST(self):
+        server = self.server
+        payload = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        with server.lock:
+            server.requests.append((self.path, payload))
+            server.in_flight += 1
+            server.max_in_flight = max(server.max_in_flight, server.in_flight)
+        time.sleep(server.delay)
+        with server.lock:
+            server.in_flight -= 1
+
+        prompt = payload["messages"][0]["content"]
+        body = json.dumps(
+            {"choices": [{"message": {"content": f"stub: {prompt.splitlines()[-1]}"}}]}
+        ).encode("utf-8")
+        self.send_response(server.status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def stub_server():
+    """Start a stub model server in a background thread."""
+    servers = []
+
+    def start(**kwargs):
+        server = StubModelServer(**kwargs)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        servers.append(server)
+        return server
+
+    yield start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+def make_gpt_node(node_registry, node_id, client):
+    """Create a GPTNode with a task assigned."""
+    node = GPTNode(
+        in_name=f"GPT-{node_id}",
+        in_node_id=node_id,
+        in_description="Async test node",
+        in_priority=1,
+        in_status="idle",
+        in_purpose="Summarization",
+        in_supported_tasks=["summarize"],
+        in_node_registry=node_registry,
+        in_model_client=client,
+        in_model="stub-model",
+    )
+    node.set_task("summarize")
+    return node
+
+
+# --------------------------- Tests --------------------------- #
+
+
+def test_aprocess_task_calls_model_server(stub_server):
+    """aprocess_task sends the generated prompt to the provider and returns its output."""
+    server = stub_server()
+    client = AsyncModelClient(server.base_url, provider="stub")
+    node = make_gpt_node(NodeRegistry(), "gpt-1", client)
+
+    result = asyncio.run(node.aprocess_task())
+
+    assert result["status"] == "success"
+    assert result["output"] == "stub: Task: summarize"
+    path, payload = server.requests[0]
+    assert path == "/v1/chat/completions"
+    assert payload["model"] == "stub-model"
+
+
+def test_provider_concurrency_is_bounded(stub_server):
+    """In-flight requests never exceed the provider's semaphore limit."""
+    server = stub_server(delay=0.1)
+    client = AsyncModelClient(
+        server.base_url, provider="stub", limits=ProviderLimits({"stub": 3})
+    )
+    registry = NodeRegistry()
+    nodes = [make_gpt_node(registry, f"gpt-{i}", client) for i in range(9)]
+
+    async def run_all():
+        return await asyncio.gather(*(node.aprocess_task() for node in nodes))
+
+    results = asyncio.run(run_all())
+
+    assert all(result["status"] == "success" for result in results)
+    assert server.max_in_flight == 3
+
+
+def test_sync_wrappers_and_async_collect_responses(stub_server):
+    """process_task and collect_responses wrap the async path and overlap requests."""
+    server = stub_server(delay=0.2)
+    client = AsyncModelClient(server.base_url, provider="stub")
+    registry = NodeRegistry()
+    orchestrator = Orchestrator()
+    for i in range(5):
+        orchestrator.register_node(make_gpt_node(registry, f"gpt-{i}", client))
+
+    assert orchestrator.nodes["gpt-0"].process_task()["status"] == "success"
+
+    start = time.monotonic()
+    responses = orchestrator.collect_responses()
+    elapsed = time.monotonic() - start
+
+    assert set(responses) == {f"gpt-{i}" for i in range(5)}
+    assert elapsed < 0.2 * 5
+    assert server.max_in_flight >= 2
+
+
+def test_http_error_is_reported(stub_server):
+    """Provider errors surface as an error result rather than an exception."""
+    server = stub_server(status=500)
+    client = AsyncModelClient(server.base_url, provider="stub")
+    node = make_gpt_node(NodeRegistry(), "gpt-err", client)
+
+    result = node.process_task()
+
+    assert result["status"] == "error"
+    assert "HTTP 500" in result["message"]
@@ -0,0 +1,65 @@
+import json
+
+import pytest
+from src.benchmarks import suite  # noqa: F401
+from src.benchmarks.__main__ import main
+from src.benchmarks.graphs import GRAPH_SHAPES, make_graph
+from src.benchmarks.harness import BENCHMARKS, find_regressions, run_benchmarks
+
+# --------------------------- Fixtures --------------------------- #
+
+
+def make_report(**medians):
+    return {
+        "results": {key: {"median": median} for key, median in medians.items()}
+    }
+
+
+# --------------------------- Tests --------------------------- #
+
+
+@pytest.mark.parametrize("shape", GRAPH_SHAPES)
+def test_graphs_are_acyclic_and_ordered(shape):
+    graph = make_graph(shape, 50, width=4)
+    seen = set()
+    for node_id, dependencies in graph.items():
+        assert set(dependencies) <= seen  # Dependencies come first
+        seen.add(node_id)
+    assert len(graph) == 50
+    assert make_graph(shape, 50, width=4) == graph  # Reproducible
+
+
+def test_every_benchmark_runs_at_small_sizes():
+    measured = []
+    report = run_benchmarks(sizes=[5], repeat=2, progress=measured.append)
+    assert set(report["results"]) == {f"{name}[5]" for name in BENCHMARKS}
+    assert len(measured) == len(BENCHMARKS)
+    for result in measured:
+        assert result["operations"] == 5 and result["repeat"] == 2
+        assert 0 <= result["min"] <= result["median"]
+    assert report["metadata"]["repeat"] == 2
+
+
+def test_unknown_benchmark_is_rejected():
+    with pytest.raises(ValueError):
+        run_benchmarks(["no_such_benchmark"])
+
+
+def test_regressions_beyond_tolerance_are_reported():
+    baseline = make_report(**{"a[1]": 1.0, "b[1]": 1.0, "c[1]": 1.0})
+    current = make_report(**{"a[1]": 1.1, "b[1]": 1.5, "new[1]": 9.0})
+    assert find_regressions(baseline, current, tolerance=0.2) == [("b[1]", 1.0, 1.5)]
+
+
+def test_cli_writes_json_and_fails_on_regression(tmp_path, capsys):
+    output = tmp_path / "results.json"
+    argv = ["registry_lookup", "--sizes", "10", "--repeat", "1"]
+    assert main(argv + ["--output", str(output)]) == 0
+    report = json.loads(output.read_text())
+    assert list(report["results"]) == ["registry_lookup[10]"]
+
+    report["results"]["registry_lookup[10]"]["median"] = 1e-12
+    baseline = tmp_path / "baseline.json"
+    baseline.write_text(json.dumps(report))
+    assert main(argv + ["--baseline", str(baseline)]) == 1
+    assert "REGRESSION registry_lookup[10]" in capsys.readouterr().out
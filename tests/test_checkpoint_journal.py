@@ -0,0 +1,150 @@
+import json
+import os
+import stat
+import threading
+
+import pytest
+from src.shared.CheckpointJournal import JOURNAL_FILE, CheckpointJournal
+from src.shared.parallel_execution import execute_in_parallel
+
+# --------------------------- Fixtures --------------------------- #
+
+
+class SimulatedCrash(BaseException):
+    """Escapes the scheduler like a process kill would, without cleanup in tasks."""
+
+
+def make_state(dependencies):
+    return {
+        "nodes": {
+            name: {"status": "Not Started", "dependencies": deps}
+            for name, deps in dependencies.items()
+        }
+    }
+
+
+def read_journal(directory):
+    with open(os.path.join(directory, JOURNAL_FILE), encoding="utf-8") as handle:
+        return handle.read().splitlines()
+
+
+# --------------------------- Tests --------------------------- #
+
+
+def test_changes_are_recovered_after_restart(tmp_path):
+    """Status changes, outputs and node updates survive a restart."""
+    with CheckpointJournal(str(tmp_path)) as journal:
+        store = journal.open()
+        store.set_status("a", "In Progress")
+        store.set_status("a", "Completed", output="result a")
+        store.set_status("b", "Error")
+        store.update_node("b", attempts=2)
+
+    with CheckpointJournal(str(tmp_path)) as journal:
+        store = journal.open()
+        assert store.get_node("a") == {"status": "Completed", "output": "result a"}
+        assert store.get_node("b") == {"status": "Error", "attempts": 2}
+        assert store.get_counts() == {"Completed": 1, "Error": 1}
+
+
+def test_torn_tail_is_ignored(tmp_path):
+    """A partially written last record is dropped, not fatal."""
+    journal = CheckpointJournal(str(tmp_path), compact_every=100)
+    store = journal.open()
+    store.set_status("a", "Completed", output="kept")
+    store.set_status("b", "Completed", output="torn")
+    journal.sync()
+    path = os.path.join(str(tmp_path), JOURNAL_FILE)
+    with open(path, "r+", encoding="utf-8") as handle:
+        content = handle.read()
+        handle.seek(0)
+        handle.truncate()
+        handle.write(content[:-10])  # Cut the last record short
+    journal.close()
+
+    recovered = CheckpointJournal(str(tmp_path)).recover()
+    assert recovered == {"a": {"status": "Completed", "output": "kept"}}
+
+
+def test_journal_is_compacted_into_snapshots(tmp_path):
+    """The log never grows past compact_every records, whatever the history."""
+    with CheckpointJournal(str(tmp_path), compact_every=10) as journal:
+        store = journal.open()
+        for i in range(95):
+            store.set_status(f"node-{i % 7}", "In Progress", attempt=i)
+        assert journal.compactions >= 9
+        assert len(read_journal(str(tmp_path))) < 10
+
+    with CheckpointJournal(str(tmp_path)) as journal:
+        store = journal.open()
+        assert len(store) == 7
+        assert store.get_node("node-3")["attempt"] == 94  # Last i with i % 7 == 3
+
+
+@pytest.mark.skipif(os.name == "nt", reason="Directories cannot be fsynced")
+def test_snapshot_rename_is_synced_before_the_journal_is_truncated(
+    tmp_path, monkeypatch
+):
+    """The directory is fsynced while the journal still holds the compacted records."""
+    journal = CheckpointJournal(str(tmp_path), compact_every=100)
+    store = journal.open()
+    store.set_status("a", "Completed")
+    journal_sizes = []
+    fsync = os.fsync
+
+    def record_fsync(fd):
+        if stat.S_ISDIR(os.fstat(fd).st_mode):
+            journal_sizes.append(os.path.getsize(journal.journal_path))
+        fsync(fd)
+
+    monkeypatch.setattr(os, "fsync", record_fsync)
+    store.checkpoint()
+    journal.close()
+    assert journal_sizes and journal_sizes[0] > 0
+
+
+def test_records_are_json_lines_with_sequence_numbers(tmp_path):
+    with CheckpointJournal(str(tmp_path), compact_every=100) as journal:
+        store = journal.open()
+        store.set_status("a", "Completed", output={"tokens": 3})
+        records = [json.loads(line) for line in read_journal(str(tmp_path))]
+    assert records == [
+        {
+            "seq": 1,
+            "node": "a",
+            "status": "Completed",
+            "fields": {"output": {"tokens": 3}},
+        }
+    ]
+
+
+def test_resumed_workflow_skips_completed_nodes(tmp_path):
+    """After a crash, only unfinished nodes are executed again."""
+    graph = {"a": [], "b": ["a"], "c": ["b"], "d": ["a"]}
+    calls, lock = [], threading.Lock()
+    crash = True
+
+    def task(input_text, node_name):
+        with lock:
+            calls.append(node_name)
+        if node_name == "c" and crash:
+            raise SimulatedCrash()
+        return f"Output of {node_name}"
+
+    tasks = [(task, ("input", name)) for name in graph]
+    with pytest.raises(SimulatedCrash):
+        execute_in_parallel(
+            tasks, make_state(graph), max_workers=1, checkpoint_dir=str(tmp_path)
+        )
+    first_run = set(calls)
+    assert {"a", "b", "c"} <= first_run
+
+    crash = False
+    calls.clear()
+    state = make_state(graph)
+    execute_in_parallel(tasks, state, checkpoint_dir=str(tmp_path))
+
+    assert set(calls) == {"c"} | ({"d"} - first_run)
+    assert all(node["status"] == "Completed" for node in state["nodes"].values())
+    assert state["nodes"]["a"]["output"] == "Output of a"
+    assert state["nodes"]["c"]["dependencies"] == ["b"]  # Merged, not replaced
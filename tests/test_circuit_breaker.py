@@ -0,0 +1,268 @@
+import asyncio
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from src.shared.AI_Node import AI_Node
+from src.shared.CircuitBreaker import CircuitBreaker, get_percentile
+from src.shared.ModelClient import ClientManager
+from src.shared.Orchestrator import Orchestrator
+from src.shared.utils import CircuitOpenError, ModelClientError
+
+# --------------------------- Fixtures --------------------------- #
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class StatusServer(ThreadingHTTPServer):
+    """Chat completions server answering every request with a fixed status."""
+
+    daemon_threads = True
+
+    def __init__(self, status):
+        super().__init__(("127.0.0.1", 0), StatusHandler)
+        self.status = status
+        self.requests = 0
+
+    @property
+    def base_url(self):
+        return f"http://127.0.0.1:{self.server_address[1]}/v1"
+
+
+class StatusHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers["Content-Length"]))
+        self.server.requests += 1
+        body = json.dumps({"choices": [{"message": {"content": "ok"}}]}).encode()
+        self.send_response(self.server.status)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def status_server():
+    servers = []
+
+    def start(status):
+        server = StatusServer(status)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        servers.append(server)
+        return server
+
+    yield start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+class FlakyNode(AI_Node):
+    """Node whose prompt execution fails while `failing` is set."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.failing = True
+        self.calls = 0
+
+    async def aexecute_prompt(self, prompt):
+        self.calls += 1
+        if self.failing:
+            raise RuntimeError("dependency down")
+        return "recovered"
+
+
+def make_flaky_node(breaker):
+    node = FlakyNode(
+        in_name="Flaky",
+        in_node_id="flaky",
+        in_description="Circuit breaker test node",
+        in_priority=1,
+        in_status="idle",
+        in_purpose="Testing",
+        in_node_registry=None,
+        in_supported_tasks=["work"],
+        in_circuit_breaker=breaker,
+    )
+    node.set_task("work")
+    return node
+
+
+def run_call(breaker, result="ok", error=None):
+    async def call():
+        if error is not None:
+            raise error
+        return result
+
+    return asyncio.run(breaker.acall(call))
+
+
+# --------------------------- Tests --------------------------- #
+
+
+def test_percentile_uses_nearest_rank():
+    values = list(range(1, 101))
+    assert get_percentile(values, 0.95) == 95
+    assert get_percentile(values, 0.5) == 50
+    assert get_percentile([], 0.95) is None
+
+
+def test_breaker_opens_on_failure_rate_and_recovers_through_half_open():
+    """Closed -> open at the threshold; a successful trial after the cooldown closes it."""
+    clock = FakeClock()
+    breaker = CircuitBreaker(
+        "test", window_size=4, min_calls=4, open_seconds=10, clock=clock
+    )
+    transitions = []
+    breaker.subscribe(lambda _, old, new: transitions.append((old, new)))
+
+    run_call(breaker)
+    run_call(breaker)
+    for _ in range(2):
+        with pytest.raises(RuntimeError):
+            run_call(breaker, error=RuntimeError("down"))
+    assert breaker.get_state() == "open"
+    with pytest.raises(CircuitOpenError):
+        run_call(breaker)
+
+    clock.now = 10
+    assert breaker.get_state() == "half_open"
+    assert breaker.allow_request() and not breaker.allow_request()  # One trial only
+    breaker.record_failure()
+    assert breaker.get_state() == "open"
+
+    clock.now = 20
+    assert run_call(breaker) == "ok"
+    assert breaker.get_state() == "closed"
+    assert transitions == [
+        ("closed", "open"),
+        ("open", "half_open"),
+        ("half_open", "open"),
+        ("open", "half_open"),
+        ("half_open", "closed"),
+    ]
+
+
+def test_cancelled_trial_call_releases_its_slot():
+    """A half-open trial that is cancelled lets the next trial through."""
+    clock = FakeClock()
+    breaker = CircuitBreaker("test", min_calls=1, open_seconds=10, clock=clock)
+    breaker.record_failure()
+    clock.now = 10
+
+    async def run():
+        task = asyncio.ensure_future(breaker.acall(lambda: asyncio.sleep(10)))
+        await asyncio.sleep(0)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(run())
+    assert breaker.get_state() == "half_open"
+    assert breaker.allow_request() and not breaker.allow_request()
+
+
+def test_breaker_opens_on_latency_percentile():
+    """Slow calls trip the breaker even when they succeed."""
+    breaker = CircuitBreaker("slow", latency_threshold=0.5, min_calls=5)
+    for _ in range(4):
+        breaker.record_success(0.1)
+    breaker.record_success(2.0)
+    assert breaker.get_state() == "open"
+
+
+def test_slow_calls_are_hedged_after_the_percentile_deadline():
+    """A straggler is raced by a duplicate call, which wins."""
+    breaker = CircuitBreaker("hedged", hedge=True, min_calls=3)
+    for _ in range(3):
+        breaker.record_success(0.02)
+    calls = []
+
+    async def call():
+        calls.append(1)
+        await asyncio.sleep(2 if len(calls) == 1 else 0.01)
+        return len(calls)
+
+    async def run():
+        started = asyncio.get_running_loop().time()
+        result = await breaker.acall(call)
+        return result, asyncio.get_running_loop().time() - started
+
+    result, elapsed = asyncio.run(run())
+    assert result == 2 and elapsed < 0.5
+    assert breaker.get_stats()["hedged"] == 1
+
+
+def test_node_fails_fast_and_uses_the_error_state():
+    """An open breaker puts the node in 'error' and skips execution until it recovers."""
+    clock = FakeClock()
+    breaker = CircuitBreaker("node", min_calls=2, open_seconds=5, clock=clock)
+    node = make_flaky_node(breaker)
+    orchestrator = Orchestrator()
+    orchestrator.register_node(node)
+
+    for _ in range(2):
+        assert orchestrator.collect_responses()["flaky"]["status"] == "error"
+    assert node.state_machine.get_state().name == "error"
+
+    response = orchestrator.collect_responses()["flaky"]
+    assert "Circuit breaker 'node' is open" in response["message"]
+    assert node.calls == 2
+
+    clock.now = 5
+    node.failing = False
+    response = orchestrator.collect_responses()["flaky"]
+    assert response["output"] == "recovered"
+    assert breaker.get_state() == "closed"
+    assert node.state_machine.get_state().name != "error"
+
+
+def test_streamed_tasks_go_through_the_breaker():
+    """Streaming runs record their outcome and fail fast while the breaker is open."""
+    breaker = CircuitBreaker("node", min_calls=2, open_seconds=60)
+    node = make_flaky_node(breaker)
+
+    async def stream():
+        return [chunk async for chunk in node.astream_task()]
+
+    for _ in range(2):
+        assert asyncio.run(stream()) == []
+        assert node.output_stream.response["status"] == "error"
+    assert breaker.get_state() == "open"
+
+    assert asyncio.run(stream()) == []
+    assert "Circuit breaker 'node' is open" in node.output_stream.response["message"]
+    assert node.calls == 2
+
+
+def test_provider_breaker_counts_only_provider_failures(status_server):
+    """5xx responses open the shared provider breaker; client errors do not."""
+    options = {"min_calls": 3, "open_seconds": 60}
+    manager = ClientManager(circuit_breaker_options=options, max_retries=0)
+
+    bad_request = status_server(400)
+    client = manager.get_client(bad_request.base_url)
+    for _ in range(3):
+        with pytest.raises(ModelClientError):
+            asyncio.run(client.complete("prompt"))
+    assert manager.get_stats()["circuit_breakers"]["openai"]["state"] == "closed"
+
+    outage = status_server(503)
+    client = manager.get_client(outage.base_url)
+    for _ in range(3):
+        with pytest.raises(ModelClientError):
+            asyncio.run(client.complete("prompt"))
+    with pytest.raises(CircuitOpenError):
+        asyncio.run(client.complete("prompt"))
+    assert outage.requests == 3
@@ -0,0 +1,199 @@
+import asyncio
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from src.shared.ModelClient import AsyncModelClient, ClientManager
+from src.shared.rate_limiting import RetryBudget, RetryPolicy, TokenBucket
+from src.shared.utils import ModelClientError
+
+# --------------------------- Fixtures --------------------------- #
+
+
+class FlakyModelServer(ThreadingHTTPServer):
+    """Keep-alive chat completions server that fails its first `failures` requests."""
+
+    daemon_threads = True
+    request_queue_size = 64
+
+    def __init__(self, failures=0, status=503):
+        super().__init__(("127.0.0.1", 0), FlakyModelHandler)
+        self.failures = failures
+        self.status = status
+        self.requests = 0
+        self.connections = 0
+        self.lock = threading.Lock()
+
+    @property
+    def base_url(self):
+        return f"http://127.0.0.1:{self.server_address[1]}/v1"
+
+
+class FlakyModelHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def setup(self):
+        super().setup()
+        with self.server.lock:
+            self.server.connections += 1
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers["Content-Length"]))
+        with self.server.lock:
+            self.server.requests += 1
+            failing = self.server.requests <= self.server.failures
+        if failing:
+            status = self.server.status
+            body = b'{"error": "unavailable"}'
+        else:
+            status = 200
+            body = json.dumps({"choices": [{"message": {"content": "ok"}}]}).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def flaky_server():
+    servers = []
+
+    def start(**kwargs):
+        server = FlakyModelServer(**kwargs)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        servers.append(server)
+        return server
+
+    yield start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def fast_policy(budget=None, max_retries=3):
+    return RetryPolicy(
+        max_retries=max_retries, base_delay=0.001, max_delay=0.01, budget=budget
+    )
+
+
+# --------------------------- Tests --------------------------- #
+
+
+def test_token_bucket_spaces_requests_beyond_the_burst():
+    """Callers beyond the burst wait one refill interval more than the previous."""
+    clock = FakeClock()
+    bucket = TokenBucket(rate=10, capacity=2, clock=clock)
+    waits = [bucket.reserve() for _ in range(4)]
+    assert waits == pytest.approx([0, 0, 0.1, 0.2])
+
+    clock.now = 1.0  # Refills, but never beyond capacity
+    assert bucket.reserve() == 0
+    assert bucket.tokens == pytest.approx(1)
+
+
+def test_retry_budget_caps_retries_as_a_share_of_requests():
+    """Retries stop at ratio * requests in the window and recover as it slides."""
+    clock = FakeClock()
+    budget = RetryBudget(ratio=0.5, min_per_second=0, window=10, clock=clock)
+    for _ in range(10):
+        budget.record_request()
+    assert [budget.try_retry() for _ in range(6)] == [True] * 5 + [False]
+    assert budget.get_stats()["rejected"] == 1
+
+    clock.now = 11  # Everything has left the window
+    budget.record_request()
+    budget.record_request()
+    assert budget.try_retry() and not budget.try_retry()
+
+
+def test_retry_policy_uses_jittered_exponential_backoff():
+    """Delays are spread below a doubling ceiling and only transient errors retry."""
+    policy = RetryPolicy(max_retries=5, base_delay=1, max_delay=4)
+    transient = ModelClientError("busy", status=503, retryable=True)
+    delays = [policy.get_retry_delay(transient, attempt) for attempt in range(5)]
+    assert all(0 <= delay <= min(4, 2**attempt) for attempt, delay in enumerate(delays))
+    assert len(set(delays)) > 1
+    assert policy.get_retry_delay(transient, 5) is None
+    assert policy.get_retry_delay(ModelClientError("bad request", status=400), 0) is None
+
+    throttled = ModelClientError("slow down", status=429, retryable=True, retry_after=3)
+    assert policy.get_retry_delay(throttled, 0) >= 3
+
+
+def test_connections_are_kept_alive(flaky_server):
+    """Sequential requests reuse one connection."""
+    server = flaky_server()
+    client = AsyncModelClient(server.base_url)
+
+    async def run():
+        return [await client.complete(f"prompt {i}") for i in range(5)]
+
+    assert asyncio.run(run()) == ["ok"] * 5
+    assert server.connections == 1
+    assert client.connections_opened == 1
+
+
+def test_transient_failures_are_retried(flaky_server):
+    """A request succeeds after two 503s; client errors are not retried."""
+    server = flaky_server(failures=2)
+    client = AsyncModelClient(server.base_url, retry_policy=fast_policy())
+    assert asyncio.run(client.complete("prompt")) == "ok"
+    assert server.requests == 3
+
+    server = flaky_server(failures=1, status=400)
+    client = AsyncModelClient(server.base_url, retry_policy=fast_policy())
+    with pytest.raises(ModelClientError, match="HTTP 400"):
+        asyncio.run(client.complete("prompt"))
+    assert server.requests == 1
+
+
+def test_shared_budget_prevents_retry_storms(flaky_server):
+    """During an outage, concurrent callers together retry at most the budget."""
+    server = flaky_server(failures=10**6)
+    manager = ClientManager(
+        retry_budget=RetryBudget(ratio=0.1, min_per_second=0),
+        circuit_breaker_options=False,
+        max_retries=3,
+        base_delay=0.001,
+        max_delay=0.01,
+    )
+    client = manager.get_client(server.base_url, api_key="key")
+
+    async def run():
+        return await asyncio.gather(
+            *(client.complete(f"prompt {i}") for i in range(50)),
+            return_exceptions=True,
+        )
+
+    results = asyncio.run(run())
+    assert all(isinstance(result, ModelClientError) for result in results)
+    assert server.requests <= 55  # Without the budget this would be 200
+    assert manager.get_stats()["retry_budget"]["rejected"] > 0
+
+
+def test_manager_shares_clients_and_rate_limits_per_key():
+    """One client per endpoint and key; one token bucket per provider and key."""
+    manager = ClientManager(rate_limits={"openai": (5, 10)})
+    client = manager.get_client("http://model.test/v1", api_key="a")
+    assert manager.get_client("http://model.test/v1", api_key="a") is client
+    other_endpoint = manager.get_client("http://other.test/v1", api_key="a")
+    other_key = manager.get_client("http://model.test/v1", api_key="b")
+
+    assert other_endpoint.rate_limiter is client.rate_limiter
+    assert other_key.rate_limiter is not client.rate_limiter
+    assert client.rate_limiter.rate == 5 and client.rate_limiter.capacity == 10
+    assert client.retry_policy is other_key.retry_policy
+    assert manager.get_client("http://x.test/v1", provider="local").rate_limiter is None
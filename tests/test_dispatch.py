@@ -0,0 +1,120 @@
+import pytest
+from src.shared.AI_Node import AI_Node
+from src.shared.GlobalOrchestrator import GlobalOrchestrator
+from src.shared.LocalOrchestrator import LocalOrchestrator
+from src.shared.dispatch import (
+    Candidate,
+    LoadTracker,
+    PowerOfTwoChoicesPolicy,
+    WeightedPriorityPolicy,
+    get_dispatch_policy,
+)
+
+# --------------------------- Fixtures --------------------------- #
+
+
+def make_node(node_id, priority=1, supported_tasks=("task",)):
+    """Create an idle, unregistered AI_Node."""
+    return AI_Node(
+        in_name=f"Node-{node_id}",
+        in_node_id=node_id,
+        in_description="Dispatch test node",
+        in_priority=priority,
+        in_status="idle",
+        in_purpose="Testing",
+        in_node_registry=None,
+        in_supported_tasks=supported_tasks,
+    )
+
+
+def make_team(name, node_ids, dispatch_policy=None):
+    """Create a team whose nodes all support "task"."""
+    team = LocalOrchestrator(name, dispatch_policy=dispatch_policy)
+    for node_id in node_ids:
+        team.register_node(make_node(node_id))
+    return team
+
+
+# --------------------------- Tests --------------------------- #
+
+
+def test_load_tracker_counts_outstanding_and_smooths_latency():
+    """Outstanding tasks are counted and latency is an EWMA per target."""
+    tracker = LoadTracker(smoothing=0.5)
+    tracker.start("a")
+    tracker.start("a")
+    assert tracker.get_outstanding("a") == 2
+
+    tracker.finish("a", latency=2.0)
+    tracker.finish("a", latency=4.0)
+    assert tracker.get_outstanding() == 0
+    assert tracker.get_latency("a") == pytest.approx(3.0)
+
+    # Unobserved targets are assumed to be as fast as the average
+    tracker.finish("b", latency=1.0)
+    assert tracker.get_candidate("c").latency == pytest.approx(2.0)
+
+
+def test_policies_prefer_least_expected_work():
+    """Each built-in policy avoids a target with a deep, slow queue."""
+    busy = Candidate("busy", outstanding=4, latency=1.0)
+    idle = Candidate("idle", outstanding=0, latency=1.0)
+    for name in ("least_outstanding", "power_of_two", "weighted_priority"):
+        assert get_dispatch_policy(name).select([busy, idle]) is idle
+
+    with pytest.raises(ValueError):
+        get_dispatch_policy("round_robin")
+
+
+def test_weighted_priority_trades_priority_against_load():
+    """A lower-priority target is used once the preferred one has enough queued."""
+    policy = WeightedPriorityPolicy()
+    preferred = Candidate("preferred", priority=1, outstanding=0)
+    backup = Candidate("backup", priority=3, outstanding=0)
+    assert policy.select([backup, preferred]) is preferred
+
+    preferred.outstanding = 3
+    assert policy.select([backup, preferred]) is backup
+
+
+def test_power_of_two_spreads_skewed_load():
+    """Repeated dispatch never lets one target accumulate most of the work."""
+    tracker = LoadTracker()
+    policy = PowerOfTwoChoicesPolicy(seed=7)
+    for _ in range(200):
+        candidates = [tracker.get_candidate(f"node-{i}") for i in range(10)]
+        tracker.start(policy.select(candidates).target_id)
+
+    depths = tracker.snapshot()["outstanding"].values()
+    assert max(depths) - min(depths) <= 3
+
+
+def test_local_dispatch_avoids_slow_nodes():
+    """With a policy, the team picks the idle node with the lowest observed latency."""
+    team = make_team("Team_A", ["slow", "fast"], dispatch_policy="least_outstanding")
+    team.load.finish("slow", latency=5.0)
+    team.load.finish("fast", latency=0.1)
+
+    node = team.assign_task("task")
+    assert node.node_id == "fast"
+    assert team.load.get_outstanding("fast") == 1
+
+    team.record_response("fast", node, {"status": "success"})
+    assert team.load.get_outstanding("fast") == 0
+    assert team.assign_task("task").node_id == "fast"
+
+
+def test_global_dispatch_balances_teams():
+    """Goal tasks go to the team with spare capacity, not a fixed team."""
+    global_orchestrator = GlobalOrchestrator(dispatch_policy="least_outstanding")
+    small = make_team("Small", ["s1"])
+    large = make_team("Large", ["l1", "l2", "l3"])
+    other = LocalOrchestrator("Other")
+    other.register_node(make_node("o1", supported_tasks=("other",)))
+    for team in (small, large, other):
+        global_orchestrator.register_team(team)
+
+    assigned = [global_orchestrator.dispatch_task("task") for _ in range(4)]
+    owners = [node.node_id[0] for node in assigned]
+    assert owners.count("l") == 3 and owners.count("s") == 1
+    assert global_orchestrator.dispatch_task("missing") is None
@@ -0,0 +1,172 @@
+import asyncio
+
+import pytest
+from src.shared.AI_Node import AI_Node
+from src.shared.Orchestrator import Orchestrator
+from src.shared.ResponseCache import ResponseCache
+from src.shared.incremental import IncrementalExecutor, fingerprint_output
+from src.shared.utils import DependencyCycleError
+
+# --------------------------- Fixtures --------------------------- #
+
+
+class RecordingNode(AI_Node):
+    """Node whose output is derived from its task; executions are recorded."""
+
+    def __init__(self, node_id, task, dependencies, calls):
+        super().__init__(
+            in_name=node_id,
+            in_node_id=node_id,
+            in_description="Incremental test node",
+            in_priority=1,
+            in_status="idle",
+            in_purpose="Testing",
+            in_node_registry=None,
+            in_dependencies=dependencies,
+        )
+        self.task = task
+        self.calls = calls
+        self.failing = False
+
+    async def aexecute_prompt(self, prompt):
+        self.calls.append(self.node_id)
+        if self.failing:
+            raise RuntimeError("boom")
+        return self.task.split("#")[0].upper()  # '#' starts a comment-only change
+
+
+def make_graph(calls, **tasks):
+    """Diamond a -> (b, c) -> d, plus an unrelated node e."""
+    graph = {"a": [], "b": ["a"], "c": ["a"], "d": ["b", "c"], "e": []}
+    return {
+        node_id: RecordingNode(
+            node_id,
+            tasks.get(node_id, node_id),
+            [{"id": dep, "resolved": False} for dep in deps],
+            calls,
+        )
+        for node_id, deps in graph.items()
+    }
+
+
+# --------------------------- Tests --------------------------- #
+
+
+def test_unchanged_graph_is_served_from_the_store():
+    calls = []
+    executor = IncrementalExecutor()
+    responses = executor.run(make_graph(calls).values())
+    assert sorted(calls) == ["a", "b", "c", "d", "e"]
+    assert responses["d"]["output"] == "D"
+
+    calls.clear()
+    responses = executor.run(make_graph(calls).values())
+    assert calls == []
+    assert sorted(executor.reused) == ["a", "b", "c", "d", "e"]
+    assert responses["d"] == {**responses["d"], "output": "D", "cached": True}
+
+
+def test_changed_task_reexecutes_only_its_downstream_subgraph():
+    calls = []
+    executor = IncrementalExecutor()
+    executor.run(make_graph(calls).values())
+
+    calls.clear()
+    responses = executor.run(make_graph(calls, b="b2").values())
+    assert sorted(calls) == ["b", "d"]
+    assert responses["b"]["output"] == "B2"
+
+    calls.clear()
+    executor.run(make_graph(calls, a="a2", b="b2").values())
+    assert sorted(calls) == ["a", "b", "c"]  # b and c outputs are unchanged: d is not
+
+
+def test_identical_output_stops_invalidation():
+    """A re-executed node that produces the same output leaves its dependents cached."""
+    calls = []
+    executor = IncrementalExecutor()
+    executor.run(make_graph(calls).values())
+
+    calls.clear()
+    executor.run(make_graph(calls, a="a# reworded").values())
+    assert calls == ["a"]
+
+
+def test_failed_node_skips_dependents_and_is_retried():
+    calls = []
+    executor = IncrementalExecutor()
+    nodes = make_graph(calls, a="a2")
+    nodes["b"].failing = True
+    responses = executor.run(nodes.values())
+    assert responses["b"]["status"] == "error"
+    assert responses["d"]["status"] == "skipped"
+    assert responses["c"]["status"] == "success"
+
+    calls.clear()
+    executor.run(make_graph(calls, a="a2").values())
+    assert sorted(calls) == ["b", "d"]  # Failures are never stored
+
+
+def test_results_persist_across_executors(tmp_path):
+    path = str(tmp_path / "results.db")
+    calls = []
+    IncrementalExecutor(ResponseCache(path=path)).run(make_graph(calls).values())
+
+    calls.clear()
+    executor = IncrementalExecutor(ResponseCache(path=path))
+    executor.run(make_graph(calls, e="e2").values())
+    assert calls == ["e"]
+
+
+def test_store_disk_io_runs_off_the_event_loop(tmp_path):
+    store = ResponseCache(path=str(tmp_path / "results.db"))
+    on_loop = []
+
+    def record(method):
+        def wrapper(*args):
+            try:
+                asyncio.get_running_loop()
+                on_loop.append(method.__name__)
+            except RuntimeError:
+                pass
+            return method(*args)
+
+        return wrapper
+
+    store._disk_get = record(store._disk_get)
+    store._disk_set = record(store._disk_set)
+    IncrementalExecutor(store).run(make_graph([]).values())
+    store.entries.clear()
+    executor = IncrementalExecutor(store)
+    executor.run(make_graph([]).values())
+    assert len(executor.reused) == 5
+    assert on_loop == []
+
+
+def test_cycle_is_rejected():
+    calls = []
+    nodes = make_graph(calls)
+    nodes["a"].dependencies = [{"id": "d", "resolved": False}]
+    with pytest.raises(DependencyCycleError):
+        IncrementalExecutor().run(nodes.values())
+    assert calls == []
+
+
+def test_output_fingerprint_is_order_insensitive_for_dicts():
+    assert fingerprint_output({"x": 1, "y": 2}) == fingerprint_output({"y": 2, "x": 1})
+    assert fingerprint_output("X") != fingerprint_output("Y")
+
+
+def test_orchestrator_collects_incrementally():
+    calls = []
+    executor = IncrementalExecutor()
+    orchestrator = Orchestrator()
+    for node in make_graph(calls).values():
+        orchestrator.register_node(node)
+    orchestrator.collect_incremental(executor)
+
+    calls.clear()
+    orchestrator.nodes["c"].task = "c2"
+    responses = orchestrator.collect_incremental(executor)
+    assert sorted(calls) == ["c", "d"]
+    assert responses["c"]["output"] == "C2"
@@ -0,0 +1,149 @@
+import threading
+
+import pytest
+from src.shared.AI_Node import AI_Node
+from src.shared.LocalOrchestrator import LocalOrchestrator
+
+# --------------------------- Fixtures --------------------------- #
+
+
+def make_node(node_id, priority, supported_tasks, status="idle"):
+    """Create an unregistered AI_Node."""
+    return AI_Node(
+        in_name=f"Node-{node_id}",
+        in_node_id=node_id,
+        in_description="Local orchestrator test node",
+        in_priority=priority,
+        in_status=status,
+        in_purpose="Testing",
+        in_node_registry=None,
+        in_supported_tasks=supported_tasks,
+    )
+
+
+@pytest.fixture
+def team():
+    """Team with writers and designers of differing priority."""
+    team = LocalOrchestrator("Team_A")
+    team.register_node(make_node("writer-low", 3, ["write"]))
+    team.register_node(make_node("writer-high", 1, ["write", "edit"]))
+    team.register_node(make_node("designer", 2, ["design"]))
+    team.register_node(make_node("busy-writer", 1, ["write"], status="processing task"))
+    return team
+
+
+# --------------------------- Tests --------------------------- #
+
+
+def test_claims_follow_priority_and_skip_busy_nodes(team):
+    """The highest-priority idle node supporting the task is claimed first."""
+    assert team.find_suitable_node("write").node_id == "writer-high"
+    assert team.assign_task("write").node_id == "writer-high"
+    assert team.nodes["writer-high"].task == "write"
+
+    # A claimed node is gone from every pool it was in
+    assert team.claim_node("edit") is None
+    assert team.claim_node("write").node_id == "writer-low"
+    assert team.claim_node("write") is None
+    assert team.claim_node("unknown") is None
+
+
+def test_nodes_that_go_busy_are_skipped_lazily(team):
+    """Nodes whose status changed without a refresh are dropped at claim time."""
+    team.nodes["writer-high"].status = "processing task"
+    assert team.claim_node("write").node_id == "writer-low"
+
+    team.nodes["writer-high"].status = "idle"
+    team.refresh_node(team.nodes["writer-high"])
+    assert team.claim_node("edit").node_id == "writer-high"
+
+
+def test_concurrent_claims_never_share_a_node():
+    """Concurrent assignments can't grab the same node."""
+    team = LocalOrchestrator("Team_B", pool_order="lru")
+    for i in range(20):
+        team.register_node(make_node(f"node-{i}", 1, ["task"]))
+    claimed, lock = [], threading.Lock()
+
+    def worker():
+        while True:
+            node = team.claim_node("task")
+            if node is None:
+                return
+            with lock:
+                claimed.append(node.node_id)
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert sorted(claimed) == sorted(f"node-{i}" for i in range(20))
+
+
+def test_responding_node_returns_to_pool(team):
+    """A node that finishes its task becomes claimable again."""
+    node = team.claim_node("design")
+    node.set_task("design")
+    assert team.claim_node("design") is None
+
+    team.record_response(node.node_id, node, {"status": "success"})
+    assert team.claim_node("design") is node
+
+
+def test_pools_stay_bounded_when_one_task_is_requested(team):
+    """Cycling a node through one task does not pile up entries for its others."""
+    for _ in range(1000):
+        node = team.assign_task("edit")
+        node.status = "idle"
+        team.record_response(node.node_id, node, {"status": "success"})
+    sizes = {task: len(pool) for task, pool in team.idle_index.pools.items()}
+    assert max(sizes.values()) <= 4  # Was 1001 entries for "write"
+    assert team.get_idle_capacity()["nodes"] == 3
+    assert team.claim_node("write").node_id == "writer-high"
+
+
+def test_progress_reports_only_changes(team):
+    """After a full report, reports carry status counts and just the changed nodes."""
+    report = team.report_progress(full=True)
+    assert report["counts"] == {"idle": 3, "processing task": 1}
+    assert len(report["changed"]) == 4
+
+    assert team.report_progress()["changed"] == {}
+    node = team.assign_task("design")
+    node.status = "processing task"
+    team.refresh_node(node)
+    report = team.report_progress()
+    assert report["changed"] == {"designer": "processing task"}
+    assert report["counts"] == {"idle": 2, "processing task": 2}
+    assert report["seq"] == 3
+
+
+def test_status_changes_made_by_nodes_update_the_pools(team):
+    """Nodes going busy or idle through update_status() are re-indexed."""
+    node = team.nodes["writer-high"]
+    node.state_machine.set_state("processing")
+    node.update_status()
+    assert team.find_suitable_node("write").node_id == "writer-low"
+    assert team.claim_node("edit") is None
+
+    node.state_machine.set_state("ready")
+    node.update_status()
+    assert team.claim_node("edit") is node
+
+
+def test_progress_deltas_include_status_changes_made_by_nodes(team):
+    """A node changing its own status shows up in the next delta, not only in full."""
+    team.report_progress(full=True)
+    node = team.nodes["designer"]
+    node.state_machine.set_state("waiting")
+    node.update_status()
+
+    report = team.report_progress()
+    assert report["changed"] == {"designer": "waiting for task"}
+    assert report["counts"] == {
+        "idle": 2,
+        "processing task": 1,
+        "waiting for task": 1,
+    }
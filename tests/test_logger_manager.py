@@ -0,0 +1,115 @@
+import logging
+
+import pytest
+from src.shared.logger_manager import (
+    BatchLogWriter,
+    LoggerMixin,
+    configure_logging,
+    get_dropped_log_count,
+    stop_async_logging,
+)
+
+# --------------------------- Fixtures --------------------------- #
+
+
+class CountingStr:
+    """Object that counts how often it is rendered as a string."""
+
+    def __init__(self):
+        self.calls = 0
+
+    def __str__(self):
+        self.calls += 1
+        return "rendered"
+
+
+@pytest.fixture
+def logging_config(tmp_path, monkeypatch):
+    """Configure logging into a temporary directory and restore loggers afterwards."""
+    monkeypatch.chdir(tmp_path)
+    names = ["default", "debugger", "error_logger", ""]
+    saved = {
+        name: (logging.getLogger(name).handlers[:], logging.getLogger(name).level)
+        for name in names
+    }
+    yield tmp_path
+    stop_async_logging()
+    for name, (handlers, level) in saved.items():
+        logger = logging.getLogger(name)
+        for handler in logger.handlers:
+            handler.close()
+        logger.handlers = handlers
+        logger.setLevel(level)
+
+
+# --------------------------- Tests --------------------------- #
+
+
+def test_async_logging_writes_batches_to_file(logging_config):
+    """Records queued in async mode reach app.log once the writer is flushed."""
+    configure_logging(async_logging=True, batch_size=16)
+    mixin = LoggerMixin()
+    for i in range(100):
+        mixin.log_node_event("Node", "id-1", "event %s", i)
+    mixin.log_error("something failed: %s", "boom")
+
+    stop_async_logging()
+
+    contents = (logging_config / "app.log").read_text()
+    assert "[Node-Node - id-1] event 0" in contents
+    assert "[Node-Node - id-1] event 99" in contents
+    assert "Error: something failed: boom" in contents
+    assert get_dropped_log_count() == 0
+
+
+def test_full_buffer_drops_records():
+    """The bounded buffer drops records instead of blocking producers."""
+    writer = BatchLogWriter(queue_size=2, overflow="drop")
+    record = logging.makeLogRecord({"msg": "hello"})
+    for _ in range(5):
+        writer.enqueue(record, [])
+
+    assert writer.buffer.qsize() == 2
+    assert writer.dropped == 3
+
+
+def test_message_formatting_is_lazy(logging_config):
+    """Arguments are never rendered when the level is disabled."""
+    configure_logging()
+    value = CountingStr()
+    mixin = LoggerMixin()
+
+    mixin.log_task_event("Task", "id-1", "value: %s", value)  # default logger is INFO
+    rendered = value.calls
+    assert rendered > 0
+
+    logging.getLogger("default").setLevel(logging.ERROR)
+    mixin.log_task_event("Task", "id-1", "value: %s", value)
+    assert value.calls == rendered
+
+
+def test_blocked_producer_waits_for_room():
+    """Under the "block" policy a full buffer makes room as the writer drains it."""
+    writer = BatchLogWriter(queue_size=1, overflow="block")
+    record = logging.makeLogRecord({"msg": "hello"})
+    writer.enqueue(record, [])
+    writer.start()
+    for _ in range(20):
+        writer.enqueue(record, [])
+    writer.stop()
+
+    assert writer.dropped == 0
+    assert writer.buffer.qsize() == 0
+
+
+def test_async_records_keep_the_args_they_were_logged_with(logging_config):
+    """Mutable args are rendered before queueing, not when the writer runs."""
+    configure_logging(async_logging=True)
+    mixin = LoggerMixin()
+    items = ["first"]
+    mixin.log_info("items: %s", items)
+    items.append("second")
+
+    stop_async_logging()
+
+    assert "items: ['first']\n" in (logging_config / "app.log").read_text()
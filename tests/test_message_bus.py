@@ -0,0 +1,169 @@
+import asyncio
+import threading
+
+import pytest
+from src.shared.GlobalOrchestrator import GlobalOrchestrator
+from src.shared.LocalOrchestrator import LocalOrchestrator
+from src.shared.MessageBus import Mailbox, MailboxFullError, MessageBus
+from src.shared.NodeMessage import StatusUpdateMessage, TaskMessage
+
+# --------------------------- Helpers --------------------------- #
+
+
+def task_message(task_id, priority, deadline=None, recipient="node-1"):
+    """Create a TaskMessage addressed to recipient."""
+    return TaskMessage("orchestrator", recipient, task_id, "desc", priority, deadline)
+
+
+# --------------------------- Tests --------------------------- #
+
+
+def test_dequeue_orders_by_priority_then_deadline():
+    """Messages come out by priority, then deadline, then arrival order."""
+    bus = MessageBus()
+    bus.register("node-1")
+    for message in [
+        task_message("late", 2, deadline=200.0),
+        task_message("low", 5),
+        task_message("soon", 2, deadline=100.0),
+        StatusUpdateMessage("node-2", "node-1", "status", "Completed", 1.0),
+        task_message("urgent", 1),
+    ]:
+        bus.publish(message)
+
+    batch = bus.receive("node-1", max_messages=3, timeout=0)
+    assert [message.task_id for message in batch] == ["urgent", "soon", "late"]
+    assert len(bus.receive("node-1", timeout=0)) == 2
+
+
+def test_full_mailbox_signals_backpressure():
+    """A full mailbox rejects new messages instead of growing."""
+    bus = MessageBus()
+    bus.register("node-1", capacity=2)
+    bus.publish(task_message("a", 1))
+
+    assert bus.publish_batch([task_message("b", 1), task_message("c", 1)]) != []
+    assert bus.get_pressure("node-1") == 1.0
+    assert bus.try_publish(task_message("d", 1)) is False
+    with pytest.raises(MailboxFullError):
+        bus.publish(task_message("e", 1), timeout=0.05)
+
+
+def test_threaded_consumer_receives_batches():
+    """start_consumer hands batches to the handler on a background thread."""
+    bus = MessageBus()
+    bus.register("node-1")
+    received, done = [], threading.Event()
+
+    def handler(batch):
+        received.extend(message.task_id for message in batch)
+        if len(received) == 3:
+            done.set()
+
+    thread = bus.start_consumer("node-1", handler)
+    for i in range(3):
+        bus.publish(task_message(f"t{i}", 1))
+
+    assert done.wait(2)
+    bus.close()
+    thread.join(2)
+    assert sorted(received) == ["t0", "t1", "t2"]
+
+
+def test_asyncio_consumer_and_publisher_backpressure():
+    """Async publishers wait for space while an async consumer drains the mailbox."""
+    bus = MessageBus()
+    bus.register("node-1", capacity=1)
+
+    async def scenario():
+        received = []
+
+        async def consume():
+            async for batch in bus.aconsume("node-1", max_messages=1):
+                received.extend(message.task_id for message in batch)
+                if len(received) == 3:
+                    return
+
+        consumer = asyncio.ensure_future(consume())
+        for i in range(3):
+            await bus.apublish(task_message(f"t{i}", 1), timeout=1)
+        await asyncio.wait_for(consumer, 1)
+        return received
+
+    assert asyncio.run(scenario()) == ["t0", "t1", "t2"]
+
+
+def test_async_reader_sees_put_from_thread_between_check_and_park():
+    """A threaded put landing after aget() found the mailbox empty still wakes it."""
+
+    class InterleavedMailbox(Mailbox):
+        def get_batch(self, max_messages=64):
+            batch = super().get_batch(max_messages)
+            if not batch and not self.produced:
+                self.produced = True
+                producer = threading.Thread(
+                    target=self.try_put, args=(task_message("t0", 1),)
+                )
+                producer.start()
+                producer.join()
+            return batch
+
+    mailbox = InterleavedMailbox()
+    mailbox.produced = False
+
+    async def scenario():
+        return await asyncio.wait_for(mailbox.aget(), 1)
+
+    assert [message.task_id for message in asyncio.run(scenario())] == ["t0"]
+
+
+def test_threaded_producer_and_async_consumer_interleave():
+    """Every message from a producer thread reaches an async consumer."""
+    mailbox = Mailbox(capacity=4)
+    count = 500
+
+    def produce():
+        for i in range(count):
+            mailbox.put(task_message(f"t{i}", 1), timeout=None)
+
+    async def consume():
+        received = 0
+        while received < count:
+            received += len(await asyncio.wait_for(mailbox.aget(), 2))
+        return received
+
+    producer = threading.Thread(target=produce)
+    producer.start()
+    assert asyncio.run(consume()) == count
+    producer.join(2)
+
+
+def test_global_orchestrator_delivers_team_data_without_a_consumer():
+    """With nobody draining the bus, mediated data reaches the team right away."""
+    global_orchestrator = GlobalOrchestrator()
+    team = LocalOrchestrator("Team_B")
+    global_orchestrator.register_team(team)
+
+    assert global_orchestrator.mediate_team_interaction("Team_A", "Team_B", "layout")
+    assert team.get_context()["received_data"] == "layout"
+    assert global_orchestrator.deliver_team_messages() == 0
+    assert not global_orchestrator.mediate_team_interaction("Team_A", "Team_X", "x")
+
+
+def test_global_orchestrator_leaves_team_data_to_bus_consumer():
+    """A consumer draining the team's mailbox receives mediated data instead."""
+    global_orchestrator = GlobalOrchestrator()
+    team = LocalOrchestrator("Team_B")
+    global_orchestrator.register_team(team)
+    received, done = [], threading.Event()
+
+    def handler(batch):
+        received.extend(message.provided_data for message in batch)
+        done.set()
+
+    thread = global_orchestrator.message_bus.start_consumer("Team_B", handler)
+    assert global_orchestrator.mediate_team_interaction("Team_A", "Team_B", "layout")
+    assert done.wait(2)
+    assert received == ["layout"] and team.get_context() == {}
+    global_orchestrator.message_bus.close()
+    thread.join(2)
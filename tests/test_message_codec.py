@@ -0,0 +1,124 @@
+from datetime import datetime, timezone
+
+import pytest
+from src.shared.MessageCodec import decode_messages, encode_messages
+from src.shared.NodeMessage import (
+    DependencyRequestMessage,
+    DependencyResponseMessage,
+    StatusUpdateMessage,
+    TaskMessage,
+)
+from src.shared.utils import MessagingError
+
+# --------------------------- Fixtures --------------------------- #
+
+
+@pytest.fixture
+def messages():
+    """One message of every supported type."""
+    return [
+        TaskMessage(
+            "orchestrator",
+            "node-1",
+            "task-1",
+            "Summarize the report",
+            priority=3,
+            deadline=1700000000.0,
+            dependencies=["task-0"],
+        ),
+        StatusUpdateMessage(
+            "node-1", "orchestrator", "task-1", "In Progress", 0.5, {"retries": 1}
+        ),
+        DependencyRequestMessage("node-2", "node-1", "task-2", ["summary"]),
+        DependencyResponseMessage("node-1", "node-2", "task-2", b"\x00summary bytes"),
+        DependencyResponseMessage("node-1", "node-3", "task-3", {"summary": "text"}),
+    ]
+
+
+# --------------------------- Tests --------------------------- #
+
+
+def test_batch_round_trip(messages):
+    """Every message decodes back to an equivalent dict."""
+    batch = decode_messages(encode_messages(messages))
+
+    assert len(batch) == len(messages)
+    for original, decoded in zip(messages, batch):
+        assert type(decoded) is type(original)
+        expected = original.to_dict()
+        actual = decoded.to_dict()
+        if isinstance(original.get_payload().get("provided_data"), bytes):
+            actual["payload"]["provided_data"] = bytes(
+                actual["payload"]["provided_data"]
+            )
+        assert actual == expected
+
+
+def test_raw_payloads_are_not_copied(messages):
+    """Raw provided_data decodes as a memoryview into the original buffer."""
+    buffer = bytearray(encode_messages(messages))
+    batch = decode_messages(buffer)
+
+    payload = batch[3].provided_data
+    assert isinstance(payload, memoryview)
+    assert payload.obj is buffer
+
+    # Routing fields are readable without decoding the message
+    assert batch.get_type(3) is DependencyResponseMessage
+    assert batch.get_recipient(0) == "node-1"
+
+
+def test_field_values_round_trip_unchanged():
+    """Non-string IDs, priorities, deadlines and dependencies keep their types."""
+    deadline = datetime(2030, 1, 2, 3, 4, 5, tzinfo=timezone.utc)
+    messages = [
+        TaskMessage(
+            "orchestrator",
+            None,
+            7,
+            None,
+            priority=1.5,
+            deadline="2030-01-02T03:04:05",
+            dependencies=[{"id": "x", "resolved": False}, "y", 3],
+        ),
+        TaskMessage("a", "b", "7", "d", priority=None, deadline=deadline),
+        StatusUpdateMessage("a", "b", "task", None, 1),
+    ]
+    first, second, status = decode_messages(encode_messages(messages))
+
+    assert first.recipient is None and first.task_id == 7
+    assert first.description is None and first.priority == 1.5
+    assert first.deadline == "2030-01-02T03:04:05"
+    assert first.dependencies == [{"id": "x", "resolved": False}, "y", 3]
+    assert second.task_id == "7" and second.priority is None
+    assert second.deadline == deadline
+    assert status.status is None and status.progress == 1
+    assert isinstance(status.progress, int)
+
+
+def test_unencodable_field_values_are_rejected():
+    message = TaskMessage("a", "b", "t", "d", priority=object(), deadline=None)
+    with pytest.raises(MessagingError, match="Cannot encode"):
+        encode_messages([message])
+
+
+def test_invalid_input_is_rejected():
+    """Unknown buffers and message types raise MessagingError."""
+    with pytest.raises(MessagingError):
+        decode_messages(b"not a batch")
+    with pytest.raises(MessagingError):
+        encode_messages([object()])
+
+
+def test_message_ids_and_timestamps_are_lazy():
+    """Messages keep compact IDs and numeric timestamps until strings are needed."""
+    message = StatusUpdateMessage("a", "b", "task", "Completed", 1.0)
+
+    assert len(message.message_id_bytes) == 16
+    assert isinstance(message.created_at, float)
+    assert decode_messages(encode_messages([message]))[0].message_id == (
+        message.message_id
+    )
+    assert TaskMessage(
+        "a", "b", "t", "d", 1, None, message_id=message.message_id
+    ).message_id_bytes == message.message_id_bytes
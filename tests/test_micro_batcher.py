@@ -0,0 +1,199 @@
+import asyncio
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from src.shared.GPTNode import GPTNode
+from src.shared.MicroBatcher import MicroBatcher, make_model_batcher
+from src.shared.ModelClient import AsyncModelClient
+from src.shared.NodeRegistry import NodeRegistry
+from src.shared.Orchestrator import Orchestrator
+
+# --------------------------- Fixtures --------------------------- #
+
+
+class BatchModelServer(ThreadingHTTPServer):
+    """
+    Local model server recording the models of chat requests and the model and size
+    of the prompt lists sent to the legacy completions endpoint.
+    """
+
+    daemon_threads = True
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), BatchModelHandler)
+        self.chat_models = []
+        self.batches = []  # (model, prompt count)
+        self.lock = threading.Lock()
+
+    @property
+    def base_url(self):
+        return f"http://127.0.0.1:{self.server_address[1]}/v1"
+
+
+class BatchModelHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        payload = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        if self.path.endswith("/chat/completions"):
+            with self.server.lock:
+                self.server.chat_models.append(payload["model"])
+            prompt = payload["messages"][0]["content"]
+            text = f"{payload['model']}: {prompt.splitlines()[-1]}"
+            response = {"choices": [{"message": {"content": text}}]}
+        else:
+            prompts = payload["prompt"]
+            with self.server.lock:
+                self.server.batches.append((payload["model"], len(prompts)))
+            prefix = f"batched {payload['model']}"
+            # Answer out of order to check results are matched by index
+            response = {
+                "choices": [
+                    {"index": index, "text": f"{prefix}: {prompt.splitlines()[-1]}"}
+                    for index, prompt in reversed(list(enumerate(prompts)))
+                ]
+            }
+        body = json.dumps(response).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    server = BatchModelServer()
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def echo_batches(sizes):
+    """Dispatch function that records batch sizes and echoes items."""
+
+    async def dispatch(items):
+        sizes.append(len(items))
+        await asyncio.sleep(0.01)
+        return [f"result {item}" for item in items]
+
+    return dispatch
+
+
+def make_gpt_nodes(client, batcher, models):
+    orchestrator = Orchestrator()
+    registry = NodeRegistry()
+    for i, model in enumerate(models):
+        node = GPTNode(
+            in_name=f"GPT-{i}",
+            in_node_id=f"gpt-{i}",
+            in_description="Batching test node",
+            in_priority=1,
+            in_status="idle",
+            in_purpose="Summarization",
+            in_supported_tasks=[f"summarize {i}"],
+            in_node_registry=registry,
+            in_model_client=client,
+            in_model=model,
+            in_response_cache=False,
+            in_batcher=batcher,
+        )
+        node.set_task(f"summarize {i}")
+        orchestrator.register_node(node)
+    return orchestrator
+
+
+# --------------------------- Tests --------------------------- #
+
+
+def test_full_batches_dispatch_immediately():
+    """max_batch_size items are sent together without waiting for the window."""
+    sizes = []
+    batcher = MicroBatcher(echo_batches(sizes), max_batch_size=4, max_wait_ms=10_000)
+
+    async def run():
+        return await asyncio.gather(*(batcher.submit(i) for i in range(8)))
+
+    assert asyncio.run(run()) == [f"result {i}" for i in range(8)]
+    assert sizes == [4, 4]
+    assert batcher.metrics.snapshot()["occupancy"] == pytest.approx(1.0)
+
+
+def test_partial_batches_wait_for_the_window():
+    """Stragglers are sent once the oldest has waited max_wait_ms."""
+    sizes = []
+    batcher = MicroBatcher(echo_batches(sizes), max_batch_size=10, max_wait_ms=20)
+
+    async def run():
+        return await asyncio.gather(*(batcher.submit(i) for i in range(3)))
+
+    assert asyncio.run(run()) == ["result 0", "result 1", "result 2"]
+    assert sizes == [3]
+    metrics = batcher.metrics.snapshot()
+    assert metrics["occupancy"] == pytest.approx(0.3)
+    assert metrics["max_queue_wait"] >= 0.015
+
+
+def test_dispatch_errors_reach_every_caller():
+    """A failed batch fails each waiting submit()."""
+
+    async def dispatch(items):
+        raise RuntimeError("endpoint down")
+
+    batcher = MicroBatcher(dispatch, max_batch_size=2, max_wait_ms=5)
+
+    async def run():
+        return await asyncio.gather(
+            *(batcher.submit(i) for i in range(3)), return_exceptions=True
+        )
+
+    assert all(isinstance(result, RuntimeError) for result in asyncio.run(run()))
+
+
+def test_exception_results_fail_only_their_caller():
+    async def dispatch(items):
+        return [ValueError(item) if item % 2 else item for item in items]
+
+    batcher = MicroBatcher(dispatch, max_batch_size=4, max_wait_ms=5)
+
+    async def run():
+        return await asyncio.gather(
+            *(batcher.submit(i) for i in range(4)), return_exceptions=True
+        )
+
+    results = asyncio.run(run())
+    assert results[0] == 0 and results[2] == 2
+    assert isinstance(results[1], ValueError) and isinstance(results[3], ValueError)
+
+
+def test_gpt_nodes_share_batched_requests(server):
+    """Each batch is one completions request per model, carrying a list of prompts."""
+    client = AsyncModelClient(server.base_url)
+    batcher = make_model_batcher(client, max_batch_size=4, max_wait_ms=50)
+    models = ["model-a", "model-b"] * 4
+    orchestrator = make_gpt_nodes(client, batcher, models)
+
+    responses = orchestrator.collect_responses()
+    assert batcher.metrics.snapshot()["batches"] == 2
+    assert sorted(server.batches) == [("model-a", 2)] * 2 + [("model-b", 2)] * 2
+    assert server.chat_models == []
+    for i, model in enumerate(models):
+        expected = f"batched {model}: Task: summarize {i}"
+        assert responses[f"gpt-{i}"]["output"] == expected
+
+
+def test_gpt_nodes_without_a_batcher_send_chat_requests(server):
+    client = AsyncModelClient(server.base_url)
+    orchestrator = make_gpt_nodes(client, None, ["stub-model"] * 3)
+
+    responses = orchestrator.collect_responses()
+    assert server.chat_models == ["stub-model"] * 3
+    assert server.batches == []
+    for i in range(3):
+        assert responses[f"gpt-{i}"]["output"] == f"stub-model: Task: summarize {i}"
@@ -0,0 +1,105 @@
+import pytest
+from src.shared.AI_Node import AI_Node
+from src.shared.NodeRegistry import NodeRegistry
+
+# --------------------------- Fixtures --------------------------- #
+
+
+@pytest.fixture
+def node_registry():
+    """Fixture to initialize the NodeRegistry."""
+    return NodeRegistry()
+
+
+def make_node(node_registry, node_id, dependencies=None, status="idle"):
+    """Create and register an AI_Node with the given dependencies."""
+    return AI_Node(
+        in_name=f"Node-{node_id}",
+        in_node_id=node_id,
+        in_description="Registry test node",
+        in_priority=1,
+        in_status=status,
+        in_purpose="Testing",
+        in_supported_tasks=["task1"],
+        in_dependencies=dependencies,
+        in_node_registry=node_registry,
+    )
+
+
+def mark_ready(node):
+    """Put a node into the resolved (idle + ready) condition and report it."""
+    node.status = "idle"
+    node.state_machine.set_state("ready")
+    node.notify_state_change()
+
+
+# --------------------------- Tests --------------------------- #
+
+
+def test_forward_and_reverse_index(node_registry):
+    """Registering nodes builds forward and reverse dependency edges."""
+    make_node(node_registry, "dep1")
+    make_node(node_registry, "dep2")
+    make_node(node_registry, "child", dependencies=["dep1", {"id": "dep2"}])
+
+    assert node_registry.dependencies["child"] == {"dep1", "dep2"}
+    assert node_registry.get_dependents("dep1") == {"child"}
+    assert node_registry.get_unresolved_count("child") == 2
+
+
+def test_state_change_wakes_only_newly_unblocked_dependents(node_registry):
+    """A dependency becoming ready updates only the dependents waiting on it."""
+    dep1 = make_node(node_registry, "dep1")
+    dep2 = make_node(node_registry, "dep2")
+    make_node(node_registry, "child", dependencies=["dep1", "dep2"])
+    make_node(node_registry, "other", dependencies=["dep2"])
+
+    mark_ready(dep1)
+    assert node_registry.get_unresolved_dependencies("child") == ["dep2"]
+    assert node_registry.get_unresolved_count("other") == 1
+
+    mark_ready(dep2)
+    assert node_registry.get_unresolved_count("child") == 0
+    assert node_registry.get_unresolved_count("other") == 0
+    assert node_registry.get_node_by_id("child").check_dependencies()
+
+
+def test_unblocked_dependents_are_queued_once(node_registry):
+    """A dependent comes out of the ready queue when its last dependency resolves."""
+    dep = make_node(node_registry, "dep")
+    make_node(node_registry, "child", dependencies=["dep"])
+    assert node_registry.pop_ready_nodes() == []
+
+    mark_ready(dep)
+    dep.status = "processing task"
+    dep.notify_state_change()
+    mark_ready(dep)  # Resolved twice before anyone drained the queue
+    assert [node.node_id for node in node_registry.pop_ready_nodes()] == ["child"]
+    assert node_registry.pop_ready_nodes() == []
+
+
+def test_dependency_registered_after_dependent(node_registry):
+    """Dependents registered before their dependency are still woken up."""
+    make_node(node_registry, "child", dependencies=["late"])
+    late = make_node(node_registry, "late")
+    assert node_registry.get_unresolved_count("child") == 1
+
+    mark_ready(late)
+    assert node_registry.get_unresolved_count("child") == 0
+
+
+def test_dependency_regression_and_deregistration(node_registry):
+    """Dependencies that leave the resolved state, or the registry, count again."""
+    dep = make_node(node_registry, "dep")
+    make_node(node_registry, "child", dependencies=["dep"])
+    mark_ready(dep)
+    assert node_registry.get_unresolved_count("child") == 0
+
+    dep.status = "processing task"
+    dep.notify_state_change()
+    assert node_registry.get_unresolved_count("child") == 1
+
+    mark_ready(dep)
+    node_registry.deregister_node("dep")
+    assert node_registry.get_unresolved_count("child") == 1
+    assert node_registry.get_dependents("dep") == {"child"}
@@ -0,0 +1,125 @@
+import asyncio
+import threading
+
+import pytest
+from src.shared.AI_Node import AI_Node
+from src.shared.NodeRegistry import NodeRegistry
+from src.shared.Orchestrator import Orchestrator
+from src.shared.utils import get_background_loop, run_sync
+
+# --------------------------- Fixtures --------------------------- #
+
+
+class DelayedNode(AI_Node):
+    """AI_Node whose simulated output takes a configurable amount of time."""
+
+    def __init__(self, *args, delay=0.0, **kwargs):
+        self.delay = delay
+        super().__init__(*args, **kwargs)
+
+    async def aexecute_prompt(self, prompt):
+        await asyncio.sleep(self.delay)
+        return f"Output after {self.delay}s"
+
+
+def make_node(node_registry, node_id, delay):
+    """Create a DelayedNode with a task assigned."""
+    node = DelayedNode(
+        in_name=f"Node-{node_id}",
+        in_node_id=node_id,
+        in_description="Orchestrator test node",
+        in_priority=1,
+        in_status="idle",
+        in_purpose="Testing",
+        in_node_registry=node_registry,
+        in_supported_tasks=["task1"],
+        delay=delay,
+    )
+    node.set_task("task1")
+    return node
+
+
+@pytest.fixture
+def orchestrator():
+    """Orchestrator with one fast, one medium and one slow node."""
+    orchestrator = Orchestrator()
+    registry = NodeRegistry()
+    for node_id, delay in [("slow", 0.6), ("fast", 0.0), ("medium", 0.2)]:
+        orchestrator.register_node(make_node(registry, node_id, delay))
+    return orchestrator
+
+
+# --------------------------- Tests --------------------------- #
+
+
+@pytest.mark.parametrize("executor", ["thread", "asyncio"])
+def test_stream_responses_yields_in_completion_order(orchestrator, executor):
+    """Responses stream as each node finishes rather than in registration order."""
+    order = [
+        node_id for node_id, _ in orchestrator.stream_responses(executor=executor)
+    ]
+    assert order == ["fast", "medium", "slow"]
+
+
+@pytest.mark.parametrize("executor", ["thread", "asyncio"])
+def test_slow_nodes_time_out(orchestrator, executor):
+    """Nodes exceeding the per-node timeout report a timeout response."""
+    responses = dict(orchestrator.stream_responses(executor=executor, timeout=0.4))
+
+    assert responses["slow"]["status"] == "timeout"
+    assert responses["fast"]["status"] == "success"
+    assert responses["medium"]["status"] == "success"
+
+
+def test_collect_responses_returns_all_nodes(orchestrator):
+    """collect_responses still returns a dict of every eligible node's response."""
+    responses = orchestrator.collect_responses()
+
+    assert set(responses) == {"slow", "fast", "medium"}
+    assert all(response["status"] == "success" for response in responses.values())
+
+
+def test_dependents_are_woken_when_a_dependency_responds():
+    """Recording a response moves nodes waiting on it out of 'waiting'."""
+    registry = NodeRegistry()
+    orchestrator = Orchestrator()
+    upstream = make_node(registry, "upstream", 0.0)
+    downstream = make_node(registry, "downstream", 0.0)
+    downstream.dependencies = ["upstream"]
+    registry.update_dependencies(downstream)
+    downstream.state_machine.set_state("waiting")
+    upstream.status = "idle"
+    for node in (upstream, downstream):
+        orchestrator.register_node(node)
+
+    upstream.task = None  # Done, so record_response() leaves it 'ready'
+    orchestrator.record_response("upstream", upstream, {"status": "success"})
+    assert downstream.state_machine.get_state().name == "ready"
+    assert registry.pop_ready_nodes() == []
+
+
+def test_sync_stream_closes_its_async_stream_when_abandoned():
+    closed = threading.Event()
+
+    async def endless():
+        try:
+            while True:
+                yield "tick"
+                await asyncio.sleep(0.01)
+        finally:
+            closed.set()
+
+    stream = Orchestrator()._stream_from_event_loop(endless())
+    assert next(stream) == "tick"
+    stream.close()
+    assert closed.wait(timeout=5)
+
+
+def test_sync_stream_refuses_the_shared_event_loop():
+    async def consume():
+        assert asyncio.get_running_loop() is get_background_loop()
+        stream = Orchestrator()._stream_from_event_loop(None)
+        with pytest.raises(RuntimeError):
+            next(stream)
+
+    run_sync(consume())
@@ -0,0 +1,156 @@
+import threading
+import time
+
+import pytest
+from src.shared.parallel_execution import execute_in_parallel, find_cycle
+from src.shared.utils import DependencyCycleError
+
+# --------------------------- Helpers --------------------------- #
+
+
+def make_state(dependencies):
+    """Build a workflow state dict from a name -> dependencies mapping."""
+    return {
+        "nodes": {
+            name: {"status": "Not Started", "dependencies": deps}
+            for name, deps in dependencies.items()
+        }
+    }
+
+
+def recording_task(order, lock):
+    """Return a task function that records the order in which nodes ran."""
+
+    def task(input_text, node_name):
+        with lock:
+            order.append(node_name)
+        return f"Output of {node_name}"
+
+    return task
+
+
+# --------------------------- Tests --------------------------- #
+
+
+def test_dependencies_run_before_dependents():
+    """Tasks only start once every dependency has completed."""
+    graph = {"a": [], "b": ["a"], "c": ["a"], "d": ["b", "c"]}
+    state = make_state(graph)
+    order, lock = [], threading.Lock()
+    task = recording_task(order, lock)
+
+    execute_in_parallel([(task, ("input", name)) for name in graph], state)
+
+    assert order[0] == "a"
+    assert order[-1] == "d"
+    assert all(node["status"] == "Completed" for node in state["nodes"].values())
+    assert state["nodes"]["d"]["output"] == "Output of d"
+
+
+def test_dispatches_on_readiness_without_level_barrier():
+    """A long chain keeps progressing while an unrelated slow task is running."""
+    graph = {"slow": [], "c0": []}
+    for i in range(1, 10):
+        graph[f"c{i}"] = [f"c{i - 1}"]
+    state = make_state(graph)
+    finished = {}
+
+    def task(input_text, node_name):
+        if node_name == "slow":
+            time.sleep(0.3)
+        finished[node_name] = time.monotonic()
+
+    execute_in_parallel(
+        [(task, ("input", name)) for name in graph], state, max_workers=2
+    )
+
+    assert finished["c9"] < finished["slow"]
+
+
+def test_cycle_is_detected_up_front():
+    """A dependency cycle raises before any task runs."""
+    state = make_state({"a": ["c"], "b": ["a"], "c": ["b"], "d": []})
+    calls = []
+
+    with pytest.raises(DependencyCycleError):
+        execute_in_parallel(
+            [(lambda text, name: calls.append(name), ("input", n)) for n in "abcd"],
+            state,
+        )
+    assert calls == []
+    assert find_cycle({"a": ["b"], "b": []}, {"a": 0, "b": 1}) == []
+
+
+def test_failing_task_is_retried_then_blocks_dependents():
+    """A failing task is retried a bounded number of times and its dependents are skipped."""
+    state = make_state({"bad": [], "child": ["bad"], "other": []})
+    attempts = []
+
+    def task(input_text, node_name):
+        if node_name == "bad":
+            attempts.append(node_name)
+            raise RuntimeError("Intentional Failure")
+        return node_name
+
+    execute_in_parallel(
+        [(task, ("input", name)) for name in state["nodes"]], state, max_retries=2
+    )
+
+    assert len(attempts) == 3
+    assert state["nodes"]["bad"]["status"] == "Error"
+    assert state["nodes"]["child"]["status"] == "Skipped"
+    assert state["nodes"]["other"]["status"] == "Completed"
+
+
+def test_completed_tasks_are_not_rerun():
+    """Tasks already marked Completed satisfy their dependents without re-running."""
+    state = make_state({"a": [], "b": ["a"]})
+    state["nodes"]["a"]["status"] = "Completed"
+    order, lock = [], threading.Lock()
+    task = recording_task(order, lock)
+
+    execute_in_parallel([(task, ("input", name)) for name in "ab"], state)
+
+    assert order == ["b"]
+
+
+def test_failure_does_not_overwrite_completed_dependents():
+    """Checkpointed results downstream of a failing task are kept."""
+    state = make_state({"bad": [], "mid": ["bad"], "leaf": ["mid"]})
+    state["nodes"]["mid"].update(status="Completed", output="kept")
+
+    def task(input_text, node_name):
+        if node_name == "bad":
+            raise RuntimeError("Intentional Failure")
+        return node_name
+
+    execute_in_parallel(
+        [(task, ("input", name)) for name in state["nodes"]], state, max_retries=0
+    )
+
+    assert state["nodes"]["bad"]["status"] == "Error"
+    assert state["nodes"]["mid"] == {
+        "status": "Completed",
+        "dependencies": ["bad"],
+        "output": "kept",
+    }
+    assert state["nodes"]["leaf"]["status"] == "Completed"
+
+
+def test_status_taken_over_while_running_is_not_retried():
+    """A task whose node was changed by another writer is left to that writer."""
+    state = make_state({"taken": [], "child": ["taken"]})
+    attempts = []
+
+    def task(input_text, node_name):
+        attempts.append(node_name)
+        state["nodes"][node_name]["status"] = "Cancelled"
+        return node_name
+
+    execute_in_parallel(
+        [(task, ("input", name)) for name in state["nodes"]], state, max_retries=2
+    )
+
+    assert attempts == ["taken"]
+    assert state["nodes"]["taken"]["status"] == "Cancelled"
+    assert state["nodes"]["child"]["status"] == "Skipped"
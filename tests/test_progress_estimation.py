@@ -0,0 +1,101 @@
+import io
+
+import pytest
+from src.shared.WorkflowState import WorkflowState
+from src.tasks.progress_estimation import DEFAULT_TASK_TYPE, ProgressTracker
+
+# --------------------------- Fixtures --------------------------- #
+
+
+class FakeClock:
+    """Manually advanced monotonic clock."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+def make_tracker(store, clock, refresh_interval=1.0):
+    return ProgressTracker(
+        store,
+        refresh_interval=refresh_interval,
+        use_tqdm=False,
+        output=io.StringIO(),
+        clock=clock,
+    )
+
+
+# --------------------------- Tests --------------------------- #
+
+
+def test_rendering_is_throttled(clock):
+    """Completions are counted immediately but rendered at most once per interval."""
+    store = WorkflowState({"nodes": {f"n{i}": {} for i in range(100)}})
+    tracker = make_tracker(store, clock)
+
+    for i in range(50):
+        store.set_status(f"n{i}", "Completed")
+    assert tracker.get_completed() == 50
+    assert tracker.renders == 1
+
+    clock.now = 1.0
+    store.set_status("n50", "Completed")
+    assert tracker.renders == 2
+    tracker.close()
+    assert tracker.output.getvalue().splitlines()[-1].startswith(
+        "Workflow Progress: 51/100 tasks"
+    )
+
+
+def test_eta_uses_per_type_throughput(clock):
+    """The ETA follows the slowest task type's observed completion rate."""
+    nodes = {f"fast{i}": {"task_type": "fast"} for i in range(10)}
+    nodes.update({f"slow{i}": {"task_type": "slow"} for i in range(4)})
+    store = WorkflowState({"nodes": nodes})
+    tracker = make_tracker(store, clock)
+    assert tracker.get_eta() is None
+
+    for i in range(4):
+        clock.now += 1.0
+        store.set_status(f"fast{i}", "Completed")
+    # Only "fast" has been observed: 6 fast and 4 slow left at 1s each
+    assert tracker.get_eta() == pytest.approx(6.0)
+
+    clock.now += 10.0
+    store.set_status("slow0", "Completed")
+    # 3 slow tasks left at 14s apart dominate the 6 remaining fast tasks
+    assert tracker.get_eta() == pytest.approx(3 * 14.0)
+
+
+def test_totals_follow_nodes_added_later(clock):
+    """Nodes added by ensure_node() or restore() count toward the totals."""
+    store = WorkflowState({"nodes": {"a": {}, "b": {}}})
+    tracker = make_tracker(store, clock, refresh_interval=0)
+    store.ensure_node("c", status="Not Started")
+    store.restore({"d": {"status": "Completed"}, "a": {"status": "Completed"}})
+    assert tracker.output.getvalue().splitlines()[-1].startswith(
+        "Workflow Progress: 2/4 tasks"
+    )
+
+    store.set_status("b", "Completed")
+    assert tracker.remaining == {DEFAULT_TASK_TYPE: 1}  # Only c is left
+    store.set_status("a", "In Progress")  # Back to work
+    assert tracker.remaining == {DEFAULT_TASK_TYPE: 2}
+    tracker.close()
+
+
+def test_close_unsubscribes(clock):
+    """A closed tracker no longer reacts to state changes."""
+    store = WorkflowState({"nodes": {"a": {}, "b": {}}})
+    tracker = make_tracker(store, clock, refresh_interval=0)
+    tracker.close()
+    renders = tracker.renders
+    store.set_status("a", "Completed")
+    assert tracker.renders == renders
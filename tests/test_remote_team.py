@@ -0,0 +1,123 @@
+import os
+import threading
+from multiprocessing.connection import AuthenticationError
+
+import pytest
+from src.shared.AI_Node import AI_Node
+from src.shared.GlobalOrchestrator import GlobalOrchestrator
+from src.shared.LocalOrchestrator import LocalOrchestrator
+from src.shared.RemoteTeam import RemoteTeam, TeamServer, spawn_team
+from src.shared.utils import OrchestratorError
+
+# --------------------------- Fixtures --------------------------- #
+
+
+def build_team(team_name, tasks, size):
+    """Build a team of idle nodes; runs in the worker process for spawned teams."""
+    team = LocalOrchestrator(team_name)
+    for i in range(size):
+        team.register_node(
+            AI_Node(
+                in_name=f"{team_name}-{i}",
+                in_node_id=f"{team_name}-{i}",
+                in_description=f"Node in process {os.getpid()}",
+                in_priority=1,
+                in_status="idle",
+                in_purpose="Testing",
+                in_node_registry=None,
+                in_supported_tasks=tasks,
+            )
+        )
+    return team
+
+
+def fail_to_build():
+    raise ValueError("no nodes configured")
+
+
+@pytest.fixture
+def served_team():
+    """A team served on a local socket from a thread, as on another host."""
+    server = TeamServer(build_team("Team_S", ["write"], 2), authkey=b"secret")
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    thread.join()
+
+
+# --------------------------- Tests --------------------------- #
+
+
+def test_spawned_team_runs_in_its_own_process():
+    with spawn_team(build_team, "Team_R", ["design"], 2) as remote:
+        assert remote.team_name == "Team_R"
+        assert remote.process.pid != os.getpid()
+        assert remote.supports_task("design") and not remote.supports_task("write")
+        assert remote.assign_task("design") in {"Team_R-0", "Team_R-1"}
+        assert remote.get_load("design").target_id == "Team_R"
+    assert not remote.process.is_alive()
+
+
+def test_global_orchestrator_merges_delta_reports_from_local_and_remote_teams():
+    orchestrator = GlobalOrchestrator(dispatch_policy="least_outstanding")
+    orchestrator.register_team(build_team("Team_L", ["write"], 3))
+    with spawn_team(build_team, "Team_R", ["design"], 2) as remote:
+        orchestrator.register_team(remote)
+        progress = orchestrator.collect_team_updates()
+        assert progress["Team_R"]["counts"] == {"idle": 2}
+        assert set(progress["Team_L"]["nodes"]) == {f"Team_L-{i}" for i in range(3)}
+
+        assert orchestrator.dispatch_task("design") in {"Team_R-0", "Team_R-1"}
+        progress = orchestrator.collect_team_updates()
+        assert progress["Team_R"]["seq"] == 2
+        assert len(progress["Team_R"]["nodes"]) == 2  # Merged, not replaced
+
+        remote.report_progress()  # Taken by someone else: the next one resyncs
+        progress = orchestrator.collect_team_updates()
+        assert progress["Team_R"]["seq"] == 5  # Gap at 4, then a full report
+        assert orchestrator.context["Team_R"] is progress["Team_R"]
+
+
+def test_errors_cross_the_boundary(served_team):
+    with RemoteTeam(served_team.address, b"secret") as remote:
+        with pytest.raises(OrchestratorError, match="not served"):
+            remote.call("register_node", None)
+        assert remote.assign_task("unknown") is None
+        assert remote.report_progress(full=True)["counts"] == {"idle": 2}
+
+
+def test_wrong_authkey_is_rejected(served_team):
+    with pytest.raises(AuthenticationError):
+        RemoteTeam(served_team.address, b"wrong")
+    with pytest.raises(OrchestratorError, match="authkey is required"):
+        RemoteTeam(served_team.address, None)
+
+
+def test_server_without_authkey_generates_one():
+    server = TeamServer(build_team("Team_G", ["write"], 1))
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        assert len(server.authkey) == 32
+        with RemoteTeam(server.address, server.authkey) as remote:
+            assert remote.team_name == "Team_G"
+    finally:
+        server.shutdown()
+        thread.join()
+
+
+def test_failed_team_build_is_reported():
+    with pytest.raises(OrchestratorError, match="no nodes configured"):
+        spawn_team(fail_to_build)
+
+
+def test_idle_local_team_steals_from_remote_team():
+    orchestrator = GlobalOrchestrator()
+    orchestrator.register_team(build_team("Team_L", ["write"], 2))
+    with spawn_team(build_team, "Team_R", ["write"], 1) as remote:
+        orchestrator.register_team(remote)
+        for _ in range(4):
+            remote.assign_task("write")
+        assert orchestrator.steal_work() == 1  # The remote team keeps two queued
+        assert remote.get_queue_depth() == 2
@@ -0,0 +1,227 @@
+import asyncio
+import sqlite3
+import threading
+
+from src.shared.GPTNode import GPTNode
+from src.shared.ResponseCache import ResponseCache, make_cache_key
+
+# --------------------------- Fixtures --------------------------- #
+
+
+class CountingModelClient:
+    """Model client that answers after a delay and counts requests."""
+
+    provider = "test"
+    base_url = "http://model.test/v1"
+
+    def __init__(self, delay=0.05):
+        self.delay = delay
+        self.calls = 0
+
+    async def complete(self, prompt, model=None, **params):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        return f"{model} says: {prompt[-20:]}"
+
+
+def make_gpt_node(node_id, client, cache):
+    node = GPTNode(
+        in_name=f"GPT-{node_id}",
+        in_node_id=node_id,
+        in_description="Cache test node",
+        in_priority=1,
+        in_status="idle",
+        in_purpose="Summarizing",
+        in_node_registry=None,
+        in_supported_tasks=["summarize"],
+        in_model_client=client,
+        in_response_cache=cache,
+    )
+    node.set_task("summarize")
+    return node
+
+
+# --------------------------- Tests --------------------------- #
+
+
+def test_keys_depend_on_model_params_and_prompt():
+    """Any change to model, parameters or prompt changes the key."""
+    key = make_cache_key("m", "prompt", temperature=0)
+    assert key == make_cache_key("m", "prompt", temperature=0)
+    assert key != make_cache_key("m2", "prompt", temperature=0)
+    assert key != make_cache_key("m", "prompt", temperature=1)
+    assert key != make_cache_key("m", "prompt!", temperature=0)
+
+
+def test_memory_tier_is_lru_with_ttl():
+    """The least recently used entry is evicted and expired entries are misses."""
+    cache = ResponseCache(max_entries=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1  # "b" is now least recently used
+    cache.set("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1 and cache.get("c") == 3
+
+    cache.set("expired", 4, ttl=-1)
+    assert cache.get("expired") is None
+
+
+def test_disk_tier_persists_and_respects_size_limit(tmp_path):
+    """Entries survive a restart; the file is trimmed least recently used first."""
+    path = tmp_path / "responses.sqlite"
+    cache = ResponseCache(path=str(path), max_disk_bytes=250)
+    cache.set("old", "x" * 100)
+    cache.set("recent", "y" * 100)
+    cache.close()
+
+    reopened = ResponseCache(path=str(path), max_disk_bytes=250)
+    assert reopened.get("old") == "x" * 100  # Served from disk, now most recent
+    reopened.set("new", "z" * 100)
+    assert reopened.get_stats()["disk_bytes"] <= 250
+
+    reopened.entries.clear()  # Force disk reads
+    assert reopened.get("recent") is None
+    assert reopened.get("old") == "x" * 100 and reopened.get("new") == "z" * 100
+    reopened.close()
+
+
+def test_disk_hit_access_times_are_written_in_batches(tmp_path):
+    """Hits do not write to the file until access_flush_size of them are pending."""
+    path = str(tmp_path / "responses.sqlite")
+    cache = ResponseCache(path=path)
+    cache.set("a", "x")
+    cache.set("b", "y")
+    cache.close()
+
+    def read_access_times():
+        with sqlite3.connect(path) as db:
+            return dict(db.execute("SELECT key, accessed_at FROM responses"))
+
+    written = read_access_times()
+    reopened = ResponseCache(path=path, access_flush_size=2)
+    assert reopened.get("a") == "x"
+    assert read_access_times() == written
+    assert reopened.get("b") == "y"
+    updated = read_access_times()
+    assert all(updated[key] > written[key] for key in ("a", "b"))
+    reopened.close()
+
+
+def test_async_disk_reads_run_off_the_event_loop(tmp_path):
+    path = str(tmp_path / "responses.sqlite")
+    cache = ResponseCache(path=path)
+    cache.set("key", "stored")
+    cache.entries.clear()
+    threads = []
+    disk_get = cache._disk_get
+
+    def record_thread(*args):
+        threads.append(threading.get_ident())
+        return disk_get(*args)
+
+    cache._disk_get = record_thread
+
+    async def compute():
+        raise AssertionError("served from disk")
+
+    assert asyncio.run(cache.aget_or_compute("key", compute)) == "stored"
+    assert threads and threading.get_ident() not in threads
+    cache.close()
+
+
+def test_async_disk_writes_run_off_the_event_loop(tmp_path):
+    """Computed values are written to disk in a worker thread."""
+    cache = ResponseCache(path=str(tmp_path / "responses.sqlite"))
+    threads = []
+    disk_set = cache._disk_set
+
+    def record_thread(*args):
+        threads.append(threading.get_ident())
+        return disk_set(*args)
+
+    cache._disk_set = record_thread
+
+    async def compute():
+        return "computed"
+
+    assert asyncio.run(cache.aget_or_compute("key", compute)) == "computed"
+    assert threads and threading.get_ident() not in threads
+    cache.entries.clear()
+    assert cache.get("key") == "computed"
+    cache.close()
+
+
+def test_memory_hits_do_not_wait_for_the_disk_tier(tmp_path):
+    cache = ResponseCache(path=str(tmp_path / "responses.sqlite"))
+    cache.set("key", "stored")
+    with cache._disk_lock:  # As if a worker thread were reading or writing disk
+        assert cache.get("key") == "stored"
+    cache.close()
+
+
+def test_full_disk_tier_is_trimmed_to_the_low_water_mark(tmp_path):
+    cache = ResponseCache(path=str(tmp_path / "responses.sqlite"), max_disk_bytes=2000)
+    for i in range(200):
+        cache.set(f"key-{i:03}", "x" * 40)
+        assert cache._disk_bytes <= 2000
+    total = cache._db.execute("SELECT SUM(size) FROM responses").fetchone()[0]
+    assert total == cache._disk_bytes
+    cache.entries.clear()
+    assert cache.get("key-199") is not None
+    assert cache.get("key-000") is None
+    cache.close()
+
+
+def test_concurrent_identical_requests_are_coalesced():
+    """Only one computation runs for many simultaneous requests for the same key."""
+    cache = ResponseCache()
+    calls = []
+
+    async def compute():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return "value"
+
+    async def run():
+        return await asyncio.gather(
+            *(cache.aget_or_compute("key", compute) for _ in range(10))
+        )
+
+    assert asyncio.run(run()) == ["value"] * 10
+    assert len(calls) == 1
+    assert cache.get_stats()["coalesced"] == 9
+
+
+def test_failed_computation_reaches_every_waiter():
+    """Errors are shared with coalesced callers and nothing is cached."""
+    cache = ResponseCache()
+
+    async def compute():
+        await asyncio.sleep(0.01)
+        raise RuntimeError("provider down")
+
+    async def run():
+        return await asyncio.gather(
+            *(cache.aget_or_compute("key", compute) for _ in range(3)),
+            return_exceptions=True,
+        )
+
+    assert all(isinstance(result, RuntimeError) for result in asyncio.run(run()))
+    assert cache.get("key") is None
+
+
+def test_gpt_nodes_share_cached_responses():
+    """Nodes with identical prompts call the model once."""
+    client = CountingModelClient()
+    cache = ResponseCache()
+    nodes = [make_gpt_node(f"gpt-{i}", client, cache) for i in range(3)]
+
+    responses = [node.process_task() for node in nodes]
+    assert client.calls == 1
+    assert len({response["output"] for response in responses}) == 1
+
+    uncached = make_gpt_node("gpt-uncached", client, False)
+    assert uncached.response_cache is None
+    uncached.process_task()
+    assert client.calls == 2
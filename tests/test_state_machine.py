@@ -0,0 +1,102 @@
+import pytest
+from src.shared.AI_Node import AI_Node
+from src.shared.NodeRegistry import NodeRegistry
+from src.shared.StateMachine import (
+    StateMachine,
+    add_transition_observer,
+    remove_transition_observer,
+)
+from src.shared.metrics import TransitionMetrics
+
+# --------------------------- Fixtures --------------------------- #
+
+
+@pytest.fixture
+def recorded_events():
+    """Register an observer that records every transition event."""
+    events = []
+
+    def observer(node, from_state, to_state, reason, timestamp):
+        events.append((node, from_state, to_state, reason, timestamp))
+
+    add_transition_observer(observer)
+    yield events
+    remove_transition_observer(observer)
+
+
+# --------------------------- Tests --------------------------- #
+
+
+def test_observers_receive_transition_events(recorded_events):
+    """Observers get (node, from, to, reason, monotonic_ts) for each real transition."""
+    node = AI_Node(
+        in_name="Observed",
+        in_node_id="observed-1",
+        in_description="State machine test node",
+        in_priority=1,
+        in_status="idle",
+        in_purpose="Testing",
+        in_node_registry=NodeRegistry(),
+        in_supported_tasks=["task1"],
+    )
+    node.set_task("task1")
+    node.state_machine.transition_to("processing", "Started.")
+
+    assert [event[1:4] for event in recorded_events] == [
+        (None, "ready", "No task assigned, and all dependencies resolved."),
+        ("ready", "processing", "Started."),
+    ]
+    assert all(event[0] is node for event in recorded_events)
+    assert recorded_events[0][4] <= recorded_events[1][4]
+
+
+def test_redundant_transition_is_silent(recorded_events, capsys):
+    """Transitioning to the current state neither notifies nor prints."""
+    machine = StateMachine()
+    machine.transition_to("ready", "First.")
+    machine.transition_to("ready", "Again.")
+
+    assert len(recorded_events) == 1
+    assert capsys.readouterr().out == ""
+
+
+def test_transition_metrics_recorder():
+    """TransitionMetrics counts transitions and accumulates time in state."""
+    metrics = TransitionMetrics()
+    node = type("Node", (), {"node_id": "n1"})()
+
+    metrics(node, None, "ready", "Start.", 10.0)
+    metrics(node, "ready", "processing", "Task.", 12.5)
+
+    snapshot = metrics.snapshot()
+    assert snapshot["transition_counts"][("ready", "processing")] == 1
+    assert snapshot["time_in_state"]["ready"] == pytest.approx(2.5)
+
+
+def test_machines_share_interned_states():
+    """State objects and the transition table are shared across machines."""
+    first, second = StateMachine(), StateMachine()
+    first.transition_to("ready", "Start.")
+    second.transition_to("ready", "Start.")
+
+    assert first.current_state is second.current_state
+    assert ("ready", "processing") in StateMachine.transitions
+    first.set_state("error")
+    with pytest.raises(ValueError, match="Invalid state transition"):
+        first.transition_to("processing")
+    assert not hasattr(first, "__dict__")
+
+
+def test_ai_node_uses_slots():
+    """AI_Node instances carry no per-instance dict or logger references."""
+    node = AI_Node(
+        in_name="Lean",
+        in_node_id="lean-1",
+        in_description="Slots test node",
+        in_priority=1,
+        in_status="idle",
+        in_purpose="Testing",
+        in_node_registry=None,
+    )
+    assert not hasattr(node, "__dict__")
+    assert node.logger is AI_Node.logger
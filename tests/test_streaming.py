@@ -0,0 +1,224 @@
+import asyncio
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from src.shared.AI_Node import AI_Node
+from src.shared.GPTNode import GPTNode
+from src.shared.ModelClient import AsyncModelClient
+from src.shared.NodeRegistry import NodeRegistry
+from src.shared.Orchestrator import Orchestrator
+from src.shared.OutputStream import OutputStream
+
+CHUNK_DELAY = 0.1
+
+# --------------------------- Fixtures --------------------------- #
+
+
+class StreamingModelServer(ThreadingHTTPServer):
+    """Local chat completions server that streams server-sent events slowly."""
+
+    daemon_threads = True
+
+    def __init__(self, words=("alpha ", "beta ", "gamma ", "delta")):
+        super().__init__(("127.0.0.1", 0), StreamingModelHandler)
+        self.words = words
+
+    @property
+    def base_url(self):
+        return f"http://127.0.0.1:{self.server_address[1]}/v1"
+
+
+class StreamingModelHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        payload = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        assert payload["stream"] is True
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        for word in self.server.words:
+            event = {"choices": [{"delta": {"content": word}}]}
+            self.write_chunk(f"data: {json.dumps(event)}\n\n")
+            time.sleep(CHUNK_DELAY)
+        self.write_chunk("data: [DONE]\n\n")
+        self.wfile.write(b"0\r\n\r\n")
+
+    def write_chunk(self, text):
+        data = text.encode("utf-8")
+        self.wfile.write(b"%x\r\n%s\r\n" % (len(data), data))
+        self.wfile.flush()
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    server = StreamingModelServer()
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def make_gpt_node(node_id, client, registry=None):
+    node = GPTNode(
+        in_name=f"GPT-{node_id}",
+        in_node_id=node_id,
+        in_description="Streaming test node",
+        in_priority=1,
+        in_status="idle",
+        in_purpose="Summarization",
+        in_supported_tasks=["summarize"],
+        in_node_registry=registry,
+        in_model_client=client,
+        in_response_cache=False,
+    )
+    node.set_task("summarize")
+    return node
+
+
+class ShoutingNode(AI_Node):
+    """Upper-cases its streaming dependency's output chunk by chunk."""
+
+    async def astream_prompt(self, prompt):
+        upstream = self.get_dependency_stream(self.dependencies[0])
+        async for chunk in upstream:
+            yield chunk.upper()
+
+
+# --------------------------- Tests --------------------------- #
+
+
+def test_output_stream_replays_for_late_consumers():
+    """Every consumer reads all chunks, including ones appended before it started."""
+    stream = OutputStream()
+    stream.append("a")
+    reader = []
+    thread = threading.Thread(target=lambda: reader.extend(stream))
+    thread.start()
+    stream.append("b")
+    stream.close({"status": "success"})
+    thread.join(timeout=5)
+
+    assert reader == ["a", "b"]
+    assert list(stream) == ["a", "b"]
+    assert stream.result(timeout=1) == {"status": "success"}
+    with pytest.raises(ValueError):
+        stream.append("c")
+
+
+def test_client_yields_chunks_before_the_response_ends(server):
+    """The first chunk arrives long before the whole stream has been sent."""
+    client = AsyncModelClient(server.base_url)
+
+    async def run():
+        started = time.monotonic()
+        arrivals = []
+        async for chunk in client.stream_complete("hello", model="stub-model"):
+            arrivals.append((time.monotonic() - started, chunk))
+        return arrivals
+
+    arrivals = asyncio.run(run())
+    assert "".join(chunk for _, chunk in arrivals) == "alpha beta gamma delta"
+    assert arrivals[0][0] < arrivals[-1][0] - 2 * CHUNK_DELAY
+
+
+def test_orchestrator_streams_tokens_as_nodes_produce_them(server):
+    """Chunk events precede each node's final event, which carries the full output."""
+    client = AsyncModelClient(server.base_url)
+    orchestrator = Orchestrator()
+    for i in range(2):
+        orchestrator.register_node(make_gpt_node(f"gpt-{i}", client))
+
+    chunks = {"gpt-0": [], "gpt-1": []}
+    finished = {}
+    for event in orchestrator.stream_tokens():
+        if event.done:
+            finished[event.node_id] = event.response
+        else:
+            assert event.node_id not in finished
+            chunks[event.node_id].append(event.chunk)
+
+    for node_id, response in finished.items():
+        assert response["status"] == "success"
+        assert response["output"] == "".join(chunks[node_id])
+        assert len(chunks[node_id]) == 4
+
+
+def test_dependents_consume_upstream_output_while_it_streams(server):
+    """A streaming dependency runs alongside its upstream node, chunk by chunk."""
+    client = AsyncModelClient(server.base_url)
+    registry = NodeRegistry()
+    upstream = make_gpt_node("upstream", client, registry)
+    downstream = ShoutingNode(
+        in_name="Shouter",
+        in_node_id="downstream",
+        in_description="Streaming dependent",
+        in_priority=1,
+        in_status="idle",
+        in_purpose="Formatting",
+        in_node_registry=registry,
+        in_supported_tasks=["shout"],
+        in_dependencies=[{"id": "upstream", "stream": True}],
+    )
+    downstream.set_task("shout")
+    orchestrator = Orchestrator()
+    orchestrator.register_node(upstream)
+    orchestrator.register_node(downstream)
+
+    async def run():
+        started = time.monotonic()
+        first_downstream = None
+        responses = {}
+        async for event in orchestrator.astream_tokens():
+            if event.done:
+                responses[event.node_id] = event.response
+            elif event.node_id == "downstream" and first_downstream is None:
+                first_downstream = time.monotonic() - started
+        return first_downstream, time.monotonic() - started, responses
+
+    first_downstream, elapsed, responses = asyncio.run(run())
+    assert responses["downstream"]["output"] == "ALPHA BETA GAMMA DELTA"
+    assert responses["upstream"]["output"] == "alpha beta gamma delta"
+    assert first_downstream < elapsed - 2 * CHUNK_DELAY
+
+
+def test_dependency_stream_of_a_new_task_is_not_the_finished_one():
+    """Once a dependency gets a new task, dependents read its next run's output."""
+    registry = NodeRegistry()
+    upstream = make_gpt_node("upstream", None, registry)
+    upstream.model_client = None
+    downstream = make_gpt_node("downstream", None, registry)
+
+    async def run(node):
+        return "".join([chunk async for chunk in node.astream_task()])
+
+    first = asyncio.run(run(upstream))
+    finished = downstream.get_dependency_stream("upstream")
+    assert finished.done and finished.text() == first
+
+    upstream.set_task("summarize")
+    stream = downstream.get_dependency_stream("upstream")
+    assert stream is not finished and not stream.done
+    asyncio.run(run(upstream))
+    assert stream.done and stream.text() == first
+
+
+def test_simulated_gpt_node_streams_words():
+    """Without a model client the simulated response is streamed word by word."""
+    node = make_gpt_node("simulated", None)
+    node.model_client = None
+
+    async def run():
+        return [chunk async for chunk in node.astream_task()]
+
+    chunks = asyncio.run(run())
+    assert len(chunks) > 1
+    assert node.output_stream.response["output"] == "".join(chunks)
@@ -0,0 +1,128 @@
+import pytest
+from src.shared.AI_Node import AI_Node
+from src.shared.GlobalOrchestrator import GlobalOrchestrator
+from src.shared.LocalOrchestrator import LocalOrchestrator, RunQueue
+
+# --------------------------- Fixtures --------------------------- #
+
+
+def make_team(name, size, supported_tasks=("task",), steal_threshold=2):
+    """Create a team of idle nodes supporting the same tasks."""
+    team = LocalOrchestrator(name, steal_threshold=steal_threshold)
+    for i in range(size):
+        team.register_node(
+            AI_Node(
+                in_name=f"{name}-{i}",
+                in_node_id=f"{name}-{i}",
+                in_description="Work stealing test node",
+                in_priority=1,
+                in_status="idle",
+                in_purpose="Testing",
+                in_node_registry=None,
+                in_supported_tasks=list(supported_tasks),
+            )
+        )
+    return team
+
+
+def fill(team, tasks, **options):
+    """Assign tasks to a team, returning those that had to be queued."""
+    return [task for task in tasks if team.assign_task(task, **options) is None]
+
+
+@pytest.fixture
+def orchestrator():
+    """Team_A is backed up with one node; Team_B is idle with two."""
+    orchestrator = GlobalOrchestrator()
+    busy = make_team("Team_A", 1)
+    orchestrator.register_team(busy)
+    orchestrator.register_team(make_team("Team_B", 2))
+    assert fill(busy, ["task"] * 5) == ["task"] * 4
+    return orchestrator
+
+
+# --------------------------- Tests --------------------------- #
+
+
+def test_run_queue_serves_priority_then_arrival_order():
+    queue = RunQueue()
+    queue.push("task", priority=2)
+    queue.push("other", priority=1)
+    queue.push("task", priority=1, pinned=True)
+    queue.push("task", priority=1)
+    assert len(queue) == 4
+
+    assert queue.steal(["task"], 5) == [("task", 1), ("task", 2)]  # Pinned stays
+    assert queue.pop(["task", "other"]) == ("other", 1, False)
+    assert queue.pop(["task"]) == ("task", 1, True)
+    assert queue.pop(["task"]) is None and len(queue) == 0
+
+
+def test_queued_task_runs_when_a_node_frees_up():
+    team = make_team("Team_A", 1)
+    node = team.assign_task("task")
+    assert team.assign_task("task", priority=3) is None
+    assert team.assign_task("task", priority=1) is None
+    assert team.get_queue_depth() == 2
+    assert team.get_load("task").outstanding == 3
+
+    node.status = "idle"
+    team.record_response(node.node_id, node, {"status": "success"})
+    assert team.get_queue_depth() == 1
+    assert team.run_queue.pop(["task"]) == ("task", 3, False)  # Priority 1 ran first
+
+
+def test_queued_task_runs_when_a_node_goes_idle_on_its_own():
+    """A node becoming idle outside record_response() still drains the queue."""
+    team = make_team("Team_A", 1)
+    node = next(iter(team.nodes.values()))
+    node.state_machine.set_state("processing")
+    node.update_status()
+    assert team.assign_task("task", priority=2) is None
+
+    node.state_machine.set_state("ready")
+    node.update_status()
+    assert team.get_queue_depth() == 0
+    assert node.task == "task" and node.node_id in team.dispatched_at
+
+
+def test_idle_team_steals_from_backed_up_team(orchestrator):
+    busy, idle = orchestrator.teams["Team_A"], orchestrator.teams["Team_B"]
+    assert orchestrator.steal_work() == 2  # One per idle node
+    assert busy.get_queue_depth() == 2  # Never below the steal threshold
+    assert all(node.task == "task" for node in idle.nodes.values())
+    assert idle.get_idle_capacity() == {"nodes": 0, "tasks": []}
+    assert orchestrator.steal_work() == 0
+
+
+def test_stealing_respects_locality(orchestrator):
+    """Pinned tasks, short queues and unsupported tasks stay with their team."""
+    busy = orchestrator.teams["Team_A"]
+    busy.run_queue = RunQueue()
+    fill(busy, ["task"] * 3, pinned=True)
+    assert orchestrator.steal_work() == 0
+
+    busy.run_queue = RunQueue()
+    fill(busy, ["task"])  # Below the steal threshold
+    assert orchestrator.steal_work() == 0
+
+    fill(busy, ["task"] * 2)
+    assert orchestrator.steal_work() == 1  # Only the tasks above the threshold
+    assert busy.get_queue_depth() == 2
+
+    orchestrator.register_team(make_team("Team_C", 2, supported_tasks=["other"]))
+    fill(busy, ["task"] * 3)
+    orchestrator.teams["Team_B"].run_queue.push("task")  # Busy teams do not steal
+    assert orchestrator.steal_work() == 0
+
+
+def test_goal_for_unknown_team_is_dispatched_by_load():
+    orchestrator = GlobalOrchestrator()
+    design = make_team("Designers", 1, supported_tasks=["Design website layout"])
+    write = make_team("Writers", 1, supported_tasks=["Write website content"])
+    orchestrator.register_team(design)
+    orchestrator.register_team(write)
+
+    orchestrator.assign_high_level_goal("Launch the website")
+    assert design.nodes["Designers-0"].task == "Design website layout"
+    assert write.nodes["Writers-0"].task == "Write website content"
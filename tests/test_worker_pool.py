@@ -0,0 +1,99 @@
+import os
+
+import pytest
+from src.shared.AI_Node import AI_Node
+from src.shared.NodeMessage import TaskMessage
+from src.shared.WorkerPool import WorkerPool
+from src.shared.parallel_execution import execute_in_parallel
+
+# --------------------------- Fixtures --------------------------- #
+
+
+def sum_of_squares(n):
+    return os.getpid(), sum(i * i for i in range(n))
+
+
+def make_payload(size):
+    return bytes(range(256)) * (size // 256)
+
+
+def describe_task(message):
+    return f"{os.getpid()}:{message.task_id}:{message.priority}:{message.description}"
+
+
+def fail(message):
+    raise ValueError(message)
+
+
+def preprocess(node_id, name):
+    return f"{name} preprocessed in {os.getpid()}"
+
+
+class PreprocessingNode(AI_Node):
+    """Node whose CPU-bound work runs in the shared worker pool."""
+
+    worker_function = describe_task
+
+
+@pytest.fixture(scope="module")
+def pool():
+    """Two warm workers; results over 1 KiB come back through shared memory."""
+    with WorkerPool(max_workers=2, shared_memory_threshold=1024) as pool:
+        pool.warm_up()
+        yield pool
+
+
+# --------------------------- Tests --------------------------- #
+
+
+def test_tasks_run_in_warm_worker_processes(pool):
+    """Work runs outside this interpreter on long-lived workers."""
+    results = [pool.submit(sum_of_squares, 10_000) for _ in range(6)]
+    pids = {future.result()[0] for future in results}
+    assert 1 <= len(pids) <= 2 and os.getpid() not in pids
+    assert results[0].result()[1] == sum(i * i for i in range(10_000))
+
+
+def test_large_results_return_through_shared_memory(pool):
+    """Outputs above the threshold round-trip intact."""
+    assert pool.run(make_payload, 1 << 20) == make_payload(1 << 20)
+    assert pool.run(make_payload, 256) == make_payload(256)
+
+
+def test_task_messages_and_errors_cross_the_process_boundary(pool):
+    """TaskMessages are decoded in the worker and worker exceptions propagate."""
+    message = TaskMessage("orchestrator", "worker", "task-1", "Summarize", 2, None)
+    pid, task_id, priority, description = pool.run(describe_task, message).split(":")
+    assert int(pid) != os.getpid()
+    assert (task_id, priority, description) == ("task-1", "2", "Summarize")
+
+    with pytest.raises(ValueError, match="boom"):
+        pool.run(fail, "boom")
+
+
+def test_nodes_opt_into_the_worker_pool():
+    """A node with a worker_function processes its task in a worker process."""
+    node = PreprocessingNode(
+        in_name="Preprocessor",
+        in_node_id="preprocessor",
+        in_description="CPU-bound preprocessing",
+        in_priority=1,
+        in_status="idle",
+        in_purpose="Preprocessing",
+        in_node_registry=None,
+        in_supported_tasks=["preprocess"],
+    )
+    node.set_task("preprocess")
+    response = node.process_task()
+    assert response["status"] == "success"
+    pid, task_id, _ = response["output"].split(":", 2)
+    assert int(pid) != os.getpid() and task_id == "preprocess"
+
+
+def test_execute_in_parallel_with_worker_pool(pool):
+    """The DAG scheduler can dispatch its tasks to worker processes."""
+    state = {"nodes": {"a": {}, "b": {"dependencies": ["a"]}}}
+    tasks = [(preprocess, (None, "a")), (preprocess, (None, "b"))]
+    execute_in_parallel(tasks, state, worker_pool=pool)
+    assert state["nodes"]["b"]["status"] == "Completed"
+    assert not state["nodes"]["b"]["output"].endswith(str(os.getpid()))
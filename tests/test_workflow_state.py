@@ -0,0 +1,94 @@
+import threading
+
+from src.shared.WorkflowState import WorkflowState
+from src.shared.parallel_execution import execute_in_parallel
+
+# --------------------------- Fixtures --------------------------- #
+
+
+def make_store(count, status="Not Started"):
+    """Store with count nodes in the same status."""
+    return WorkflowState(
+        {"nodes": {f"node-{i}": {"status": status} for i in range(count)}}
+    )
+
+
+# --------------------------- Tests --------------------------- #
+
+
+def test_counts_are_maintained_incrementally():
+    """Per-status counts follow every change without rescanning nodes."""
+    store = make_store(3)
+    assert store.get_counts() == {"Not Started": 3}
+
+    store.set_status("node-0", "In Progress")
+    store.set_status("node-0", "Completed", output="done")
+    store.set_status("node-3", "In Progress")
+    assert store.get_count("Completed") == 1
+    assert store.get_counts() == {"Not Started": 2, "Completed": 1, "In Progress": 1}
+    assert store.get_node("node-0") == {"status": "Completed", "output": "done"}
+
+
+def test_compare_and_set_has_a_single_winner():
+    """Concurrent claims of the same node never both succeed."""
+    store = make_store(50)
+    winners = []
+    lock = threading.Lock()
+    barrier = threading.Barrier(8)
+
+    def claim():
+        barrier.wait()
+        for i in range(50):
+            if store.compare_and_set(f"node-{i}", "Not Started", "In Progress"):
+                with lock:
+                    winners.append(i)
+
+    threads = [threading.Thread(target=claim) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert sorted(winners) == list(range(50))
+    assert store.get_counts() == {"In Progress": 50}
+    assert not store.compare_and_set("node-0", ("Not Started", "Error"), "Completed")
+
+
+def test_subscribers_see_every_transition():
+    """Observers receive (name, old, new, fields) for each status change."""
+    store = make_store(1)
+    changes = []
+    store.subscribe(lambda *change: changes.append(change))
+
+    store.set_status("node-0", "In Progress")
+    store.compare_and_set("node-0", "In Progress", "Completed", output=1)
+    store.compare_and_set("node-0", "In Progress", "Error")  # No change, no event
+    assert changes == [
+        ("node-0", "Not Started", "In Progress", {}),
+        ("node-0", "In Progress", "Completed", {"output": 1}),
+    ]
+
+
+def test_snapshots_round_trip(tmp_path):
+    """Snapshots are consistent copies that can be saved and reloaded."""
+    store = make_store(2)
+    store.set("total_tasks", 2)
+    store.set_status("node-1", "Completed", output="x")
+    snapshot = store.snapshot()
+    snapshot["nodes"]["node-1"]["status"] = "Tampered"
+    assert store.get_status("node-1") == "Completed"
+
+    path = tmp_path / "state.json"
+    store.save_snapshot(path)
+    restored = WorkflowState.load_snapshot(path)
+    assert restored.get_counts() == store.get_counts()
+    assert restored.get("total_tasks") == 2
+    assert restored.version == store.version
+
+
+def test_execute_in_parallel_keeps_counts_consistent():
+    """Many concurrent tasks leave the store's counters exact."""
+    store = make_store(200)
+    tasks = [(lambda text, name: name, ("input", f"node-{i}")) for i in range(200)]
+    execute_in_parallel(tasks, store, dependencies={}, max_workers=16)
+    assert store.get_counts() == {"Completed": 200}